@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Summarize a BLAMITE trace (blamite_trace.jsonl) for one run
+
+Usage:
+    python analyze_trace.py [trace_file] [--run RUN_ID] [--list-runs] [--slowest N]
+"""
+
+import argparse
+import json
+import math
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+DEFAULT_TRACE = Path(__file__).parent / "blamite_trace.jsonl"
+
+# Phases in pipeline order; anything else is listed after these
+PHASES = ['first_stat', 'stability_poll', 'lock_probe', 'name_resolution', 'move']
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def load_trace(path):
+    """Read all span records from a JSONL trace, skipping damaged lines"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+def list_runs(records):
+    """Return (run_id, file_count) in the order runs appear in the trace"""
+    counts = {}
+    for record in records:
+        if record.get('span') == 'file':
+            counts[record['run']] = counts.get(record['run'], 0) + 1
+    return list(counts.items())
+
+def summarize(records, run_id):
+    """Build per-phase and end-to-end statistics for one run"""
+    traces = defaultdict(list)
+    for record in records:
+        if record.get('run') == run_id:
+            traces[record['trace']].append(record)
+
+    totals = defaultdict(list)        # source -> end-to-end ms
+    outcomes = defaultdict(int)
+    phase_totals = defaultdict(list)  # phase -> summed ms per file
+    files = []
+
+    for spans in traces.values():
+        root = next((s for s in spans if s['span'] == 'file'), None)
+        if root is None:
+            continue  # file was still in flight when the trace was read
+        outcomes[root.get('outcome', 'unknown')] += 1
+        totals[root['source']].append(root['dur_ms'])
+
+        per_phase = defaultdict(float)
+        for span in spans:
+            if span['span'] not in ('file', 'event_received'):
+                per_phase[span['span']] += span['dur_ms']
+        for phase, ms in per_phase.items():
+            phase_totals[phase].append(ms)
+
+        # Time not covered by any span is sleeping between polls
+        idle = root['dur_ms'] - sum(per_phase.values())
+        phase_totals['waiting'].append(max(0.0, idle))
+        per_phase['waiting'] = max(0.0, idle)
+
+        dominant = max(per_phase.items(), key=lambda item: item[1])[0] if per_phase else '-'
+        files.append((root['dur_ms'], root['file'], root.get('outcome', 'unknown'), dominant))
+
+    return {
+        'totals': totals,
+        'outcomes': outcomes,
+        'phases': phase_totals,
+        'files': sorted(files, reverse=True)
+    }
+
+def print_stats_row(label, values):
+    print(f"  {label:<18}{len(values):>7}"
+          f"{percentile(values, 50):>12.1f}{percentile(values, 90):>12.1f}"
+          f"{percentile(values, 99):>12.1f}{max(values):>12.1f}")
+
+def print_summary(summary, run_id, slowest):
+    header = f"  {'':<18}{'count':>7}{'p50 ms':>12}{'p90 ms':>12}{'p99 ms':>12}{'max ms':>12}"
+
+    print("=" * 75)
+    print(f"🔬 BLAMITE TRACE SUMMARY - run {run_id}")
+    print("=" * 75)
+
+    print("\n📊 Outcomes:")
+    for outcome, count in sorted(summary['outcomes'].items(), key=lambda item: -item[1]):
+        print(f"  {outcome:<18}{count:>7}")
+
+    print("\n⏱️  End-to-end latency (event received → done):")
+    print(header)
+    for source, values in sorted(summary['totals'].items()):
+        print_stats_row(source, values)
+
+    print("\n🧩 Critical path by phase (time per file):")
+    print(header)
+    ordered = PHASES + sorted(p for p in summary['phases'] if p not in PHASES and p != 'waiting') + ['waiting']
+    for phase in ordered:
+        if summary['phases'].get(phase):
+            print_stats_row(phase, summary['phases'][phase])
+
+    if slowest and summary['files']:
+        print(f"\n🐢 Slowest {min(slowest, len(summary['files']))} files:")
+        for dur_ms, name, outcome, dominant in summary['files'][:slowest]:
+            print(f"  {dur_ms:>10.1f} ms  {outcome:<14} {dominant:<16} {name}")
+    print("=" * 75)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a BLAMITE per-file trace")
+    parser.add_argument('trace_file', nargs='?', default=str(DEFAULT_TRACE))
+    parser.add_argument('--run', help="Run id to summarize (default: most recent)")
+    parser.add_argument('--list-runs', action='store_true', help="List runs in the trace and exit")
+    parser.add_argument('--slowest', type=int, default=10, help="Show the N slowest files")
+    args = parser.parse_args(argv)
+
+    if not Path(args.trace_file).exists():
+        print(f"❌ Trace file not found: {args.trace_file}")
+        return 1
+
+    records = load_trace(args.trace_file)
+    runs = list_runs(records)
+    if not runs:
+        print("ℹ️  No completed file traces found")
+        return 1
+
+    if args.list_runs:
+        for run_id, count in runs:
+            print(f"{run_id}  ({count} files)")
+        return 0
+
+    run_id = args.run or runs[-1][0]
+    if run_id not in dict(runs):
+        print(f"❌ Run {run_id} not found (use --list-runs)")
+        return 1
+
+    print_summary(summarize(records, run_id), run_id, args.slowest)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
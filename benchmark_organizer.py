@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+"""
+Synthetic-workload benchmarks for BLAMITE Organizer
+
+Generates realistic Downloads folders in a temp directory and measures the
+backtrack path (organize_existing_files), the live path (watchdog Observer
++ FileHandler), the CPU cost of the polling watcher used for network
+shares, bulk undo and the worker queue's priority scheduling, with
+DOWNLOADS/ORGANIZER redirected into the sandbox. The startup run times
+`import main` (python -X importtime) and how long `main.py --fast-start`
+takes to start watching, with HOME pointed at the sandbox. The shards run
+compares archive extraction in one process and in --shards processes.
+
+Usage:
+    python benchmark_organizer.py --scenario quick
+    python benchmark_organizer.py --scenario 100k --save benchmarks/baseline_100k.json
+    python benchmark_organizer.py --scenario 100k --compare benchmarks/baseline_100k.json
+    python benchmark_organizer.py --files 5000 --collisions 0.3 --slow-writers 0.2 --live-files 300
+    python benchmark_organizer.py --scenario 100k --only polling
+    python benchmark_organizer.py --files 60000 --only undo
+    python benchmark_organizer.py --scenario media --only scheduler
+    python benchmark_organizer.py --only startup --startup-runs 10
+    python benchmark_organizer.py --only shards --shards 8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import main
+import analyze_trace
+
+# Named workloads; any field can be overridden from the command line
+SCENARIOS = {
+    'quick': {'files': 1000, 'sizes': 'mixed', 'mix': 'typical', 'collisions': 0.05,
+              'slow_writers': 0.1, 'live_files': 100},
+    '10k': {'files': 10_000, 'sizes': 'mixed', 'mix': 'typical', 'collisions': 0.05,
+            'slow_writers': 0.1, 'live_files': 300},
+    '100k': {'files': 100_000, 'sizes': 'mixed', 'mix': 'typical', 'collisions': 0.1,
+             'slow_writers': 0.1, 'live_files': 1000},
+    '1m': {'files': 1_000_000, 'sizes': 'tiny', 'mix': 'typical', 'collisions': 0.1,
+           'slow_writers': 0.0, 'live_files': 2000},
+    'collisions': {'files': 10_000, 'sizes': 'tiny', 'mix': 'documents', 'collisions': 0.8,
+                   'slow_writers': 0.0, 'live_files': 300},
+    'media': {'files': 5000, 'sizes': 'media', 'mix': 'media', 'collisions': 0.05,
+              'slow_writers': 0.3, 'live_files': 200},
+}
+
+# Relative extension weights; unsupported and temporary names are included on purpose
+EXTENSION_MIXES = {
+    'typical': {'pdf': 20, 'docx': 8, 'doc': 2, 'xlsx': 5, 'xls': 1, 'txt': 6,
+                'png': 15, 'jpg': 15, 'jpeg': 3, 'gif': 2, 'mp3': 3, 'mp4': 4, 'mov': 1,
+                'zip': 6, 'exe': 4, 'part': 2, 'crdownload': 2, 'tmp': 1},
+    'documents': {'pdf': 40, 'docx': 20, 'doc': 5, 'xlsx': 15, 'xls': 5, 'txt': 15},
+    'media': {'png': 20, 'jpg': 25, 'gif': 5, 'mp3': 15, 'mp4': 25, 'mov': 10},
+}
+
+MEDIA_EXTENSIONS = {'mp3', 'mp4', 'mov'}
+NAME_PREFIXES = ['invoice', 'report', 'IMG_', 'Screenshot', 'scan', 'setup', 'document',
+                 'photo', 'statement', 'presentation', 'recording', 'notes', 'export']
+
+# Metrics compared against a baseline and which direction is better
+COMPARED_METRICS = {
+    'files_per_s': 'higher',
+    'mb_per_s': 'higher',
+    'elapsed_s': 'lower',
+    'latency_p50_ms': 'lower',
+    'latency_p90_ms': 'lower',
+    'latency_p99_ms': 'lower',
+    'idle_poll_cpu_ms_per_100k': 'lower',
+    'changed_poll_cpu_ms_per_100k': 'lower',
+    'full_scan_cpu_ms_per_100k': 'lower',
+    'undo_files_per_s': 'higher',
+    'priority_small_p50_ms': 'lower',
+    'priority_small_p99_ms': 'lower',
+    'priority_live_p99_ms': 'lower',
+    'priority_large_p99_ms': 'lower',
+    'import_ms': 'lower',
+    'first_watch_ms': 'lower',
+    'sharded_files_per_s': 'higher',
+}
+
+def sample_size(rng, ext, sizes):
+    """Pick a file size in bytes for the given size distribution"""
+    if sizes == 'tiny':
+        return rng.randint(0, 4096)
+    if sizes == 'media' or (sizes == 'mixed' and ext in MEDIA_EXTENSIONS):
+        return int(min(rng.lognormvariate(15, 1.5), 4 * 1024 ** 3))  # median ~3 MB
+    return int(min(rng.lognormvariate(11, 1.2), 50 * 1024 ** 2))  # median ~60 KB
+
+def make_name(rng, index, ext):
+    prefix = rng.choice(NAME_PREFIXES)
+    return f"{prefix}{index:07d}.{ext}"
+
+def write_file(path, size, dense):
+    """Create a file of the given size (sparse unless dense data is requested)"""
+    with open(path, 'wb') as f:
+        if dense:
+            chunk = b'\0' * min(size, 1024 * 1024)
+            remaining = size
+            while remaining > 0:
+                f.write(chunk[:remaining])
+                remaining -= len(chunk)
+        else:
+            f.truncate(size)
+
+def plan_files(rng, count, params):
+    """Return a list of (name, ext, size) for a synthetic Downloads folder"""
+    mix = EXTENSION_MIXES[params['mix']]
+    extensions = list(mix)
+    weights = [mix[ext] for ext in extensions]
+    planned = []
+    for index, ext in enumerate(rng.choices(extensions, weights, k=count)):
+        planned.append((make_name(rng, index, ext), ext, sample_size(rng, ext, params['sizes'])))
+    return planned
+
+def seed_collisions(rng, planned, rate):
+    """Pre-create destination files so a share of names must be renamed"""
+    seeded = 0
+    for name, ext, _ in planned:
+        if ext in main.SUBFOLDERS and rng.random() < rate:
+            folder = main.SUBFOLDERS[ext]
+            stem, suffix = Path(name).stem, Path(name).suffix
+            # Chains of 1-3 existing names make the duplicate loop walk further
+            for n in range(rng.randint(1, 3)):
+                clash = folder / (name if n == 0 else f"{stem}_{n}{suffix}")
+                clash.touch()
+                seeded += 1
+    return seeded
+
+def count_organized(exclude=0):
+    total = 0
+    for folder in set(main.SUBFOLDERS.values()):
+        with os.scandir(folder) as entries:
+            total += sum(1 for _ in entries)
+    return total - exclude
+
+def latency_stats(trace_file, run_id):
+    """p50/p90/p99/max end-to-end latency of organized files from the trace"""
+    records = analyze_trace.load_trace(trace_file) if trace_file.exists() else []
+    values = [r['dur_ms'] for r in records
+              if r.get('run') == run_id and r['span'] == 'file' and r.get('outcome') == 'organized']
+    if not values:
+        return {}
+    return {
+        'latency_p50_ms': round(analyze_trace.percentile(values, 50), 3),
+        'latency_p90_ms': round(analyze_trace.percentile(values, 90), 3),
+        'latency_p99_ms': round(analyze_trace.percentile(values, 99), 3),
+        'latency_max_ms': round(max(values), 3),
+        'latency_samples': len(values),
+    }
+
+@contextlib.contextmanager
+def quiet(enabled):
+    """Silence the organizer's per-file prints so they don't skew timings"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def prepare_sandbox(workdir, name):
+    sandbox = workdir / name
+    downloads = sandbox / "Downloads"
+    organizer = sandbox / "Desktop" / "BLAMITE_Organizer"
+    downloads.mkdir(parents=True)
+    organizer.parent.mkdir(parents=True)
+    main.configure_paths(downloads, organizer)
+    with quiet(True):
+        main.setup_folders()
+    return sandbox, downloads
+
+def bench_backtrack(workdir, params, rng, show_output):
+    """Time organize_existing_files over a generated Downloads tree"""
+    sandbox, downloads = prepare_sandbox(workdir, "backtrack")
+    planned = plan_files(rng, params['files'], params)
+
+    print(f"🏗️  Generating {len(planned):,} files ({params['sizes']} sizes, {params['mix']} mix)...")
+    start = time.perf_counter()
+    for name, ext, size in planned:
+        write_file(downloads / name, size, params['dense'])
+    seeded = seed_collisions(rng, planned, params['collisions'])
+    print(f"   Generated in {time.perf_counter() - start:.1f}s ({seeded:,} colliding names seeded)")
+
+    expected = [(name, size) for name, ext, size in planned if ext in main.SUBFOLDERS]
+    trace_file = sandbox / "trace.jsonl"
+    main.TRACER.configure(True, params['trace_sample'], trace_file, new_run=True)
+    settings = dict(main.DEFAULT_SETTINGS, backtrack_all_files=True)
+
+    print(f"🔄 Backtracking {len(expected):,} supported files...")
+    start = time.perf_counter()
+    with quiet(not show_output):
+        main.organize_existing_files(downloads, settings)
+    elapsed = time.perf_counter() - start
+    main.TRACER.configure(False)
+
+    organized = count_organized(exclude=seeded)
+    total_bytes = sum(size for _, size in expected)
+    result = {
+        'files': len(planned),
+        'supported': len(expected),
+        'organized': organized,
+        'elapsed_s': round(elapsed, 3),
+        'files_per_s': round(organized / elapsed, 1) if elapsed else 0,
+        'mb_per_s': round(total_bytes / 1024 ** 2 / elapsed, 1) if elapsed else 0,
+    }
+    result.update(latency_stats(trace_file, main.TRACER.run_id))
+    return result
+
+def bench_live(workdir, params, rng, show_output):
+    """Time the Observer + FileHandler path while files arrive in Downloads"""
+    from watchdog.observers import Observer
+
+    sandbox, downloads = prepare_sandbox(workdir, "live")
+    planned = [(name, ext, size) for name, ext, size in plan_files(rng, params['live_files'], params)]
+    seeded = seed_collisions(rng, planned, params['collisions'])
+    expected = [(name, size) for name, ext, size in planned if ext in main.SUBFOLDERS]
+
+    # Shrink the stability wait so the benchmark measures the pipeline, not sleep(1)
+    saved = (main.STABILITY_POLL_INTERVAL, main.LOCKED_RETRY_DELAY)
+    main.STABILITY_POLL_INTERVAL = params['poll_interval']
+    main.LOCKED_RETRY_DELAY = params['poll_interval'] * 2
+
+    trace_file = sandbox / "trace.jsonl"
+    main.TRACER.configure(True, 100, trace_file, new_run=True)
+    observer = Observer()
+    observer.schedule(main.FileHandler(), str(downloads), recursive=False)
+    observer.start()
+
+    def slow_write(name, size):
+        # Grow the file in a few chunks with pauses, like a browser download
+        chunks = rng.randint(3, 8)
+        with open(downloads / name, 'wb') as f:
+            for _ in range(chunks):
+                f.write(b'\0' * max(1, min(size // chunks, 256 * 1024)))
+                f.flush()
+                time.sleep(params['poll_interval'] * rng.uniform(0.5, 1.5))
+
+    print(f"📡 Live run: {len(planned):,} arriving files "
+          f"({params['slow_writers']:.0%} slow writers, poll {params['poll_interval']}s)...")
+    start = time.perf_counter()
+    try:
+        with quiet(not show_output), ThreadPoolExecutor(max_workers=8) as writers:
+            for name, ext, size in planned:
+                if rng.random() < params['slow_writers']:
+                    writers.submit(slow_write, name, size)
+                else:
+                    writers.submit(write_file, downloads / name, min(size, 256 * 1024), True)
+
+            deadline = time.monotonic() + params['live_timeout']
+            while count_organized(exclude=seeded) < len(expected) and time.monotonic() < deadline:
+                time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+    finally:
+        observer.stop()
+        observer.join()
+        main.TRACER.configure(False)
+        main.STABILITY_POLL_INTERVAL, main.LOCKED_RETRY_DELAY = saved
+
+    organized = count_organized(exclude=seeded)
+    result = {
+        'files': len(planned),
+        'supported': len(expected),
+        'organized': organized,
+        'missed': len(expected) - organized,
+        'elapsed_s': round(elapsed, 3),
+        'files_per_s': round(organized / elapsed, 1) if elapsed else 0,
+    }
+    result.update(latency_stats(trace_file, main.TRACER.run_id))
+    return result
+
+def bench_polling(workdir, params, rng):
+    """CPU cost of the polling watcher, scaled to 100k folder entries"""
+    from watchdog.events import FileSystemEventHandler
+
+    sandbox, downloads = prepare_sandbox(workdir, "polling")
+    planned = plan_files(rng, params['files'], params)
+    per_folder = params['poll_folder_size']
+    folders = [downloads / f"folder{i:05d}" for i in range((len(planned) + per_folder - 1) // per_folder)]
+    print(f"🏗️  Generating {len(planned):,} entries in {len(folders):,} folders for the polling run...")
+    for folder in folders:
+        folder.mkdir()
+    for index, (name, ext, size) in enumerate(planned):
+        (folders[index // per_folder] / name).touch()
+
+    root = main.WatchRoot('bench', downloads, main.ORGANIZER, main.SUBFOLDERS,
+                          recursive=True, max_depth=1, backend='polling')
+    watcher = main.PollingWatcher(FileSystemEventHandler(), [root])
+    # Freshly written folders are re-listed until their mtime is old enough to trust
+    time.sleep(watcher.RACY_WINDOW_NS / 1e9)
+    scale = 100_000 / max(len(planned), 1)
+
+    def cpu_ms(**kwargs):
+        start = time.process_time()
+        changes = watcher.poll(**kwargs)
+        return (time.process_time() - start) * 1000, changes
+
+    baseline_ms, _ = cpu_ms(baseline=True)
+    idle = [cpu_ms()[0] for _ in range(params['poll_rounds'])]
+    changed_folders = rng.sample(folders, max(1, len(folders) // 100))
+    for folder in changed_folders:
+        (folder / f"arrived_{rng.randint(0, 10 ** 9)}.pdf").touch()
+    changed_ms, events = cpu_ms()
+    full_ms, _ = cpu_ms(full=True)
+
+    print(f"🐢 Polled {len(watcher.dirs):,} folders; {events} new files found after touching "
+          f"{len(changed_folders)} folders")
+    return {
+        'entries': len(planned),
+        'folders': len(watcher.dirs),
+        'baseline_cpu_ms_per_100k': round(baseline_ms * scale, 1),
+        'idle_poll_cpu_ms_per_100k': round(sorted(idle)[len(idle) // 2] * scale, 2),
+        'changed_poll_cpu_ms_per_100k': round(changed_ms * scale, 2),
+        'full_scan_cpu_ms_per_100k': round(full_ms * scale, 1),
+    }
+
+def bench_undo(workdir, params, rng, show_output):
+    """Organize a tree as one transaction, then time undoing it"""
+    sandbox, downloads = prepare_sandbox(workdir, "undo")
+    planned = [p for p in plan_files(rng, params['files'], params) if p[1] in main.SUBFOLDERS]
+    print(f"🏗️  Organizing {len(planned):,} files to undo...")
+    for name, ext, size in planned:
+        (downloads / name).touch()
+    main.TRANSACTIONS.open(sandbox / "transactions")
+    txn = main.TRANSACTIONS.begin('backtrack')
+    with quiet(not show_output):
+        main.organize_existing_files(downloads, dict(main.DEFAULT_SETTINGS, backtrack_all_files=True))
+    main.TRANSACTIONS.end(txn)
+    # Names taken since the run must not be overwritten
+    conflicts = rng.sample(planned, len(planned) // 100)
+    for name, ext, size in conflicts:
+        (downloads / name).touch()
+
+    start = time.perf_counter()
+    with quiet(not show_output):
+        results = main.undo_transaction(txn.id, params['jobs'], folder=sandbox / "transactions")
+    elapsed = time.perf_counter() - start
+    main.TRANSACTIONS.folder = None
+    restored = sum(1 for _ in os.scandir(downloads)) - len(conflicts)
+    return {
+        'moves': txn.moves,
+        'restored': results['restored'],
+        'renamed_on_conflict': results['renamed_on_conflict'],
+        'files_back_in_downloads': restored,
+        'undo_elapsed_s': round(elapsed, 3),
+        'undo_files_per_s': round(results['restored'] / elapsed, 1) if elapsed else 0,
+    }
+
+def bench_scheduler(workdir, params, rng, show_output):
+    """Queue latency of small, large and live files with FIFO vs priority order
+    
+    Files go through the real FileHandler.enqueue path: the WorkerPool's
+    settle threads wait for each download, then the move stage ranks it.
+    Live downloads start empty and only then grow to their size, like a
+    browser download. Moves sleep as if every file were copied to another
+    drive at 1 GB/s: a burst of rescanned files is queued at once and live
+    downloads arrive while it drains.
+    """
+    planned = [p for p in plan_files(rng, min(params['files'], 3000), params) if p[1] in main.SUBFOLDERS]
+    service = [min(0.1, 0.0005 + size / 1024 ** 3) for _, _, size in planned]
+    workers = 4
+    live = set(rng.sample(range(len(planned)), len(planned) // 5))
+    drain_s = sum(service) / workers
+    arrivals = sorted(rng.uniform(0, drain_s) for _ in live)
+    print(f"🏗️  Queueing {len(planned):,} simulated moves ({len(live)} live) on {workers} workers, "
+          f"~{drain_s:.1f}s of work per run...")
+
+    real_move = main.move_file
+
+    def slow_move(file_path, dest_path, *args):
+        time.sleep(service[int(file_path.stem)])
+        return real_move(file_path, dest_path, *args)
+
+    saved = main.STABILITY_POLL_INTERVAL
+    main.STABILITY_POLL_INTERVAL = 0.01  # Settling is not what is measured here
+    main.move_file = slow_move
+    result = {'files': len(planned), 'live_files': len(live), 'workers': workers}
+    try:
+        for mode in ('fifo', 'priority'):
+            sandbox, downloads = prepare_sandbox(workdir, f"scheduler_{mode}")
+            root = main.WatchRoot('bench', downloads, main.ORGANIZER, main.SUBFOLDERS)
+            pool = main.WorkerPool(workers, main.PriorityScheduler(enabled=mode == 'priority'))
+            handler = main.FileHandler([root], pool)
+            done, finished = {}, threading.Semaphore(0)
+
+            def on_result(result):
+                done[int(result['path'].stem)] = time.perf_counter()
+                finished.release()
+
+            handler.on_result = on_result
+            queued = {}
+            with quiet(not show_output):
+                for index, (name, ext, size) in enumerate(planned):
+                    path = downloads / f"{index}.{ext}"
+                    with open(path, 'wb') as f:
+                        f.truncate(size)
+                start = time.perf_counter()
+                for index, (name, ext, size) in enumerate(planned):
+                    if index not in live:
+                        queued[index] = time.perf_counter()
+                        handler.enqueue(root, downloads / f"{index}.{ext}", main.NULL_TRACE, 'rescan')
+                for index, at in zip(sorted(live), arrivals):
+                    time.sleep(max(0, start + at - time.perf_counter()))
+                    path = downloads / f"{index}.{planned[index][1]}"
+                    with open(path, 'wb') as f:
+                        queued[index] = time.perf_counter()
+                        handler.enqueue(root, path, main.NULL_TRACE, 'live')
+                        f.truncate(planned[index][2])
+                for _ in planned:
+                    finished.acquire()
+                pool.shutdown()
+
+            groups = {
+                'small': [i for i in done if planned[i][2] <= 10 * 1024 ** 2],
+                'large': [i for i in done if planned[i][2] > 10 * 1024 ** 2],
+                'live': [i for i in done if i in live],
+            }
+            for group, indexes in groups.items():
+                values = [(done[i] - queued[i]) * 1000 for i in indexes]
+                if values:
+                    result[f'{mode}_{group}_p50_ms'] = round(analyze_trace.percentile(values, 50), 1)
+                    result[f'{mode}_{group}_p99_ms'] = round(analyze_trace.percentile(values, 99), 1)
+    finally:
+        main.move_file = real_move
+        main.STABILITY_POLL_INTERVAL = saved
+    return result
+
+def bench_shards(workdir, params, rng):
+    """Throughput of a CPU-heavy load (extracting xz-compressed zip bundles) in 1 and in N processes
+    
+    Each run gets a fresh copy of the bundles and its own ShardPool, started
+    before the clock so process start-up isn't counted.
+    """
+    import zipfile
+    template = workdir / "shards" / "bundles"
+    template.mkdir(parents=True)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9)))
+             for _ in range(5000)]
+    members = 8
+    for i in range(params['shard_bundles']):
+        with zipfile.ZipFile(template / f"bundle{i:03d}.zip", 'w', zipfile.ZIP_LZMA) as archive:
+            for j in range(members):
+                archive.writestr(f"part{j}.txt", ' '.join(rng.choices(words, k=80_000)))
+    counts = sorted({1, params['shards']})
+    print(f"🏗️  Extracting {params['shard_bundles']} bundles of {members} text files "
+          f"with {' and '.join(map(str, counts))} process(es)...")
+
+    saved = main.STABILITY_POLL_INTERVAL
+    main.STABILITY_POLL_INTERVAL = params['poll_interval']
+    settings = dict(main.DEFAULT_SETTINGS, extract_archives=True, journal_enabled=False)
+    result = {'bundles': params['shard_bundles'], 'cpus': os.cpu_count()}
+    try:
+        for shards in counts:
+            downloads, out = workdir / "shards" / f"run{shards}", workdir / "shards" / f"out{shards}"
+            shutil.copytree(template, downloads)
+            root = main.WatchRoot('bench', downloads, out, {'txt': out / "Text_Files"})
+            done = threading.Semaphore(0)
+            with quiet(True):
+                pool = main.ShardPool(shards, [root], settings)
+                handler = main.FileHandler([root], pool)
+                handler.on_result = lambda result: done.release()
+                while not all(pool.gauges):
+                    time.sleep(0.01)
+                start = time.perf_counter()
+                for path in sorted(downloads.iterdir()):
+                    handler.enqueue(root, path, main.NULL_TRACE, 'backtrack')
+                for _ in range(params['shard_bundles']):
+                    done.acquire()
+                elapsed = time.perf_counter() - start
+                pool.shutdown()
+            extracted = sum(1 for _ in (out / "Text_Files").iterdir())
+            result[f'files_per_s_{shards}'] = round(extracted / elapsed, 1)
+    finally:
+        main.STABILITY_POLL_INTERVAL = saved
+    result['sharded_files_per_s'] = result[f'files_per_s_{counts[-1]}']
+    result['speedup'] = round(result['sharded_files_per_s'] / result['files_per_s_1'], 2)
+    result['efficiency'] = round(result['speedup'] / counts[-1], 2)
+    return result
+
+def import_times(env):
+    """Run python -X importtime -c 'import main'; returns (total ms, {module: cumulative ms})"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=Path(main.__file__).parent,
+                          env=env, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            name = parts[2].strip()
+            if name == 'site':
+                modules.clear()  # imported by the interpreter before main, not because of it
+                continue
+            modules[name] = max(modules.get(name, 0), int(parts[1]) / 1000)
+    return modules.get('main', 0), modules
+
+def time_to_first_watch(app, env, timeout=30):
+    """Seconds from launching main.py --fast-start until it prints that it is watching"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-u', str(app / "main.py"), '--fast-start'], cwd=app, env=env,
+                            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding='utf-8', errors='replace')
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            if line.startswith("👀"):
+                return time.perf_counter() - start
+        return None
+    finally:
+        timer.cancel()
+        proc.kill()
+        proc.wait()
+
+def bench_startup(workdir, params, rng):
+    """Import cost of main.py and time until --fast-start is watching
+    
+    main.py runs from a copy in the sandbox with HOME pointing there, so it
+    writes its settings, journal and catalog next to the copy and watches
+    a Downloads folder holding a backtrack's worth of files.
+    """
+    sandbox = workdir / "startup"
+    app, home = sandbox / "app", sandbox / "home"
+    app.mkdir(parents=True)
+    source = Path(main.__file__).parent
+    for name in ("main.py", "VERSION", "BLAMITE_TITLE.txt"):
+        if (source / name).exists():
+            shutil.copy2(source / name, app / name)
+    (home / "Downloads").mkdir(parents=True)
+    for name, ext, size in plan_files(rng, min(params['files'], 2000), params):
+        write_file(home / "Downloads" / name, min(size, 64 * 1024), False)
+    env = dict(os.environ, HOME=str(home), USERPROFILE=str(home))
+    print(f"🏗️  Starting main.py {params['startup_runs']} times (plus a warm-up) with "
+          f"{sum(1 for _ in os.scandir(home / 'Downloads')):,} files in Downloads...")
+
+    import_runs, watch_runs, modules = [], [], {}
+    for run in range(params['startup_runs'] + 1):
+        total, modules = import_times(env)
+        watched = time_to_first_watch(app, env)
+        if watched is None:
+            raise RuntimeError("main.py --fast-start never reported that it was watching")
+        if run:  # the first run warms the OS file cache
+            import_runs.append(total)
+            watch_runs.append(watched * 1000)
+    slowest = sorted((ms, name) for name, ms in modules.items() if name != 'main')[-5:]
+    return {
+        'runs': len(watch_runs),
+        'import_ms': round(analyze_trace.percentile(import_runs, 50), 1),
+        'first_watch_ms': round(analyze_trace.percentile(watch_runs, 50), 1),
+        'first_watch_max_ms': round(max(watch_runs), 1),
+        'slowest_imports': ', '.join(f"{name} {ms:.1f}ms" for ms, name in reversed(slowest)),
+    }
+
+def compare_results(current, baseline, threshold):
+    """Return a list of (path, metric, old, new, change %) that regressed"""
+    regressions = []
+    for path in ('backtrack', 'live', 'polling', 'undo', 'scheduler', 'startup', 'shards'):
+        if path not in current or path not in baseline:
+            continue
+        for metric, better in COMPARED_METRICS.items():
+            old, new = baseline[path].get(metric), current[path].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = change < -threshold if better == 'higher' else change > threshold
+            print(f"  {path:<10}{metric:<16}{old:>12}{new:>12}{change:>+9.1f}%  "
+                  f"{'⚠️  REGRESSION' if worse else '✅'}")
+            if worse:
+                regressions.append((path, metric, old, new, round(change, 1)))
+    return regressions
+
+def print_result(name, result):
+    print(f"\n📊 {name}:")
+    for key, value in result.items():
+        print(f"  {key:<30}{value}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="BLAMITE synthetic-workload benchmarks")
+    parser.add_argument('--scenario', default='quick', choices=sorted(SCENARIOS))
+    parser.add_argument('--files', type=int, help="Files in the backtrack tree")
+    parser.add_argument('--live-files', type=int, help="Files arriving during the live run")
+    parser.add_argument('--sizes', choices=['tiny', 'mixed', 'media'])
+    parser.add_argument('--mix', choices=sorted(EXTENSION_MIXES))
+    parser.add_argument('--collisions', type=float, help="Share of names already taken in the destination")
+    parser.add_argument('--slow-writers', type=float, help="Share of live files written slowly in chunks")
+    parser.add_argument('--poll-interval', type=float, default=0.05,
+                        help="Stability poll interval used for the live run (seconds)")
+    parser.add_argument('--live-timeout', type=float, default=600)
+    parser.add_argument('--trace-sample', type=int,
+                        help="Percentage of backtrack files traced for latency (default: 100, or 10 above 100k files)")
+    parser.add_argument('--dense', action='store_true', help="Write real data instead of sparse files")
+    parser.add_argument('--poll-folder-size', type=int, default=1000,
+                        help="Entries per folder in the polling run")
+    parser.add_argument('--poll-rounds', type=int, default=20, help="Idle polls to time in the polling run")
+    parser.add_argument('--jobs', type=int, default=8, help="Parallel workers for the undo run")
+    parser.add_argument('--startup-runs', type=int, default=5, help="Launches to time in the startup run")
+    parser.add_argument('--shards', type=int, default=os.cpu_count(), help="Processes for the sharded run")
+    parser.add_argument('--shard-bundles', type=int, default=24, help="Archives extracted per sharded run")
+    parser.add_argument('--only', choices=['backtrack', 'live', 'polling', 'undo', 'scheduler', 'startup', 'shards'],
+                        help="Run a single path")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--save', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Compare against a baseline JSON file")
+    parser.add_argument('--threshold', type=float, default=15.0,
+                        help="Allowed change in percent before a metric counts as a regression")
+    parser.add_argument('--workdir', help="Directory for the sandbox (default: system temp)")
+    parser.add_argument('--show-output', action='store_true', help="Show the organizer's per-file output")
+    return parser.parse_args(argv)
+
+def main_benchmark(argv=None):
+    args = parse_args(argv)
+    params = dict(SCENARIOS[args.scenario])
+    for key in ('files', 'live_files', 'sizes', 'mix', 'collisions', 'slow_writers'):
+        if getattr(args, key) is not None:
+            params[key] = getattr(args, key)
+    params.update({
+        'poll_interval': args.poll_interval,
+        'live_timeout': args.live_timeout,
+        'dense': args.dense,
+        'poll_folder_size': args.poll_folder_size,
+        'poll_rounds': args.poll_rounds,
+        'jobs': args.jobs,
+        'startup_runs': args.startup_runs,
+        'shards': args.shards,
+        'shard_bundles': args.shard_bundles,
+        'trace_sample': args.trace_sample or (10 if params['files'] > 100_000 else 100),
+    })
+
+    print("=" * 60)
+    print(f"⏱️  BLAMITE BENCHMARK - scenario '{args.scenario}'")
+    print("=" * 60)
+
+    results = {
+        'scenario': args.scenario,
+        'params': params,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'version': main.get_current_version(),
+    }
+    saved_paths = (main.DOWNLOADS, main.ORGANIZER)
+    workdir = Path(tempfile.mkdtemp(prefix="blamite_bench_", dir=args.workdir))
+    try:
+        if args.only in (None, 'backtrack'):
+            results['backtrack'] = bench_backtrack(workdir, params, random.Random(args.seed), args.show_output)
+            print_result("Backtrack", results['backtrack'])
+        if args.only in (None, 'live'):
+            results['live'] = bench_live(workdir, params, random.Random(args.seed + 1), args.show_output)
+            print_result("Live", results['live'])
+        if args.only in (None, 'polling'):
+            results['polling'] = bench_polling(workdir, params, random.Random(args.seed + 2))
+            print_result("Polling", results['polling'])
+        if args.only in (None, 'undo'):
+            results['undo'] = bench_undo(workdir, params, random.Random(args.seed + 3), args.show_output)
+            print_result("Undo", results['undo'])
+        if args.only in (None, 'scheduler'):
+            results['scheduler'] = bench_scheduler(workdir, params, random.Random(args.seed + 4), args.show_output)
+            print_result("Scheduler", results['scheduler'])
+        if args.only in (None, 'startup'):
+            results['startup'] = bench_startup(workdir, params, random.Random(args.seed + 5))
+            print_result("Startup", results['startup'])
+        if args.only in (None, 'shards'):
+            results['shards'] = bench_shards(workdir, params, random.Random(args.seed + 6))
+            print_result("Shards", results['shards'])
+    finally:
+        main.configure_paths(*saved_paths)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save:
+        save_path = Path(args.save)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        save_path.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Results saved to {save_path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\n🔍 Comparing with {args.compare} (threshold {args.threshold}%):")
+        if baseline.get('params') != params:
+            print("⚠️  Baseline was recorded with different parameters")
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} metric(s) regressed")
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
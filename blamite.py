@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+BLAMITE Organizer as a library
+
+Organizes files from other programs in-process, without the interactive app.
+Roots use the blamite_roots.json format:
+
+    from blamite import Organizer
+
+    organizer = Organizer({"roots": [
+        {"name": "scans", "source": "/srv/scans", "destination": "/srv/organized",
+         "rules": {"pdf": "Scans"}, "inherit_rules": False}]})
+
+    for result in organizer.organize_paths(["/srv/scans/a.pdf", "/srv/scans/b.txt"]):
+        print(result['status'], result['dest'])
+    for result in organizer.scan("scans"):
+        ...
+    organizer.start(on_result=print)  # watch the roots in the background
+    organizer.stop()
+
+Every result is a dict with path, root, status, dest and error. Batch calls
+move files right away through the same batched engine as backtracks and
+stream results back as each batch finishes ('organized', 'unsupported',
+'not_in_root', 'missing' or 'error'). The watcher waits for downloads to
+finish first and reports the live outcomes ('organized', 'timeout', ...).
+Each organizer has its own journal, transaction log and catalog, used only
+when a path for them is given, so several organizers and the app can share
+a process. hooks takes post-move hooks as blamite_hooks.json entries or
+main.PostMoveHook objects; close() waits for them to deliver what is
+queued. With links (a manifest path), files are linked into their folders
+instead of moved (organize_mode=link). Messages go to the "blamite" logger.
+"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import main
+
+log = logging.getLogger('blamite')
+
+def _log(message):
+    """Engine messages start with an emoji; problems are logged as warnings"""
+    if message.startswith(('⚠️', '❗', '❌')):
+        log.warning(message)
+    else:
+        log.info(message)
+
+class Organizer:
+    """Organize files by explicit roots, rules and destinations"""
+    def __init__(self, config=None, settings=None, workers=4, journal=None, transactions=None, catalog=None,
+                 hooks=None, links=None):
+        self.settings = dict(main.DEFAULT_SETTINGS, **(settings or {}))
+        entries = (config or {}).get('roots')
+        if entries is None:
+            self.roots = [main.default_root(self.settings)]
+        else:
+            self.roots = main.roots_from_config(entries, self.settings, say=_log)
+        if not self.roots:
+            raise ValueError("No valid roots in the configuration")
+        self.workers = workers
+        # This organizer's own, never the process-wide main.JOURNAL, main.CATALOG, ...
+        self.journal = main.MoveJournal(_log)
+        self.transactions = main.TransactionLog()
+        self.catalog = main.Catalog(_log)
+        self.hooks = main.HookPipeline(_log)
+        self.links = main.LinkView(_log)
+        if journal:
+            self.journal.open(journal)
+        if transactions:
+            self.transactions.open(transactions)
+        if catalog:
+            self.catalog.open(catalog)
+        for index, hook in enumerate(hooks or []):
+            if not isinstance(hook, main.PostMoveHook):
+                hook = main.hook_from_config(hook, index)
+            self.hooks.add(hook)
+        if links:
+            self.links.configure({'organize_mode': 'link'}, links)
+        self.services = main.Services(self.journal, self.transactions, self.catalog, self.hooks, self.links, _log)
+        self.engine = main.FileHandler(self.roots, services=self.services)  # Root lookup and the live pipeline
+        self.observer = None
+        self.live = None  # Transaction of the files moved while watching
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Stop watching and close this organizer's journal, transaction log, catalog, hooks and link view"""
+        self.stop()
+        for resource in (self.journal, self.transactions, self.catalog, self.hooks, self.links):
+            resource.close()
+    
+    def root(self, name):
+        for root in self.roots:
+            if root.name == name:
+                return root
+        raise KeyError(f"No root named {name!r}")
+    
+    def organize_paths(self, paths, batch_size=None):
+        """Organize the given files now; yields one result per path as batches finish"""
+        batch_size = batch_size or main.BACKTRACK_BATCH
+        batches = {}  # root name -> (root, [(file_path, destination folder, trace)])
+        txn = self.transactions.begin('api')
+        try:
+            for path in paths:
+                file_path = Path(path)
+                root = self.engine.root_for(file_path)
+                if root is None or root.source not in file_path.parents:
+                    yield self._result(file_path, None, 'not_in_root')
+                    continue
+                ext = main.organizable_extension(file_path, root.subfolders)
+                if ext is None:
+                    yield self._result(file_path, root, 'unsupported')
+                    continue
+                _, batch = batches.setdefault(root.name, (root, []))
+                batch.append((file_path, root.folder_for(ext, file_path), main.NULL_TRACE))
+                if len(batch) >= batch_size:
+                    yield from self._move(root, batch)
+            for root, batch in batches.values():
+                yield from self._move(root, batch)
+        finally:
+            self.transactions.end(txn)
+    
+    def scan(self, root=None, since=None):
+        """Organize the files already in a root (default: every root); yields results
+        
+        since (a datetime or timestamp) limits it to files changed after that.
+        """
+        roots = [self.root(root) if isinstance(root, str) else root] if root is not None else self.roots
+        if isinstance(since, datetime):
+            since = since.timestamp()
+        for watch_root in roots:
+            files = watch_root.iter_files()
+            if since is not None:
+                files = (f for f in files if self._changed_since(f, since))
+            yield from self.organize_paths(files)
+    
+    def start(self, on_result=None):
+        """Watch the roots in the background; on_result gets a result dict per file"""
+        if self.observer is not None:
+            return
+        self.engine.pool = main.WorkerPool(self.workers, main.PriorityScheduler.from_settings(self.settings))
+        self.engine.stopped = self.engine.pool.stopped
+        self.engine.on_result = on_result
+        self.live = self.transactions.begin('live')
+        self.observer = main.start_observer(self.engine, self.roots, self.settings)
+    
+    def stop(self):
+        """Stop watching; files still waiting for their download to finish are dropped"""
+        if self.observer is None:
+            return
+        self.observer.stop()
+        self.observer.join()
+        self.engine.pool.shutdown()
+        self.engine.pool = None
+        self.observer = None
+        self.transactions.end(self.live)
+        self.live = None
+    
+    def _move(self, root, batch):
+        with main.DirectoryMover(root.name, journal=self.journal) as mover:
+            results = main.move_files(batch, root.name, mover, 'api', self.services)
+        batch.clear()
+        for file_path, dest_path, error in results:
+            if error is None:
+                yield self._result(file_path, root, 'organized', dest_path)
+            elif isinstance(error, FileNotFoundError) and not file_path.exists():
+                yield self._result(file_path, root, 'missing', error=str(error))
+            else:
+                yield self._result(file_path, root, 'error', error=str(error))
+    
+    @staticmethod
+    def _changed_since(file_path, since):
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        return max(stat.st_mtime, stat.st_ctime) >= since
+    
+    @staticmethod
+    def _result(file_path, root, status, dest=None, error=None):
+        return {'path': file_path, 'root': root.name if root is not None else None,
+                'status': status, 'dest': dest, 'error': error}
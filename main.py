@@ -4,41 +4,146 @@ import sys
 import threading
 import time
 import json
-import subprocess
-import tempfile
-from pathlib import Path
+import argparse
+import errno
+import heapq
+import queue
+import random
+import re
+import select
+import struct
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from pathlib import Path, PurePosixPath
 from datetime import datetime, timedelta
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import (DirCreatedEvent, DirDeletedEvent, DirMovedEvent, FileCreatedEvent,
+                             FileDeletedEvent, FileModifiedEvent, FileMovedEvent, FileSystemEventHandler)
 
-try:
-    import requests
-except ImportError:
-    requests = None
+# Imported on first use to keep startup fast: requests, sqlite3, ctypes, gzip,
+# hashlib, subprocess, tempfile, cProfile/pstats/tracemalloc and watchdog's Observer
+
+def short_id(length):
+    """Random hex id like uuid4().hex[:length], without importing uuid at startup"""
+    return os.urandom((length + 1) // 2).hex()[:length]
+
+def load_requests():
+    """The requests module, or None when it isn't installed"""
+    try:
+        import requests
+    except ImportError:
+        return None
+    return requests
 
 # Define paths
 DESKTOP = Path.home() / "Desktop"
 ORGANIZER = DESKTOP / "BLAMITE_Organizer"
-SUBFOLDERS = {
-    "pdf": ORGANIZER / "PDFs",
-    "doc": ORGANIZER / "Word_Documents",
-    "docx": ORGANIZER / "Word_Documents",
-    "xls": ORGANIZER / "Excel_Files",
-    "xlsx": ORGANIZER / "Excel_Files",
-    "mp3": ORGANIZER / "Audio_Files",
-    "mp4": ORGANIZER / "Video_Files",
-    "mov": ORGANIZER / "Video_Files",
-    "gif": ORGANIZER / "Images",
-    "png": ORGANIZER / "Images",
-    "jpg": ORGANIZER / "Images",
-    "jpeg": ORGANIZER / "Images",
-    "txt": ORGANIZER / "Text_Files"
+SUBFOLDER_NAMES = {
+    "pdf": "PDFs",
+    "doc": "Word_Documents",
+    "docx": "Word_Documents",
+    "xls": "Excel_Files",
+    "xlsx": "Excel_Files",
+    "mp3": "Audio_Files",
+    "mp4": "Video_Files",
+    "mov": "Video_Files",
+    "gif": "Images",
+    "png": "Images",
+    "jpg": "Images",
+    "jpeg": "Images",
+    "txt": "Text_Files"
 }
+SUBFOLDERS = {ext: ORGANIZER / name for ext, name in SUBFOLDER_NAMES.items()}
 DOWNLOADS = Path.home() / "Downloads"
 
+# Download completion detection (seconds / poll counts)
+STABILITY_POLL_INTERVAL = 1  # Wait between size checks
+STABILITY_CHECKS = 3  # Unchanged size checks that mean "download complete"
+STABILITY_MAX_ATTEMPTS = 60  # Give up after this many checks
+LOCKED_RETRY_DELAY = 2  # Wait when the file is locked or a check fails
+
 # Settings file for user preferences
 SETTINGS_FILE = Path(__file__).parent / "blamite_settings.txt"
 
+# Optional per-root configuration for watching several source folders
+ROOTS_FILE = Path(__file__).parent / "blamite_roots.json"
+
+# Optional follow-up actions run after files are organized (webhooks, scanners, indexers)
+HOOKS_FILE = Path(__file__).parent / "blamite_hooks.json"
+
+# Default user preferences (also used by "Reset to defaults")
+DEFAULT_SETTINGS = {
+    'backtrack_enabled': True,
+    'backtrack_days': 30,
+    'backtrack_all_files': False,  # If True, ignore date filtering
+    'run_on_startup': False,  # If True, add to Windows startup
+    'trace_enabled': False,  # If True, write per-file spans to TRACE_FILE
+    'trace_sample_rate': 100,  # Percentage of files to trace (1-100)
+    'worker_threads': 4,  # Files processed in parallel by the live watcher
+    'recursive_watch': False,  # If True, also organize files saved into subfolders
+    'recursive_max_depth': 3,  # Subfolder levels below Downloads to watch
+    'recursive_exclude': 'node_modules,.git,.svn,.hg,__pycache__,.venv,venv,.tox',  # Subfolders never watched
+    'journal_enabled': True,  # If True, record moves in JOURNAL_FILE so a crash can be recovered
+    'watch_backend': 'auto',  # auto, native or polling (auto polls folders on network shares)
+    'poll_interval_min': 1,  # Seconds between polls right after activity
+    'poll_interval_max': 30,  # Seconds between polls once the folder has been idle a while
+    'priority_scheduling': True,  # If True, small files and live downloads go first; False keeps arrival order
+    'priority_weights': 'video_files:0.5',  # folder:weight pairs; higher weights are picked sooner
+    'io_limit_live_mb': 0,  # MB/s for copying new downloads to another drive (0 = unlimited)
+    'io_limit_background_mb': 0,  # MB/s for backtracks and rescans (0 = unlimited)
+    'io_priority': 'background',  # normal, background (backtracks at idle I/O priority) or idle (everything)
+    'catalog_enabled': True,  # If True, index organized files in CATALOG_FILE for --find
+    'fast_start': False,  # If True, start watching right away: no prompt, update check and backtrack in the background
+    'dashboard': False,  # If True, show a live status screen instead of a line per event
+    'compaction_enabled': False,  # If True, compress organized files nobody has opened in a while
+    'compact_after_days': 30,  # Files organized, changed and read longer ago than this are cold
+    'compact_extensions': 'txt,doc,xls',  # Compressible formats (docx/xlsx are zip files already)
+    'compact_codec': 'xz',  # xz, bz2 or gz (the fastest)
+    'compact_workers': 1,  # Compressor processes, all at the lowest CPU and I/O priority
+    'compact_interval_hours': 24,  # Time between compaction passes while running
+    'extract_archives': False,  # If True, unpack downloaded zip/tar bundles straight into the category folders
+    'extract_max_mb': 2048,  # Give up on an archive that expands to more than this
+    'extract_max_members': 10000,  # Give up on an archive with more files than this
+    'shards': 1,  # Worker processes for CPU-heavy work such as extraction (1 = all in this process)
+    'pool_reserve_mb': 1024,  # Folder pools spill to their next folder before a volume has less free than this
+    'pool_reserve_percent': 5,  # ... or than this share of the volume, whichever is more
+    'pool_refresh_seconds': 30,  # How often free space of pool folders is read again
+    'organize_mode': 'move'  # move, or link: leave files where they are and link them into the folders
+}
+
+# Per-file lifecycle trace (JSONL, one span per line)
+TRACE_FILE = Path(__file__).parent / "blamite_trace.jsonl"
+
+# Write-ahead journal of pending and in-flight moves, replayed after a crash
+JOURNAL_FILE = Path(__file__).parent / "blamite_journal.jsonl"
+
+# One move log per backtrack run or live session, for --undo
+TRANSACTIONS_DIR = Path(__file__).parent / "blamite_transactions"
+
+# Searchable index of every organized file (SQLite + FTS5), for --find
+CATALOG_FILE = Path(__file__).parent / "blamite_catalog.db"
+
+# Record of compacted files, so --restore can bring them back
+COMPACTION_MANIFEST = Path(__file__).parent / "blamite_compacted.jsonl"
+
+# Links made with organize_mode=link, so --prune-links can find the dangling ones
+LINKS_MANIFEST = Path(__file__).parent / "blamite_links.jsonl"
+
+# Output folder for --profile (.pstats dumps and memory diffs)
+PROFILE_DIR = Path(__file__).parent / "blamite_profiles"
+
+def configure_paths(downloads=None, organizer=None):
+    """Point the organizer at different folders (used by benchmarks and tests)"""
+    global DOWNLOADS, ORGANIZER, DESKTOP
+    if downloads is not None:
+        DOWNLOADS = Path(downloads)
+    if organizer is not None:
+        ORGANIZER = Path(organizer)
+        DESKTOP = ORGANIZER.parent
+        # Update in place so modules holding a reference see the new folders
+        SUBFOLDERS.clear()
+        SUBFOLDERS.update({ext: ORGANIZER / name for ext, name in SUBFOLDER_NAMES.items()})
+
 def get_current_version():
     """Get current version from version file or default"""
     try:
@@ -76,6 +181,7 @@ def version_compare(v1, v2):
 
 def check_for_updates():
     """Check GitHub releases for newer version"""
+    requests = load_requests()
     if not requests:
         return {'update_available': False, 'error': 'Requests module not available'}
     
@@ -146,8 +252,22 @@ def show_update_prompt(update_info):
         else:
             print("Please enter 'y' for yes or 'n' for no.")
 
+def announce_update():
+    """Print a notice when a newer release exists (never raises)"""
+    try:
+        update_info = check_for_updates()
+        if update_info.get('update_available', False):
+            print("\n🔔 A new version is available!")
+            print(f"Current: v{update_info['current_version']} → Latest: v{update_info['latest_version']}")
+            print("💡 Go to Settings (press 'S') to update or continue normally.")
+    except Exception:
+        pass  # Don't let update checks interrupt startup
+
 def download_and_install_update(download_url, latest_version):
     """Download and install the update"""
+    import subprocess
+    import tempfile
+    requests = load_requests()
     if not requests:
         print("❌ Cannot download updates - requests module not available")
         return False
@@ -275,12 +395,7 @@ def manual_update_check():
 
 def load_settings():
     """Load user settings from file"""
-    default_settings = {
-        'backtrack_enabled': True,
-        'backtrack_days': 30,
-        'backtrack_all_files': False,  # If True, ignore date filtering
-        'run_on_startup': False  # If True, add to Windows startup
-    }
+    default_settings = dict(DEFAULT_SETTINGS)
     
     if not SETTINGS_FILE.exists():
         save_settings(default_settings)
@@ -327,7 +442,68 @@ def save_settings(settings):
             f.write("# WARNING: Setting this to true will organize ALL files in Downloads!\n")
             f.write(f"backtrack_all_files={str(settings['backtrack_all_files']).lower()}\n\n")
             f.write("# Run BLAMITE Organizer on Windows startup (true/false)\n")
-            f.write(f"run_on_startup={str(settings['run_on_startup']).lower()}\n")
+            f.write(f"run_on_startup={str(settings['run_on_startup']).lower()}\n\n")
+            f.write("# Record per-file timing spans to blamite_trace.jsonl (true/false)\n")
+            f.write(f"trace_enabled={str(settings.get('trace_enabled', False)).lower()}\n\n")
+            f.write("# Percentage of files to trace when tracing is enabled (1-100)\n")
+            f.write(f"trace_sample_rate={settings.get('trace_sample_rate', 100)}\n\n")
+            f.write("# Number of files the watcher processes in parallel\n")
+            f.write(f"worker_threads={settings.get('worker_threads', 4)}\n\n")
+            f.write("# Also organize files saved into subfolders of Downloads (true/false)\n")
+            f.write(f"recursive_watch={str(settings.get('recursive_watch', False)).lower()}\n\n")
+            f.write("# How many subfolder levels to watch when recursive_watch=true\n")
+            f.write(f"recursive_max_depth={settings.get('recursive_max_depth', 3)}\n\n")
+            f.write("# Comma-separated subfolder names that are never watched\n")
+            f.write(f"recursive_exclude={settings.get('recursive_exclude', DEFAULT_SETTINGS['recursive_exclude'])}\n\n")
+            f.write("# Record pending and in-flight moves so they can be finished after a crash (true/false)\n")
+            f.write(f"journal_enabled={str(settings.get('journal_enabled', True)).lower()}\n\n")
+            f.write("# How to watch folders: auto, native or polling\n")
+            f.write("# auto polls folders on network shares (SMB/NFS), where change notifications never arrive\n")
+            f.write(f"watch_backend={settings.get('watch_backend', 'auto')}\n\n")
+            f.write("# Polling interval in seconds: drops to the minimum after activity, grows to the maximum when idle\n")
+            f.write(f"poll_interval_min={settings.get('poll_interval_min', 1)}\n")
+            f.write(f"poll_interval_max={settings.get('poll_interval_max', 30)}\n\n")
+            f.write("# Pick queued files by priority: live downloads and small files first (true/false)\n")
+            f.write(f"priority_scheduling={str(settings.get('priority_scheduling', True)).lower()}\n\n")
+            f.write("# Priority weight per organizer folder, e.g. pdfs:2,video_files:0.5 (default 1)\n")
+            f.write(f"priority_weights={settings.get('priority_weights', DEFAULT_SETTINGS['priority_weights'])}\n\n")
+            f.write("# Disk bandwidth limits in MB/s (0 = unlimited); 'throttle' changes them while running\n")
+            f.write(f"io_limit_live_mb={settings.get('io_limit_live_mb', 0)}\n")
+            f.write(f"io_limit_background_mb={settings.get('io_limit_background_mb', 0)}\n\n")
+            f.write("# I/O priority: normal, background (backtracks yield to other programs) or idle (all work does)\n")
+            f.write(f"io_priority={settings.get('io_priority', 'background')}\n\n")
+            f.write("# Keep a searchable catalog of organized files for --find (true/false)\n")
+            f.write(f"catalog_enabled={str(settings.get('catalog_enabled', True)).lower()}\n\n")
+            f.write("# Start watching immediately: no Enter prompt, update check and backtrack run in the background (true/false)\n")
+            f.write(f"fast_start={str(settings.get('fast_start', False)).lower()}\n\n")
+            f.write("# Show a live status screen (downloads, queues, throughput, recent moves) instead of a line per event (true/false)\n")
+            f.write(f"dashboard={str(settings.get('dashboard', False)).lower()}\n\n")
+            f.write("# Compress files in the organizer that nobody has opened in a while; --restore brings them back (true/false)\n")
+            f.write(f"compaction_enabled={str(settings.get('compaction_enabled', False)).lower()}\n")
+            f.write("# Days since a file was organized, changed or read before it counts as cold\n")
+            f.write(f"compact_after_days={settings.get('compact_after_days', 30)}\n")
+            f.write("# Extensions to compress (comma-separated)\n")
+            f.write(f"compact_extensions={settings.get('compact_extensions', DEFAULT_SETTINGS['compact_extensions'])}\n")
+            f.write("# Compression: xz, bz2 or gz (gz is the fastest)\n")
+            f.write(f"compact_codec={settings.get('compact_codec', 'xz')}\n")
+            f.write("# Compressor processes and hours between passes\n")
+            f.write(f"compact_workers={settings.get('compact_workers', 1)}\n")
+            f.write(f"compact_interval_hours={settings.get('compact_interval_hours', 24)}\n\n")
+            f.write("# Unpack downloaded zip/tar bundles: files with a rule go to their folders, the bundle to Archives (true/false)\n")
+            f.write(f"extract_archives={str(settings.get('extract_archives', False)).lower()}\n")
+            f.write("# Archives that expand beyond this many MB or files are left alone (zip bomb protection)\n")
+            f.write(f"extract_max_mb={settings.get('extract_max_mb', 2048)}\n")
+            f.write(f"extract_max_members={settings.get('extract_max_members', 10000)}\n\n")
+            f.write("# Worker processes, each running worker_threads threads; more than 1 spreads CPU-heavy work over cores\n")
+            f.write(f"shards={settings.get('shards', 1)}\n\n")
+            f.write("# Folder pools (rules listing several folders in blamite_roots.json) move on to their next folder\n")
+            f.write("# before a volume has less than pool_reserve_mb or pool_reserve_percent free\n")
+            f.write(f"pool_reserve_mb={settings.get('pool_reserve_mb', 1024)}\n")
+            f.write(f"pool_reserve_percent={settings.get('pool_reserve_percent', 5)}\n")
+            f.write("# Seconds between free space readings of pool folders\n")
+            f.write(f"pool_refresh_seconds={settings.get('pool_refresh_seconds', 30)}\n")
+            f.write("# move, or link: keep files in the watched folder and hardlink (or symlink) them into the folders\n")
+            f.write(f"organize_mode={settings.get('organize_mode', 'move')}\n")
     except Exception as e:
         print(f"⚠️  Error saving settings: {e}")
 
@@ -454,6 +630,7 @@ def show_settings_menu():
                     print("❌ All files mode cancelled")
                 else:
                     print("✅ All files mode enabled")
+                    print("💡 Changed your mind later? 'python main.py --undo' moves a run's files back")
             else:
                 print("✅ All files mode disabled")
                 
@@ -476,12 +653,7 @@ def show_settings_menu():
                 if check_startup_status():
                     manage_startup(False)
                 
-                settings = {
-                    'backtrack_enabled': True,
-                    'backtrack_days': 30,
-                    'backtrack_all_files': False,
-                    'run_on_startup': False
-                }
+                settings = dict(DEFAULT_SETTINGS)
                 print("✅ Settings reset to defaults")
                 
         elif choice == '10':
@@ -492,326 +664,5049 @@ def show_settings_menu():
         else:
             print("❌ Invalid choice. Please enter 1-10")
 
-# Create organizer folders if they don't exist
-def setup_folders():
-    """Create organizer folders if they don't exist and show info"""
-    print("\n" + "="*50)
-    print("📁 SETTING UP BLAMITE ORGANIZER FOLDERS")
-    print("="*50)
+class _NullTrace:
+    """Stand-in trace used when tracing is off or a file was not sampled"""
+    def event(self, name, **attrs):
+        pass
+
+    def span(self, name, **attrs):
+        return nullcontext(attrs)
+
+    def record(self, name, start, end, **attrs):
+        pass
+
+    def finish(self, outcome, **attrs):
+        pass
+
+NULL_TRACE = _NullTrace()
+
+class FileTrace:
+    """Timestamped spans for a single file as it moves through the organizer"""
+    def __init__(self, tracer, file_path, source):
+        self.tracer = tracer
+        self.trace_id = short_id(12)
+        self.file = Path(file_path).name
+        self.source = source
+        self.started = time.time()
+        self.records = []
+        self.finished = False
+
+    def _record(self, name, start, end, attrs):
+        record = {
+            'run': self.tracer.run_id,
+            'trace': self.trace_id,
+            'file': self.file,
+            'source': self.source,
+            'span': name,
+            'start': round(start, 6),
+            'dur_ms': round((end - start) * 1000, 3)
+        }
+        record.update(attrs)
+        self.records.append(record)
+
+    def record(self, name, start, end, **attrs):
+        """Record a span whose start and end were measured elsewhere"""
+        self._record(name, start, end, attrs)
+
+    def event(self, name, **attrs):
+        """Record a zero-length marker (e.g. 'event_received')"""
+        now = time.time()
+        self._record(name, now, now, attrs)
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time a block; the yielded dict can be filled with extra attributes"""
+        start = time.time()
+        try:
+            yield attrs
+        finally:
+            self._record(name, start, time.time(), attrs)
+
+    def finish(self, outcome, **attrs):
+        """Close the root 'file' span and hand all records to the tracer"""
+        if self.finished:
+            return
+        self.finished = True
+        attrs['outcome'] = outcome
+        self._record('file', self.started, time.time(), attrs)
+        self.tracer.write(self.records)
+
+class Tracer:
+    """Writes per-file lifecycle spans to a JSONL trace, with optional sampling"""
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 100
+        self.path = TRACE_FILE
+        self.run_id = None
+        self.lock = threading.Lock()
+
+    def configure(self, enabled, sample_rate=100, path=None, new_run=False):
+        self.enabled = enabled
+        self.sample_rate = max(1, min(100, int(sample_rate)))
+        if path is not None:
+            self.path = Path(path)
+        if enabled and (self.run_id is None or new_run):
+            self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S-') + short_id(6)
+
+    def start(self, file_path, source):
+        """Begin a trace for one file, or return NULL_TRACE if not traced"""
+        if not self.enabled:
+            return NULL_TRACE
+        if self.sample_rate < 100 and random.random() * 100 >= self.sample_rate:
+            return NULL_TRACE
+        return FileTrace(self, file_path, source)
+
+    def write(self, records):
+        # Write a whole file's spans at once so its lines stay together
+        lines = ''.join(json.dumps(record) + '\n' for record in records)
+        try:
+            with self.lock:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+        except OSError as e:
+            print(f"⚠️  Could not write trace: {e}")
+
+TRACER = Tracer()
+
+def configure_tracing(settings):
+    """Apply trace settings to the global tracer"""
+    TRACER.configure(settings.get('trace_enabled', False),
+                     settings.get('trace_sample_rate', 100))
+    if TRACER.enabled:
+        print(f"🔬 Tracing enabled ({TRACER.sample_rate}% of files) → {TRACER.path} [run {TRACER.run_id}]")
+
+# Before Python 3.12 a cProfile.Profile only sees the thread that enabled it. From 3.12 on it
+# sees every thread, and enabling a second one while another is on raises ValueError.
+PROFILE_PER_THREAD = sys.version_info < (3, 12)
+
+class Profiler:
+    """cProfile per startup phase plus periodic tracemalloc snapshots"""
+    def __init__(self):
+        self.enabled = False
+        self.output_dir = PROFILE_DIR
+        self.interval = 300
+        self.top_n = 15
+        self.phase_count = 0
+        self.lock = threading.Lock()
+        self.live_profiles = {}  # thread id (or 'process' from 3.12) -> (Profile, Lock) for steady state
+        self.live_active = 0  # Threads inside live() while one process-wide profile is shared
+        self.first_snapshot = None
+        self.last_snapshot = None
+        self.stop_event = threading.Event()
+        self.snapshot_thread = None
+
+    def start(self, output_dir=None, interval=None, top_n=None):
+        """Turn profiling on (from --profile or the 'profile' command)"""
+        if self.enabled:
+            return
+        if output_dir is not None:
+            self.output_dir = Path(output_dir)
+        if interval is not None:
+            self.interval = interval
+        if top_n is not None:
+            self.top_n = top_n
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.first_snapshot = self.last_snapshot = self._take_snapshot()
+        self.stop_event.clear()
+        self.snapshot_thread = threading.Thread(target=self._snapshot_loop, daemon=True)
+        self.snapshot_thread.start()
+        self.enabled = True
+        print(f"📈 Profiling enabled → {self.output_dir} (memory snapshot every {self.interval}s)")
+
+    def stop(self):
+        """Flush the steady-state profile and a final memory diff, then turn off"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self.stop_event.set()
+        if self.snapshot_thread is not None:
+            self.snapshot_thread.join()
+        self.dump_live()
+        self.write_memory_diff('final')
+        import tracemalloc
+        tracemalloc.stop()
+        self.first_snapshot = self.last_snapshot = None
+        print(f"📈 Profiling stopped, results in {self.output_dir}")
+
+    def phase(self, name):
+        """Context manager profiling one phase (a no-op when profiling is off)"""
+        if not self.enabled:
+            return nullcontext()
+        return self._profile_phase(name)
+
+    @contextmanager
+    def _profile_phase(self, name):
+        import cProfile
+        with self.lock:
+            self.phase_count += 1
+            label = f"{self.phase_count:02d}_{name}"
+        before = self._take_snapshot()
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError:
+            profile = None  # Python 3.12+ with the watcher threads' profile already on
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(str(self.output_dir / f"{label}.pstats"))
+            self._write_diff(self._take_snapshot(), before, f"{label}_memory.txt",
+                             f"Memory change during {name} ({elapsed:.3f}s)")
+            if profile is not None:
+                print(f"📈 Profiled {name}: {elapsed:.3f}s → {label}.pstats")
+            else:
+                print(f"📈 Profiled {name}: {elapsed:.3f}s, memory only (the watcher threads' profile was on)")
+
+    def live(self):
+        """Context manager for steady-state work on watcher threads"""
+        if not self.enabled:
+            return nullcontext()
+        return self._profile_live()
+
+    @contextmanager
+    def _profile_live(self):
+        import cProfile
+        if PROFILE_PER_THREAD:
+            # cProfile only sees the thread that enabled it, so keep one per thread
+            key = threading.get_ident()
+        else:
+            key = 'process'  # One profile sees every thread; it is on while any thread is in here
+        with self.lock:
+            if key not in self.live_profiles:
+                self.live_profiles[key] = (cProfile.Profile(), threading.Lock())
+            profile, profile_lock = self.live_profiles[key]
+        if PROFILE_PER_THREAD:
+            with profile_lock:
+                profile.enable()
+                try:
+                    yield
+                finally:
+                    profile.disable()
+            return
+        with profile_lock:
+            if self.live_active == 0:
+                try:
+                    profile.enable()
+                except ValueError:
+                    pass  # A startup phase is being profiled; this file goes unprofiled
+            self.live_active += 1
+        try:
+            yield
+        finally:
+            with profile_lock:
+                self.live_active -= 1
+                if self.live_active == 0:
+                    profile.disable()
+
+    def dump_live(self):
+        """Merge the per-thread (or the process-wide) steady-state profiles into one .pstats file"""
+        import pstats
+        with self.lock:
+            profiles = list(self.live_profiles.values())
+        stats = None
+        for profile, profile_lock in profiles:
+            with profile_lock:
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+        if stats is not None:
+            stats.dump_stats(str(self.output_dir / "steady_state.pstats"))
+
+    def _take_snapshot(self):
+        import tracemalloc
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def _write_diff(self, snapshot, baseline, file_name, title):
+        stats = snapshot.compare_to(baseline, 'lineno')
+        growth = sum(stat.size_diff for stat in stats)
+        try:
+            with open(self.output_dir / file_name, 'a', encoding='utf-8') as f:
+                f.write(f"# {datetime.now().isoformat(timespec='seconds')} {title}\n")
+                f.write(f"# Net change: {growth / 1024:+.1f} KiB\n")
+                for stat in stats[:self.top_n]:
+                    f.write(f"{stat}\n")
+                f.write("\n")
+        except OSError as e:
+            print(f"⚠️  Could not write memory diff: {e}")
+        return growth
+
+    def write_memory_diff(self, reason='periodic'):
+        """Log top-N growth since the last snapshot and since profiling began"""
+        import tracemalloc
+        snapshot = self._take_snapshot()
+        recent = self._write_diff(snapshot, self.last_snapshot, "memory_diffs.txt",
+                                  f"{reason}: since previous snapshot")
+        total = self._write_diff(snapshot, self.first_snapshot, "memory_diffs.txt",
+                                 f"{reason}: since profiling started")
+        self.last_snapshot = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"📈 Memory: {current / 1024 / 1024:.1f} MiB traced (peak {peak / 1024 / 1024:.1f} MiB), "
+              f"{recent / 1024:+.1f} KiB since last, {total / 1024:+.1f} KiB since start")
+
+    def _snapshot_loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.write_memory_diff()
+                self.dump_live()
+            except Exception as e:
+                print(f"⚠️  Profiling snapshot failed: {e}")
+
+PROFILER = Profiler()
+
+class Metrics:
+    """Thread-safe counters shared by every root, worker and watcher"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counters = Counter()
+        self.per_root = defaultdict(Counter)
+        self.gauges = {}
+
+    def incr(self, name, amount=1, root=None):
+        with self.lock:
+            self.counters[name] += amount
+            if root is not None:
+                self.per_root[root][name] += amount
+
+    def merge(self, counters, per_root=None):
+        """Add counter deltas reported by another process"""
+        with self.lock:
+            self.counters.update(counters)
+            for root, counts in (per_root or {}).items():
+                self.per_root[root].update(counts)
+
+    def register_gauge(self, name, read):
+        """Expose a live value (e.g. queue depth) through snapshot()"""
+        with self.lock:
+            self.gauges[name] = read
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'uptime_s': round(time.time() - self.started, 1),
+                'counters': dict(self.counters),
+                'gauges': {name: read() for name, read in self.gauges.items()},
+                'roots': {name: dict(counts) for name, counts in self.per_root.items()}
+            }
+
+METRICS = Metrics()
+
+class Activity:
+    """What the dashboard shows besides counters: downloads being waited on, recent moves and errors
     
-    # Create main organizer folder
-    if not ORGANIZER.exists():
-        ORGANIZER.mkdir(exist_ok=True)
-        print(f"✅ Created main folder: {ORGANIZER}")
-    else:
-        print(f"📁 Main folder exists: {ORGANIZER}")
+    Workers update it as they go (a dict update or deque append under a
+    lock), so showing it costs them nothing extra whether or not anything
+    is drawn.
+    """
+    def __init__(self, recent=10):
+        self.lock = threading.Lock()
+        self.downloads = {}  # path -> {'name', 'root', 'size', 'rate', 'stable', 'updated'}
+        self.moves = deque(maxlen=recent)
+        self.errors = deque(maxlen=recent)
     
-    # Create subfolders
-    folders_created = 0
-    unique_folders = set(SUBFOLDERS.values())  # Use set to avoid duplicates
-    for folder in unique_folders:
-        if not folder.exists():
-            folder.mkdir(exist_ok=True)
-            print(f"✅ Created subfolder: {folder.name}")
-            folders_created += 1
-        else:
-            print(f"📂 Subfolder exists: {folder.name}")
+    def download(self, file_path, root_name, size, stable=0):
+        """A stability poll saw the file at size; rate is smoothed over the last few polls"""
+        key = str(file_path)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.downloads.get(key)
+            if entry is None:
+                self.downloads[key] = {'name': Path(file_path).name, 'root': root_name, 'size': size,
+                                       'rate': 0.0, 'stable': stable, 'updated': now}
+                return
+            elapsed = now - entry['updated']
+            if elapsed > 0:
+                entry['rate'] = 0.5 * entry['rate'] + 0.5 * max(0, size - entry['size']) / elapsed
+            entry.update(size=size, stable=stable, updated=now)
     
-    if folders_created > 0:
-        print(f"\n🎉 Created {folders_created} new subfolders!")
+    def done(self, file_path):
+        with self.lock:
+            self.downloads.pop(str(file_path), None)
     
-    print("\n📋 Supported file types:")
-    print("   📄 Documents: PDF, DOC, DOCX, XLS, XLSX")
-    print("   📝 Text Files: TXT")
-    print("   🖼️  Images: PNG, JPG, JPEG, GIF")
-    print("   🎵 Audio: MP3")
-    print("   🎬 Video: MP4, MOV")
-    print("="*50)
+    def moved(self, file_path, dest_path, size=None):
+        with self.lock:
+            self.moves.append((time.time(), Path(file_path).name, Path(dest_path).parent.name, size))
+    
+    def error(self, name, message):
+        with self.lock:
+            self.errors.append((time.time(), name, str(message)))
+    
+    def snapshot(self):
+        with self.lock:
+            return ([dict(entry) for entry in self.downloads.values()], list(self.moves), list(self.errors))
 
-def create_desktop_shortcuts():
-    """No longer needed - function disabled"""
-    pass
+ACTIVITY = Activity()
 
-def organize_existing_files(folder_path, settings):
-    """Organize existing files based on user settings"""
-    folder = Path(folder_path)
-    if not folder.exists():
-        print(f"⚠️  Folder {folder} does not exist, skipping backtrack...")
-        return
+def print_metrics(top=10):
+    """Show the shared counters (the 'stats' runtime command)"""
+    snapshot = METRICS.snapshot()
+    print("\n" + "="*50)
+    print(f"📊 BLAMITE STATS (up {timedelta(seconds=int(snapshot['uptime_s']))})")
+    print("="*50)
+    for name, value in sorted(snapshot['gauges'].items()):
+        print(f"  {name:<24}{value}")
+    for name, value in sorted(snapshot['counters'].items()):
+        print(f"  {name:<24}{value}")
+    busiest = sorted(snapshot['roots'].items(), key=lambda item: -item[1].get('events', 0))[:top]
+    if len(snapshot['roots']) > 1 and busiest:
+        print(f"\n  Busiest roots (of {len(snapshot['roots'])}):")
+        for name, counts in busiest:
+            print(f"    {name:<28}{counts.get('events', 0):>8} events {counts.get('organized', 0):>8} organized")
+    print("="*50)
+
+class TokenBucket:
+    """Byte-rate limiter shared by threads; take() sleeps off any overdraft
     
-    if settings['backtrack_all_files']:
-        print(f"🔍 Scanning {folder.name} for ALL files (ignoring date)...")
-        cutoff_date = None
-    else:
-        days_back = settings['backtrack_days']
-        print(f"🔍 Scanning {folder.name} for files from the last {days_back} days...")
-        cutoff_date = datetime.now() - timedelta(days=days_back)
+    The bucket refills at rate bytes per second up to one second's worth, and
+    callers take what they are about to read or write. Callers use chunks, so
+    a new rate from configure() takes effect within one chunk.
+    """
+    def __init__(self, name, rate=0):
+        self.name = name
+        self.lock = threading.Lock()
+        self.rate = 0
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.configure(rate)
     
-    organized_count = 0
+    def configure(self, rate):
+        """New rate in bytes per second; 0 turns the limit off"""
+        with self.lock:
+            self.rate = max(0, int(rate))
+            self.tokens = min(self.tokens, self.rate)
+            self.updated = time.monotonic()
     
-    # Get all files in the folder (not directories)
-    try:
-        files = [f for f in folder.iterdir() if f.is_file()]
-        print(f"📂 Found {len(files)} files to check in {folder.name}")
-        
-        for file_path in files:
-            try:
-                # Skip temporary files and system files
-                if (file_path.name.startswith('.') or 
-                    file_path.name.endswith('.tmp') or 
-                    file_path.name.endswith('.part') or
-                    file_path.name.endswith('.crdownload') or
-                    file_path.name.startswith('~')):
-                    continue
-                
-                # Check file extension
-                ext = file_path.suffix.lower().lstrip('.')
-                if ext not in SUBFOLDERS:
-                    continue
-                
-                # Check if file is recent enough (skip if backtrack_all_files is True)
-                if cutoff_date is not None:
-                    file_modified = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if file_modified < cutoff_date:
-                        continue
-                
-                # Get file type description
-                file_type_desc = {
-                    'pdf': 'PDF', 'doc': 'Word', 'docx': 'Word',
-                    'xls': 'Excel', 'xlsx': 'Excel', 'mp3': 'Audio',
-                    'mp4': 'Video', 'mov': 'Video', 'txt': 'Text',
-                    'png': 'Image', 'jpg': 'Image', 'jpeg': 'Image', 'gif': 'Image'
-                }.get(ext, ext.upper())
-                
-                print(f"📋 Found recent {file_type_desc} file: {file_path.name}")
-                
-                # Organize the file
-                dest_folder = SUBFOLDERS[ext]
-                dest_path = dest_folder / file_path.name
-                
-                # Handle duplicate files
-                counter = 1
-                original_dest = dest_path
-                while dest_path.exists():
-                    name_part = original_dest.stem
-                    ext_part = original_dest.suffix
-                    dest_path = dest_folder / f"{name_part}_{counter}{ext_part}"
-                    counter += 1
-                
-                # Move the file
-                shutil.move(str(file_path), str(dest_path))
-                print(f"✅ Organized: {file_path.name} → {dest_path.parent.name}")
-                organized_count += 1
-                
-            except Exception as e:
-                print(f"❗ Error processing {file_path.name}: {e}")
-                continue
-        
-        if organized_count > 0:
-            print(f"🎉 Organized {organized_count} files from {folder.name}")
-        else:
-            print(f"ℹ️  No recent supported files found in {folder.name}")
-            
-    except Exception as e:
-        print(f"❗ Error scanning {folder}: {e}")
+    def take(self, amount):
+        """Spend amount bytes of budget, waiting if it is overdrawn; returns the wait"""
+        if self.rate <= 0:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate) - amount
+            self.updated = now
+            wait = -self.tokens / self.rate if self.tokens < 0 and self.rate else 0
+        if wait > 0:
+            METRICS.incr(f'{self.name}_throttled_ms', int(wait * 1000))
+            time.sleep(wait)
+        return wait
 
-def backtrack_and_organize(settings):
-    """Organize existing files from Downloads based on user settings"""
-    if not settings['backtrack_enabled']:
-        print("\n" + "="*50)
-        print("⏭️  BACKTRACKING DISABLED (check settings to enable)")
-        print("="*50)
-        return
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_SYSCALLS = {'x86_64': (251, 252), 'amd64': (251, 252), 'i386': (289, 290), 'i686': (289, 290),
+                   'aarch64': (30, 31), 'arm64': (30, 31), 'riscv64': (30, 31), 'armv7l': (314, 315),
+                   'ppc64le': (273, 274)}  # (ioprio_set, ioprio_get)
+THREAD_MODE_BACKGROUND_BEGIN, THREAD_MODE_BACKGROUND_END = 0x00010000, 0x00020000
+PROCESS_MODE_BACKGROUND_BEGIN = 0x00100000
+
+class IOThrottle:
+    """Bandwidth budgets for live and background work, plus I/O priority
     
-    print("\n" + "="*50)
-    if settings['backtrack_all_files']:
-        print("🔄 BACKTRACKING: Organizing ALL files from Downloads")
-    else:
-        print(f"🔄 BACKTRACKING: Organizing files from Downloads (last {settings['backtrack_days']} days)")
-    print("="*50)
+    Live downloads and background work (backtracks, rescans) each get a
+    TokenBucket, so a bulk backtrack can't eat the budget of a file the user
+    is waiting for. With io_priority=background, background work also runs
+    at idle I/O priority (ioprio_set on Linux, background mode on Windows);
+    io_priority=idle lowers the whole process once at startup.
+    """
+    METADATA_COST = 4096  # Bytes charged per file the backtrack scanner stats or renames
+    CHUNK = 1024 * 1024  # Copy chunk size, so rate changes apply quickly
     
-    # Only check Downloads folder to avoid conflicts with Desktop organization
-    folders_to_check = [DOWNLOADS]
+    def __init__(self):
+        self.live = TokenBucket('io_live')
+        self.background = TokenBucket('io_background')
+        self.priority = 'normal'
     
-    for folder in folders_to_check:
-        if folder.exists():
-            organize_existing_files(folder, settings)
-        else:
-            print(f"⚠️  {folder} does not exist, skipping...")
+    def configure(self, settings):
+        def rate(key):
+            try:
+                return float(settings.get(key) or 0) * 1024 * 1024
+            except (TypeError, ValueError):
+                print(f"⚠️  Invalid {key} '{settings.get(key)}', using no limit")
+                return 0
+        self.live.configure(rate('io_limit_live_mb'))
+        self.background.configure(rate('io_limit_background_mb'))
+        self.priority = settings.get('io_priority', 'background')
     
-    print("="*50)
-    print("✅ Backtracking complete! Now monitoring Downloads folder...")
-    print("="*50 + "\n")
-
-class FileHandler(FileSystemEventHandler):
-    def on_created(self, event):
-        if event.is_directory:
+    def describe(self):
+        def limit(bucket):
+            return f"{bucket.rate / 1024 / 1024:g} MB/s" if bucket.rate else "unlimited"
+        return f"live {limit(self.live)}, background {limit(self.background)}, priority {self.priority}"
+    
+    @staticmethod
+    def _ioprio(call, *args):
+        import ctypes
+        import platform
+        numbers = IOPRIO_SYSCALLS.get(platform.machine().lower())
+        if numbers is None:
+            return -1
+        libc = ctypes.CDLL(None, use_errno=True)
+        return libc.syscall(numbers[call], IOPRIO_WHO_PROCESS, threading.get_native_id(), *args)
+    
+    def lower_process_priority(self):
+        """io_priority=idle: call on the main thread before workers start, so they inherit it"""
+        if self.priority != 'idle':
             return
-        
-        file_path = Path(event.src_path)
-        print(f"📁 File detected: {file_path.name}")
-        
-        # Skip temporary files and partial downloads
-        if (file_path.name.startswith('.') or 
-            file_path.name.endswith('.tmp') or 
-            file_path.name.endswith('.part') or
-            file_path.name.endswith('.crdownload')):
-            print(f"⏭️  Skipping temporary file: {file_path.name}")
+        if sys.platform.startswith('linux'):
+            if self._ioprio(0, IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT) != 0:
+                print("⚠️  Could not switch to idle I/O priority")
+        elif sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), PROCESS_MODE_BACKGROUND_BEGIN)
+    
+    @contextmanager
+    def background_priority(self):
+        """Run the block at idle I/O priority when io_priority=background"""
+        if self.priority != 'background':
+            yield
             return
-        
-        ext = file_path.suffix.lower().lstrip('.')
-        if ext in SUBFOLDERS:
-            # Get file type description
-            file_type_desc = {
-                'pdf': 'PDF Document',
-                'doc': 'Word Document', 'docx': 'Word Document',
-                'xls': 'Excel File', 'xlsx': 'Excel File',
-                'mp3': 'Audio File', 'txt': 'Text File',
-                'mp4': 'Video File', 'mov': 'Video File',
-                'png': 'Image File', 'jpg': 'Image File', 'jpeg': 'Image File', 'gif': 'Image File'
-            }.get(ext, f'{ext.upper()} File')
-            
-            print(f"📋 {file_type_desc} detected, processing...")
-            dest_folder = SUBFOLDERS[ext]
-            dest_path = dest_folder / file_path.name
-            
-            # Wait for file to finish downloading completely
-            print(f"⏳ Waiting for {file_path.name} to finish downloading...")
-            file_size = -1
-            stable_count = 0
-            
-            for attempt in range(60):  # Increased attempts for larger files
-                try:
-                    # Check if file still exists
-                    if not file_path.exists():
-                        print(f"❌ File {file_path.name} no longer exists, skipping...")
-                        return
-                    
-                    # Check if file size is stable (not growing = download complete)
-                    current_size = file_path.stat().st_size
-                    if current_size == file_size:
-                        stable_count += 1
-                        if stable_count >= 3:  # File size stable for 3 checks = download complete
-                            print(f"✅ Download complete for {file_path.name} ({current_size} bytes)")
-                            break
-                    else:
-                        file_size = current_size
-                        stable_count = 0
-                        print(f"📥 Still downloading {file_path.name}... ({current_size} bytes)")
-                    
-                    # Check if file is accessible (not locked by downloader)
-                    try:
-                        with open(file_path, 'rb') as f:
-                            f.read(1)  # Try to read 1 byte
-                    except (PermissionError, OSError):
-                        print(f"🔒 File {file_path.name} is locked, waiting... (attempt {attempt + 1}/60)")
-                        time.sleep(2)
-                        continue
-                    
-                    time.sleep(1)  # Wait 1 second between checks
-                    
-                except Exception as e:
-                    print(f"❗ Error checking {file_path.name}: {e}")
-                    time.sleep(2)
-                    continue
+        previous = None
+        if sys.platform.startswith('linux'):
+            previous = self._ioprio(1)
+            if previous < 0 or self._ioprio(0, IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT) != 0:
+                previous = None
+        elif sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            previous = kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN) or None
+        try:
+            yield
+        finally:
+            if previous is None:
+                pass
+            elif sys.platform == 'win32':
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_END)
             else:
-                print(f"❌ Timeout waiting for {file_path.name} to finish downloading")
-                return
-            
-            # Now move the file (this automatically deletes from source)
-            try:
-                # Avoid duplicate files in destination
-                counter = 1
-                original_dest = dest_path
-                while dest_path.exists():
-                    name_part = original_dest.stem
-                    ext_part = original_dest.suffix
-                    dest_path = dest_folder / f"{name_part}_{counter}{ext_part}"
-                    counter += 1
-                
-                # Verify file still exists before moving
-                if not file_path.exists():
-                    print(f"❌ File {file_path.name} disappeared before move")
-                    return
-                
-                print(f"🚀 Moving {file_path.name} from Downloads to Desktop/{dest_path.parent.name}")
-                shutil.move(str(file_path), str(dest_path))
-                print(f"✅ Successfully moved and organized: {dest_path.name}")
-                print(f"🗑️  File automatically removed from Downloads folder")
-                print(f"📁 File now available on Desktop: {dest_path.relative_to(DESKTOP)}")
-                
-                # Verify the move was successful
-                if dest_path.exists() and not file_path.exists():
-                    print(f"✅ Verification passed: File is now in {dest_path}")
-                else:
-                    print(f"⚠️  Warning: Move verification failed")
-                    
-            except Exception as e:
-                print(f"❗ Error moving {file_path.name}: {e}")
-                
-        else:
-            print(f"ℹ️  File type '{ext}' not supported, ignoring {file_path.name}")
+                self._ioprio(0, previous)
 
-def main():
-    # Load user settings
-    settings = load_settings()
-    
-    # Check for updates on startup (optional background check)
+THROTTLE = IOThrottle()
+
+def file_size(path):
+    """Size of a file, or None if it does not exist"""
     try:
-        update_info = check_for_updates()
-        if update_info.get('update_available', False):
-            print("\n🔔 A new version is available!")
-            print(f"Current: v{update_info['current_version']} → Latest: v{update_info['latest_version']}")
-            print("💡 Go to Settings (press 'S') to update or continue normally.")
-    except:
-        pass  # Don't let update checks interrupt startup
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+class MoveJournal:
+    """Append-only write-ahead journal of pending and in-flight moves
     
-    # Show welcome message and settings option
-    print("\n" + "="*50)
-    print("⚙️  Press 'S' + Enter for Settings, or just Enter to continue...")
-    print("="*50)
+    Each file gets a "detected" record when it is queued and an "intent"
+    record (source, destination, size) that is fsynced before shutil.move
+    starts; "done" or "dropped" closes it. Writes are group-committed by one
+    flusher thread, so concurrent moves share an fsync. After a crash,
+    recover() finishes or rolls back interrupted moves and returns the files
+    that were detected but never organized.
+    """
+    FLUSH_INTERVAL = 1  # Seconds before non-urgent records reach the disk
+    COMPACT_AFTER = 5000  # Rewrite the journal with only open entries after this many records
     
-    try:
-        user_input = input().strip().lower()
-        if user_input == 's':
-            settings = show_settings_menu()
-    except KeyboardInterrupt:
-        print("\n👋 Goodbye!")
-        return
+    def __init__(self, say=print):
+        self.say = say  # Where messages go (print, or a library Organizer's logger)
+        self.path = None
+        self.file = None
+        self.cond = threading.Condition()
+        self.pending = []
+        self.written = 0  # sequence number of the last record handed to append()
+        self.synced = 0  # sequence number of the last record on disk
+        self.open_entries = {}  # id -> latest record of moves not finished yet
+        self.by_path = {}  # normalized source path -> id
+        self.since_compact = 0
+        self.closing = False
+        self.thread = None
     
-    # Start monitoring Downloads folder and organize to Desktop
-    DESKTOP_FOLDER = Path.home() / "Desktop"
-    main_folders = [DOWNLOADS, DESKTOP_FOLDER]
+    @property
+    def enabled(self):
+        return self.file is not None
     
-    # Setup folders (create any missing ones) and backtrack based on settings
-    setup_folders()
+    def open(self, path=None):
+        self.path = Path(path) if path else JOURNAL_FILE
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.closing = False
+        self.thread = threading.Thread(target=self._flush_loop, name='blamite-journal', daemon=True)
+        self.thread.start()
     
-    # Backtrack and organize existing files based on user settings
-    backtrack_and_organize(settings)
+    def close(self):
+        if self.file is None:
+            return
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        self.thread.join()
+        with self.cond:
+            self.file.close()
+            self.file = None
+            self.by_path.clear()
+            self.open_entries.clear()
     
-    # Start monitoring for new files
-    event_handler = FileHandler()
-    observer = Observer()
+    def _append(self, record, durable=False):
+        record['t'] = round(time.time(), 3)
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        with self.cond:
+            if self.file is None:
+                return
+            self.pending.append(line)
+            self.written += 1
+            seq = self.written
+            if record['op'] in ('done', 'dropped'):
+                self.open_entries.pop(record['id'], None)
+            else:
+                self.open_entries[record['id']] = record
+            if durable:
+                self.cond.notify_all()
+                while self.synced < seq:
+                    self.cond.wait()
     
-    # Monitor Downloads folder (don't monitor Desktop to avoid conflicts)
-    if DOWNLOADS.exists():
-        observer.schedule(event_handler, str(DOWNLOADS), recursive=False)
-        print(f"📡 Monitoring: {DOWNLOADS}")
-    else:
-        print(f"⚠️  Warning: {DOWNLOADS} does not exist")
+    def _flush_loop(self):
+        while True:
+            with self.cond:
+                if not self.pending and not self.closing:
+                    self.cond.wait(self.FLUSH_INTERVAL)
+                file, closing = self.file, self.closing
+                lines, self.pending = self.pending, []
+                upto = self.written
+                self.since_compact += len(lines)
+                snapshot = None
+                if self.since_compact >= self.COMPACT_AFTER:
+                    snapshot = [json.dumps(r, separators=(',', ':')) + '\n' for r in self.open_entries.values()]
+                    self.since_compact = 0
+            try:
+                if lines:
+                    file.write(''.join(lines))
+                    file.flush()
+                    os.fsync(file.fileno())
+                if snapshot is not None:
+                    self._compact(snapshot)
+            except OSError as e:
+                self.say(f"⚠️  Could not write journal: {e}")
+            with self.cond:
+                self.synced = max(self.synced, upto)
+                self.cond.notify_all()
+                if closing and not self.pending:
+                    return
     
-    observer.start()
-    print("🚀 BLAMITE Organizer is running...")
-    print(f"📥 Watching Downloads folder, organizing to Desktop...")
-    print(f"📁 Organized files location: {ORGANIZER}")
-    print("💡 Type 'settings' + Enter to access Settings, or Ctrl+C to stop...")
+    def _compact(self, lines):
+        temp = self.path.with_suffix('.tmp')
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        with self.cond:
+            os.replace(temp, self.path)
+            self.file.close()
+            self.file = open(self.path, 'a', encoding='utf-8')
     
-    # Flag to control the input thread
-    running = True
-    settings_requested = False
+    def detected(self, file_path, root_name):
+        """A file was queued for organizing"""
+        if self.file is None:
+            return
+        key = os.path.normcase(str(file_path))
+        with self.cond:
+            if key in self.by_path:
+                return
+            entry_id = self.by_path[key] = short_id(12)
+        self._append({'op': 'detected', 'id': entry_id, 'src': str(file_path), 'root': root_name})
     
-    def input_handler():
-        """Handle user input in separate thread"""
+    def intent(self, file_path, dest_path, size, root_name, archive=None):
+        """Record a move before it starts; returns once the record is on disk
+        
+        For a member being extracted, file_path is archive/member and archive
+        is the bundle it comes from.
+        """
+        if self.file is None:
+            return
+        if size is None:
+            size = file_size(file_path)
+        key = os.path.normcase(str(file_path))
+        with self.cond:
+            entry_id = self.by_path.setdefault(key, short_id(12))
+        record = {'op': 'intent', 'id': entry_id, 'src': str(file_path), 'dest': str(dest_path),
+                  'size': size, 'root': root_name}
+        if archive is not None:
+            record['archive'] = str(archive)
+        self._append(record, durable=True)
+    
+    def intents(self, moves, root_name):
+        """Record a batch of (source, destination) moves with a single fsync"""
+        if self.file is None or not moves:
+            return
+        for i, (file_path, dest_path) in enumerate(moves):
+            key = os.path.normcase(str(file_path))
+            with self.cond:
+                entry_id = self.by_path.setdefault(key, short_id(12))
+            self._append({'op': 'intent', 'id': entry_id, 'src': str(file_path), 'dest': str(dest_path),
+                          'size': file_size(file_path), 'root': root_name}, durable=i == len(moves) - 1)
+    
+    def finish(self, file_path, outcome):
+        """Close a file's entry; a failed move is finished or rolled back right away"""
+        if self.file is None:
+            return
+        with self.cond:
+            entry_id = self.by_path.pop(os.path.normcase(str(file_path)), None)
+            record = self.open_entries.get(entry_id)
+        if record is None:
+            return
+        if outcome != 'organized' and record['op'] == 'intent':
+            try:
+                state = self.resolve(record)
+            except OSError as e:
+                self.say(f"⚠️  Journal: cannot clean up the failed move of {file_path.name}: {e}")
+                return  # Leave the entry open so the next start retries
+            if state != 'not_started':
+                self.say(f"🧾 Journal: {state.replace('_', ' ')} interrupted move of {file_path.name}")
+        self._append({'op': 'done' if outcome == 'organized' else 'dropped', 'id': entry_id,
+                      'outcome': outcome})
+    
+    @staticmethod
+    def resolve(record):
+        """Bring an interrupted move to a consistent state and say which one"""
+        src, dest = record['src'], record['dest']
+        for partial in partial_copies(dest):
+            os.remove(partial)  # A cross-drive copy cut short before its rename into place
+        if 'archive' in record:
+            # Extraction is all or nothing: the archive is requeued and extracted again from the start
+            if file_size(dest) is None:
+                return 'not_started'
+            os.remove(dest)
+            return 'rolled_back'
+        src_size, dest_size = file_size(src), file_size(dest)
+        if src_size is None:
+            return 'completed' if dest_size is not None else 'lost'
+        if dest_size is None:
+            return 'not_started'
+        if src_size == dest_size == record['size']:
+            # A cross-device move copied everything but had not removed the source yet
+            os.remove(src)
+            return 'finished'
+        # Half-copied destination: the source is still complete, so drop the copy
+        os.remove(dest)
+        return 'rolled_back'
+    
+    def recover(self, path=None):
+        """Replay the journal left by the last run; returns (source path, root name) to requeue"""
+        path = Path(path) if path else JOURNAL_FILE
+        entries = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # A record torn by the crash
+                    if record['op'] in ('done', 'dropped'):
+                        entries.pop(record['id'], None)
+                    else:
+                        entries[record['id']] = record
+        except OSError:
+            return []
+        
+        requeue = []
+        outcomes = Counter()
+        for record in entries.values():
+            try:
+                state = self.resolve(record) if record['op'] == 'intent' else 'detected'
+            except OSError as e:
+                self.say(f"⚠️  Journal: cannot recover {record['src']}: {e}")
+                continue
+            outcomes[state] += 1
+            if state in ('detected', 'not_started', 'rolled_back') and os.path.isfile(record['src']):
+                requeue.append((Path(record['src']), record.get('root')))
+            elif state == 'lost':
+                self.say(f"⚠️  Journal: {record['src']} was being moved but is gone from both places")
+        if entries:
+            summary = ', '.join(f"{count} {state.replace('_', ' ')}" for state, count in sorted(outcomes.items()))
+            self.say(f"🧾 Recovered {len(entries)} unfinished journal entries ({summary}); "
+                     f"{len(requeue)} files will be organized again")
+        path.write_text('', encoding='utf-8')
+        return requeue
+
+JOURNAL = MoveJournal()
+
+class Transaction:
+    """Move log of one backtrack run or live session
+    
+    Stored as JSON lines: a header, then each folder once as {"d": id, "path": ...}
+    and each move as [source folder id, destination folder id, name, new name],
+    where the new name is left out when the file kept its name. A file
+    extracted from an archive is {"x": folder id, "n": name, "from": member}.
+    """
+    def __init__(self, path, kind):
+        self.path = path
+        self.id = path.stem
+        self.kind = kind
+        self.lock = threading.Lock()
+        self.folders = {}
+        self.moves = 0
+        self.file = open(path, 'a', encoding='utf-8')
+        self._write({'txn': self.id, 'kind': kind, 'started': datetime.now().isoformat(timespec='seconds')})
+    
+    def _write(self, item):
+        self.file.write(json.dumps(item, separators=(',', ':'), ensure_ascii=False) + '\n')
+    
+    def _folder_id(self, folder):
+        folder_id = self.folders.get(folder)
+        if folder_id is None:
+            folder_id = self.folders[folder] = len(self.folders)
+            self._write({'d': folder_id, 'path': folder})
+        return folder_id
+    
+    def record(self, src, dest, extracted=False):
+        src, dest = Path(src), Path(dest)
+        with self.lock:
+            if self.file.closed:
+                return  # A worker finished after the session ended
+            if extracted:
+                self._write({'x': self._folder_id(str(dest.parent)), 'n': dest.name, 'from': str(src)})
+            else:
+                move = [self._folder_id(str(src.parent)), self._folder_id(str(dest.parent)), src.name]
+                if dest.name != src.name:
+                    move.append(dest.name)
+                self._write(move)
+            self.moves += 1
+            # Handed to the OS right away: a killed process must not lose the moves it would undo
+            self.file.flush()
+    
+    def close(self):
+        with self.lock:
+            self._write({'end': datetime.now().isoformat(timespec='seconds'), 'moves': self.moves})
+            self.file.close()
+
+class TransactionLog:
+    """Hands out the open transaction of each kind ('backtrack', 'live')"""
+    def __init__(self):
+        self.folder = None
+        self.active = {}
+    
+    def open(self, folder=None):
+        self.folder = Path(folder) if folder else TRANSACTIONS_DIR
+        self.folder.mkdir(parents=True, exist_ok=True)
+    
+    def close(self):
+        """End the open transactions and stop logging"""
+        for txn in list(self.active.values()):
+            self.end(txn)
+        self.folder = None
+    
+    def begin(self, kind):
+        if self.folder is None:
+            return None
+        txn_id = datetime.now().strftime('%Y%m%d-%H%M%S-') + short_id(4)
+        txn = self.active[kind] = Transaction(self.folder / f"{txn_id}.jsonl", kind)
+        return txn
+    
+    def end(self, txn):
+        if txn is None:
+            return
+        if self.active.get(txn.kind) is txn:
+            del self.active[txn.kind]
+        txn.close()
+        if txn.moves == 0:
+            txn.path.unlink()  # Nothing to undo
+    
+    def record(self, kind, src, dest, extracted=False):
+        txn = self.active.get(kind)
+        if txn is not None:
+            txn.record(src, dest, extracted)
+
+TRANSACTIONS = TransactionLog()
+
+def load_transaction(path):
+    """Read a move log; returns (header, footer, list of (source path, current path))
+    
+    The source path is None for files extracted from an archive.
+    """
+    header, footer, folders, moves = {}, {}, {}, []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue  # Last line cut off by a crash
+            if isinstance(item, list):
+                src_dir, dest_dir, name = item[:3]
+                moves.append((os.path.join(folders[src_dir], name),
+                              os.path.join(folders[dest_dir], item[3] if len(item) > 3 else name)))
+            elif 'd' in item:
+                folders[item['d']] = item['path']
+            elif 'x' in item:
+                moves.append((None, os.path.join(folders[item['x']], item['n'])))
+            elif 'txn' in item:
+                header = item
+            else:
+                footer.update(item)
+    return header, footer, moves
+
+def list_transactions(folder=None):
+    """Show recorded runs, newest first (the --list-transactions command)"""
+    folder = Path(folder) if folder else TRANSACTIONS_DIR
+    paths = sorted(folder.glob('*.jsonl'), reverse=True) if folder.exists() else []
+    if not paths:
+        print("ℹ️  No transactions recorded yet")
+        return paths
+    print(f"{'Transaction':<26}{'Kind':<11}{'Moves':>8}  Status")
+    for path in paths:
+        header, footer, moves = load_transaction(path)
+        status = 'undone' if footer.get('undone') else ('finished' if footer.get('end') else 'interrupted')
+        print(f"{path.stem:<26}{header.get('kind', '?'):<11}{len(moves):>8}  {status}")
+    return paths
+
+def unique_name(name, taken):
+    """Like get_unique_destination, but against a set of names already listed"""
+    if name not in taken:
+        return name
+    stem, ext = os.path.splitext(name)
+    counter = 1
+    while f"{stem}_{counter}{ext}" in taken:
+        counter += 1
+    return f"{stem}_{counter}{ext}"
+
+def undo_transaction(txn_id='last', jobs=8, dry_run=False, folder=None, force=False):
+    """Move every file of a transaction back where it came from
+    
+    Target names are planned up front against one listing per folder, so
+    names taken since the run get a _1 suffix and no two files claim the
+    same name. The renames then run in parallel through move_file, which
+    never replaces a file and copies across drives. Files extracted from
+    an archive are deleted, as the archive still holds them. Returns a
+    Counter of results.
+    """
+    folder = Path(folder) if folder else TRANSACTIONS_DIR
+    paths = sorted(folder.glob('*.jsonl')) if folder.exists() else []
+    if txn_id == 'last':
+        candidates = [p for p in paths if not load_transaction(p)[1].get('undone')]
+        path = candidates[-1] if candidates else None
+    else:
+        path = folder / f"{txn_id}.jsonl"
+        path = path if path.exists() else None
+    if path is None:
+        print(f"❌ No transaction to undo ({txn_id})")
+        return Counter()
+    header, footer, moves = load_transaction(path)
+    if footer.get('undone') and not force:
+        print(f"ℹ️  Transaction {path.stem} was already undone on {footer['undone']}")
+        return Counter()
+    
+    print(f"↩️  Undoing {header.get('kind', '')} transaction {path.stem}: {len(moves)} moves")
+    results = Counter()
+    taken = {}  # folder -> names present or already claimed by this undo
+    plan = []
+    # In move order, so the first file that had a name gets it back
+    for original, current in moves:
+        if not os.path.lexists(current):
+            results['missing'] += 1
+            continue
+        if original is None:
+            plan.append((current, None))
+            continue
+        target_dir, name = os.path.split(original)
+        if target_dir not in taken:
+            try:
+                taken[target_dir] = set(os.listdir(target_dir))
+            except FileNotFoundError:
+                taken[target_dir] = set()
+        target_name = unique_name(name, taken[target_dir])
+        taken[target_dir].add(target_name)
+        if target_name != name:
+            results['renamed_on_conflict'] += 1
+        plan.append((current, os.path.join(target_dir, target_name)))
+    
+    if dry_run:
+        for current, target in plan[:20]:
+            print(f"   {current} → {target or 'removed (extracted from an archive)'}")
+        if len(plan) > 20:
+            print(f"   ... and {len(plan) - 20} more")
+        results['would_restore'] = len(plan)
+        return results
+    
+    for target_dir in taken:
+        os.makedirs(target_dir, exist_ok=True)
+    
+    def restore(batch):
+        counts = Counter()
+        restored = []
+        for current, target in batch:
+            try:
+                if target is None:
+                    os.remove(current)
+                    counts['removed'] += 1
+                else:
+                    # No-replace rename: a name taken after planning gets the next free one, keeping both
+                    if str(move_file(Path(current), Path(target))) != target:
+                        counts['renamed_on_conflict'] += 1
+                    counts['restored'] += 1
+                restored.append(current)
+            except OSError as e:
+                counts['failed'] += 1
+                print(f"❗ Could not restore {os.path.basename(current)}: {e}")
+        CATALOG.forget(restored)
+        return counts
+    
+    start = time.perf_counter()
+    batch_size = max(1, min(1000, len(plan) // (jobs * 4) or 1))
+    batches = [plan[i:i + batch_size] for i in range(0, len(plan), batch_size)]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for counts in executor.map(restore, batches):
+            results.update(counts)
+    elapsed = time.perf_counter() - start
+    
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'undone': datetime.now().isoformat(timespec='seconds'),
+                            'restored': results['restored']}) + '\n')
+    print(f"✅ Restored {results['restored']} files in {elapsed:.1f}s "
+          f"({results['renamed_on_conflict']} renamed because the name was taken, "
+          f"{results['missing']} no longer in the organizer, {results['failed']} failed)"
+          + (f", removed {results['removed']} extracted from archives" if results['removed'] else ""))
+    return results
+
+class Catalog:
+    """SQLite catalog of organized files with a full-text index on their names
+    
+    Every move adds or updates one row (original name, current path, where it
+    came from, category, size, hash if known, timestamps) in its own
+    transaction, or one per backtrack batch; an FTS5 table kept in sync by
+    triggers answers --find. reconcile() repairs rows after files were moved,
+    deleted or added by hand.
+    """
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS files (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,          -- name the file arrived with
+        path TEXT NOT NULL UNIQUE,   -- where it is now
+        source TEXT,                 -- where it came from (NULL if found by reconcile)
+        kind TEXT,                   -- live, backtrack or reconcile
+        root TEXT,
+        category TEXT,               -- organizer folder
+        size INTEGER,
+        sha256 TEXT,
+        modified REAL,
+        organized REAL
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+        name, category, content='files', content_rowid='id');
+    CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+        INSERT INTO files_fts(rowid, name, category) VALUES (new.id, new.name, new.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+        INSERT INTO files_fts(files_fts, rowid, name, category) VALUES ('delete', old.id, old.name, old.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE ON files BEGIN
+        INSERT INTO files_fts(files_fts, rowid, name, category) VALUES ('delete', old.id, old.name, old.category);
+        INSERT INTO files_fts(rowid, name, category) VALUES (new.id, new.name, new.category);
+    END;
+    """
+    UPSERT = """
+    INSERT INTO files (name, path, source, kind, root, category, size, sha256, modified, organized)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(path) DO UPDATE SET name=excluded.name, source=excluded.source, kind=excluded.kind,
+        root=excluded.root, category=excluded.category, size=excluded.size, sha256=excluded.sha256,
+        modified=excluded.modified, organized=excluded.organized
+    """
+    
+    def __init__(self, say=print):
+        self.say = say
+        self.path = None
+        self.db = None
+        self.lock = threading.Lock()
+    
+    @property
+    def enabled(self):
+        return self.db is not None
+    
+    def open(self, path=None):
+        import sqlite3
+        self.path = Path(path) if path else CATALOG_FILE
+        try:
+            self.db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.executescript(self.SCHEMA)
+        except sqlite3.Error as e:
+            self.say(f"⚠️  Catalog unavailable ({e}); --find will not know about new files")
+            self.db = None
+    
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+    
+    def _row(self, src, dest, kind, root_name, size=None, sha256=None):
+        src, dest = Path(src), Path(dest)
+        try:
+            stat = os.stat(dest)
+            size, modified = stat.st_size, stat.st_mtime
+        except OSError:
+            modified = None
+        return (src.name, str(dest), str(src), kind, root_name, dest.parent.name, size, sha256,
+                modified, time.time())
+    
+    def record(self, src, dest, kind, root_name, size=None):
+        """Add or update the row of one file that was just moved"""
+        self.record_many([(src, dest)], kind, root_name, size)
+    
+    def record_many(self, moves, kind, root_name, size=None):
+        """Add (source, destination) moves in one transaction"""
+        if self.db is None or not moves:
+            return
+        import sqlite3
+        rows = [self._row(src, dest, kind, root_name, size) for src, dest in moves]
+        try:
+            with self.lock, self.db:
+                self.db.executemany(self.UPSERT, rows)
+        except sqlite3.Error as e:
+            self.say(f"⚠️  Could not update the catalog: {e}")
+    
+    def forget(self, paths):
+        """Drop the rows of files that left the organizer (e.g. undone moves)"""
+        if self.db is None or not paths:
+            return
+        import sqlite3
+        try:
+            with self.lock, self.db:
+                self.db.executemany("DELETE FROM files WHERE path = ?", [(str(p),) for p in paths])
+        except sqlite3.Error as e:
+            self.say(f"⚠️  Could not update the catalog: {e}")
+    
+    def relocate(self, moves):
+        """Point rows at the new path of files that were replaced in place (compacted or restored)"""
+        if self.db is None or not moves:
+            return
+        import sqlite3
+        try:
+            with self.lock, self.db:
+                self.db.executemany("UPDATE OR REPLACE files SET path = ? WHERE path = ?",
+                                    [(str(new), str(old)) for old, new in moves])
+        except sqlite3.Error as e:
+            self.say(f"⚠️  Could not update the catalog: {e}")
+    
+    def organized_times(self, categories):
+        """{path: when it was organized} for the files in these organizer folders"""
+        if self.db is None:
+            return {}
+        with self.lock:
+            return {path: organized for category in categories for path, organized in self.db.execute(
+                "SELECT path, organized FROM files WHERE category = ?", (category,))}
+    
+    def find(self, query, limit=20):
+        """Files whose name (or category) has words starting with every word of query"""
+        terms = re.findall(r'\w+', query)
+        if self.db is None or not terms:
+            return []
+        match = ' '.join(f'"{term}"*' for term in terms)
+        with self.lock:
+            cursor = self.db.execute(
+                "SELECT files.name, files.path, files.category, files.size, files.organized, files.kind "
+                "FROM files_fts JOIN files ON files.id = files_fts.rowid "
+                "WHERE files_fts MATCH ? ORDER BY rank LIMIT ?", (match, limit))
+            return [dict(zip(('name', 'path', 'category', 'size', 'organized', 'kind'), row)) for row in cursor]
+    
+    def reconcile(self, roots):
+        """Bring the catalog in line with the organizer folders; returns a Counter
+        
+        Rows whose file is gone are matched to an uncatalogued file with the
+        same name and size (moved by hand) or dropped; files nobody recorded
+        are added.
+        """
+        results = Counter()
+        if self.db is None:
+            return results
+        present = {}  # path -> (size, mtime) of files in the organizer folders
+        for folder in {str(folder) for root in roots for folder in root.folders()}:
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            present[entry.path] = (stat.st_size, stat.st_mtime)
+            except FileNotFoundError:
+                continue
+        with self.lock:
+            rows = self.db.execute("SELECT id, path, size, modified FROM files").fetchall()
+        updates, missing = [], []
+        for row_id, path, size, modified in rows:
+            results['checked'] += 1
+            found = present.pop(path, None)
+            if found is None:
+                if not os.path.exists(path):
+                    missing.append((row_id, path, size))
+            elif found != (size, modified):
+                updates.append((found[0], found[1], row_id))
+        by_name = {(os.path.basename(path), stat[0]): path for path, stat in present.items()}
+        moved, removed = [], []
+        for row_id, path, size in missing:
+            new_path = by_name.pop((os.path.basename(path), size), None)
+            if new_path is None:
+                removed.append((row_id,))
+            else:
+                present.pop(new_path)
+                moved.append((new_path, os.path.basename(os.path.dirname(new_path)), row_id))
+        added = [(os.path.basename(path), path, None, 'reconcile', None, os.path.basename(os.path.dirname(path)),
+                  stat[0], None, stat[1], time.time()) for path, stat in present.items()]
+        with self.lock, self.db:
+            self.db.executemany("UPDATE files SET size = ?, modified = ? WHERE id = ?", updates)
+            self.db.executemany("UPDATE files SET path = ?, category = ? WHERE id = ?", moved)
+            self.db.executemany("DELETE FROM files WHERE id = ?", removed)
+            self.db.executemany(self.UPSERT, added)
+        results.update(updated=len(updates), moved=len(moved), removed=len(removed), added=len(added))
+        return results
+
+CATALOG = Catalog()
+
+def format_size(size):
+    if size is None:
+        return "?"
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def reconcile_catalog(roots):
+    """The --reconcile command"""
+    start = time.perf_counter()
+    results = CATALOG.reconcile(roots)
+    print(f"🧾 Catalog reconciled in {time.perf_counter() - start:.1f}s: {results['checked']} checked, "
+          f"{results['moved']} moved, {results['removed']} removed, {results['added']} added, "
+          f"{results['updated']} updated")
+    return results
+
+def find_files(query, limit=20):
+    """The --find command: search the catalog and print the matches"""
+    start = time.perf_counter()
+    matches = CATALOG.find(query, limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"🔎 {len(matches)} match{'es' if len(matches) != 1 else ''} for '{query}' ({elapsed:.1f} ms)")
+    for match in matches:
+        when = datetime.fromtimestamp(match['organized']).strftime('%Y-%m-%d') if match['organized'] else '?'
+        print(f"   📄 {match['name']} → {match['path']} ({match['category']}, {format_size(match['size'])}, {when})")
+    return matches
+
+class PostMoveHook:
+    """A follow-up action for organized files, with its own bounded queue and threads
+    
+    action(moves, timeout) gets a list of move dicts (src, dest, name,
+    category, root, kind, size, organized) and raises to report a failure.
+    concurrency threads each gather up to batch_size moves (waiting at most
+    batch_wait seconds for a batch to fill) and retry failed calls with
+    exponential backoff. When the queue is full new moves are dropped and
+    counted, so a slow hook never holds up the move workers.
+    """
+    def __init__(self, name, action, concurrency=1, timeout=30, retries=3, backoff=1.0,
+                 batch_size=1, batch_wait=2.0, queue_size=1000, extensions=None, roots=None, kinds=None):
+        self.name = name
+        self.action = action
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+        self.batch_size = max(1, int(batch_size))
+        self.batch_wait = batch_wait
+        self.extensions = {ext.lower().lstrip('.') for ext in extensions} if extensions else None
+        self.roots = set(roots) if roots else None
+        self.kinds = set(kinds) if kinds else None
+        self.queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self.deadline = float('inf')  # No retries are scheduled past it once close() sets it
+        self.threads = []
+        self.say = print  # The pipeline's, once added to one
+    
+    def __repr__(self):
+        return f"PostMoveHook({self.name!r}, concurrency={self.concurrency}, batch_size={self.batch_size})"
+    
+    def wants(self, move):
+        if self.kinds is not None and move['kind'] not in self.kinds:
+            return False
+        if self.roots is not None and move['root'] not in self.roots:
+            return False
+        return self.extensions is None or Path(move['dest']).suffix.lower().lstrip('.') in self.extensions
+    
+    def start(self):
+        METRICS.register_gauge(f'hook_{self.name}_queued', self.queue.qsize)
+        for index in range(self.concurrency):
+            thread = threading.Thread(target=self._run, name=f'blamite-hook-{self.name}-{index}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+    
+    def put(self, move):
+        try:
+            self.queue.put_nowait(move)
+        except queue.Full:
+            METRICS.incr(f'hook_{self.name}_dropped')
+            return False
+        return True
+    
+    def close(self, deadline):
+        """Let the threads finish what is queued until deadline (a time.monotonic() value)"""
+        self.deadline = deadline
+        for _ in self.threads:
+            try:
+                self.queue.put(None, timeout=max(0.01, deadline - time.monotonic()))
+            except queue.Full:
+                break
+        for thread in self.threads:
+            thread.join(max(0, deadline - time.monotonic()))
+        left = sum(1 for move in list(self.queue.queue) if move is not None)
+        if left:
+            METRICS.incr(f'hook_{self.name}_dropped', left)
+            self.say(f"⚠️  Hook {self.name} stopped with {left} file(s) not delivered")
+        self.threads = []
+    
+    def _next_batch(self):
+        """Block for one move, then gather more until the batch is full or batch_wait passed"""
+        move = self.queue.get()
+        if move is None:
+            return [], True
+        batch = [move]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                move = self.queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if move is None:
+                return batch, True
+            batch.append(move)
+        return batch, False
+    
+    def _run(self):
+        done = False
+        while not done:
+            batch, done = self._next_batch()
+            if batch:
+                self._deliver(batch)
+    
+    def _deliver(self, batch):
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                self.action(batch, self.timeout)
+            except Exception as e:
+                METRICS.incr(f'hook_{self.name}_errors')
+                # Jitter keeps the hook's threads from retrying in lockstep
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                if attempt == self.retries or time.monotonic() + delay > self.deadline:
+                    METRICS.incr(f'hook_{self.name}_failed', len(batch))
+                    self.say(f"⚠️  Hook {self.name} failed for {len(batch)} file(s): {e}")
+                    return False
+                time.sleep(delay)
+                continue
+            METRICS.incr(f'hook_{self.name}_calls')
+            METRICS.incr(f'hook_{self.name}_delivered', len(batch))
+            METRICS.incr(f'hook_{self.name}_ms', int((time.perf_counter() - start) * 1000))
+            return True
+
+def http_hook_action(url, headers=None):
+    """POST {"event": "organized", "files": [...]} as JSON; any HTTP error status fails the call"""
+    headers = dict(headers or {}, **{'Content-Type': 'application/json'})
+    
+    def post(moves, timeout):
+        import urllib.request
+        body = json.dumps({'event': 'organized', 'files': moves}).encode('utf-8')
+        request = urllib.request.Request(url, data=body, headers=headers, method='POST')
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+    return post
+
+def command_hook_action(command):
+    """Run command with the organized paths as arguments and the moves as JSON on stdin"""
+    if isinstance(command, str):
+        import shlex
+        command = shlex.split(command, posix=sys.platform != 'win32')
+    command = [str(part) for part in command]
+    
+    def run(moves, timeout):
+        import subprocess
+        proc = subprocess.run(command + [move['dest'] for move in moves], input=json.dumps(moves),
+                              capture_output=True, text=True, timeout=timeout)
+        if proc.returncode != 0:
+            raise RuntimeError(f"exit code {proc.returncode}: {proc.stderr.strip()[-200:]}")
+    return run
+
+def python_hook_action(target):
+    """Call module:function(moves, timeout); a call still running after timeout seconds fails
+    
+    The function runs on a daemon thread of its own, so one that hangs is
+    abandoned (it cannot be killed) instead of holding the hook's thread.
+    """
+    import importlib
+    from concurrent.futures import Future, TimeoutError as FutureTimeout
+    module_name, _, function_name = target.partition(':')
+    function = getattr(importlib.import_module(module_name), function_name)
+    
+    def call(moves, timeout):
+        future = Future()
+        
+        def run():
+            try:
+                future.set_result(function(moves, timeout))
+            except BaseException as e:
+                future.set_exception(e)
+        threading.Thread(target=run, name=f'blamite-hook-call-{function_name}', daemon=True).start()
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            raise TimeoutError(f"{target} did not return within {timeout}s") from None
+    return call
+
+HOOK_OPTIONS = ('concurrency', 'timeout', 'retries', 'backoff', 'batch_size', 'batch_wait', 'queue_size',
+                'extensions', 'roots', 'kinds')
+
+def hook_from_config(entry, index=0):
+    """Build a PostMoveHook from one blamite_hooks.json entry"""
+    kind = entry.get('type') or ('http' if 'url' in entry else 'command')
+    if kind == 'http':
+        action = http_hook_action(entry['url'], entry.get('headers'))
+    elif kind == 'command':
+        action = command_hook_action(entry['command'])
+    elif kind == 'python':
+        action = python_hook_action(entry['callable'])
+    else:
+        raise ValueError(f"unknown type {kind!r}")
+    options = {key: entry[key] for key in HOOK_OPTIONS if key in entry}
+    return PostMoveHook(entry.get('name') or f"{kind}{index + 1}", action, **options)
+
+class HookPipeline:
+    """Hands every organized file to the post-move hooks
+    
+    Hooks run on their own threads, after the move, the journal and the
+    catalog are done; submit() only filters and enqueues, so it costs the
+    move workers nothing when no hooks are configured.
+    """
+    def __init__(self, say=print):
+        self.say = say
+        self.hooks = []
+    
+    @property
+    def enabled(self):
+        return bool(self.hooks)
+    
+    def add(self, hook):
+        hook.say = self.say
+        hook.start()
+        self.hooks.append(hook)
+        return hook
+    
+    def load(self, path=None):
+        """Start the hooks listed in blamite_hooks.json (or path); returns how many
+        
+        Example:
+            {"hooks": [
+                {"name": "indexer", "url": "http://127.0.0.1:8080/organized",
+                 "batch_size": 100, "batch_wait": 5, "concurrency": 2},
+                {"name": "scanner", "command": ["clamdscan", "--no-summary"],
+                 "extensions": ["exe", "zip"], "timeout": 120, "retries": 1}
+            ]}
+        
+        "url" entries POST JSON, "command" entries get the paths as arguments,
+        and {"type": "python", "callable": "module:function"} calls a function.
+        Every hook also takes concurrency, timeout, retries, backoff,
+        batch_size, batch_wait, queue_size and the extensions/roots/kinds
+        filters (kinds: live, backtrack, once, api).
+        """
+        path = Path(path) if path else HOOKS_FILE
+        if not path.exists():
+            return 0
+        try:
+            config = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as e:
+            self.say(f"⚠️  Error loading {path.name}: {e}. No post-move hooks.")
+            return 0
+        return self.configure(config.get('hooks', []), path.name)
+    
+    def configure(self, entries, origin='the configuration'):
+        """Start hooks from entries in the blamite_hooks.json format; invalid entries are skipped"""
+        started = 0
+        for index, entry in enumerate(entries):
+            try:
+                hook = hook_from_config(entry, index)
+            except (KeyError, TypeError, ValueError, ImportError, AttributeError) as e:
+                self.say(f"⚠️  Hook #{index + 1} in {origin} is invalid ({e}), skipping")
+                continue
+            self.add(hook)
+            started += 1
+        return started
+    
+    def submit(self, src, dest, kind, root_name, size=None):
+        """Queue one organized file for every hook that wants it"""
+        if self.hooks:
+            self.submit_many([(src, dest)], kind, root_name, size)
+    
+    def submit_many(self, moves, kind, root_name, size=None):
+        if not self.hooks:
+            return
+        now = time.time()
+        for src, dest in moves:
+            dest = Path(dest)
+            size_bytes = size
+            if size_bytes is None:
+                try:
+                    size_bytes = dest.stat().st_size
+                except OSError:
+                    pass
+            move = {'src': str(src), 'dest': str(dest), 'name': dest.name, 'category': dest.parent.name,
+                    'root': root_name, 'kind': kind, 'size': size_bytes, 'organized': now}
+            for hook in self.hooks:
+                if hook.wants(move):
+                    hook.put(move)
+    
+    def close(self, timeout=10):
+        """Deliver what is queued (for up to timeout seconds in total) and stop the hooks"""
+        deadline = time.monotonic() + timeout
+        for hook in self.hooks:
+            hook.close(deadline)
+        self.hooks = []
+
+HOOKS = HookPipeline()
+
+# Archive suffix -> (stdlib module, options for its open()); gzip's default level 9 was 5x slower than 6 on text for 5% less
+COMPACTION_CODECS = {'xz': ('lzma', {}), 'bz2': ('bz2', {}), 'gz': ('gzip', {'compresslevel': 6})}
+COMPACTION_MIN_SAVING = 0.1  # Keep the original when compression saves less than this share
+COMPACTION_START_DELAY = 600  # Seconds after startup before the first background pass
+
+def _compaction_worker_init():
+    """Lowest CPU and I/O priority for compactor processes"""
+    if hasattr(os, 'nice'):
+        try:
+            os.nice(19)
+        except OSError:
+            pass
+    if sys.platform.startswith('linux'):
+        IOThrottle._ioprio(0, IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT)
+    elif sys.platform == 'win32':
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), PROCESS_MODE_BACKGROUND_BEGIN)
+
+def _hash_file(opener, path, chunk=1024 * 1024):
+    import hashlib
+    digest = hashlib.sha256()
+    with opener(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def compact_file(path, codec, min_saving=COMPACTION_MIN_SAVING, chunk=1024 * 1024):
+    """Write a verified compressed copy next to path; runs in a compactor process
+    
+    Returns a manifest record. The original is left alone: the caller deletes
+    it once the record is on disk.
+    """
+    import hashlib
+    import importlib
+    module_name, options = COMPACTION_CODECS[codec]
+    module = importlib.import_module(module_name)
+    cpu = time.process_time()
+    path = Path(path)
+    archive = path.with_name(f"{path.name}.{codec}")
+    temp = archive.with_name(archive.name + '.tmp')
+    record = {'op': 'compacted', 'path': str(path), 'archive': str(archive), 'codec': codec}
+    try:
+        before = path.stat()
+        digest = hashlib.sha256()
+        with open(path, 'rb') as src, module.open(temp, 'wb', **options) as dst:
+            for block in iter(lambda: src.read(chunk), b''):
+                digest.update(block)
+                dst.write(block)
+        record.update(size=before.st_size, compressed=temp.stat().st_size, sha256=digest.hexdigest(),
+                      mtime_ns=before.st_mtime_ns, atime_ns=before.st_atime_ns)
+        after = path.stat()
+        if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+            record['op'] = 'changed'
+        elif record['compressed'] > before.st_size * (1 - min_saving):
+            record['op'] = 'incompressible'
+        elif _hash_file(module.open, temp, chunk) != record['sha256']:
+            record.update(op='error', error="compressed copy does not match")
+        else:
+            os.utime(temp, ns=(before.st_atime_ns, before.st_mtime_ns))
+            os.replace(temp, archive)
+    except Exception as e:
+        record.update(op='error', error=str(e))
+    if record['op'] != 'compacted':
+        try:
+            temp.unlink()
+        except OSError:
+            pass
+    record['cpu_ms'] = int((time.process_time() - cpu) * 1000)
+    return record
+
+class Compactor:
+    """Replaces cold files in the organizer folders with compressed copies
+    
+    A file is cold when it was organized (per the catalog), changed and last
+    read more than compact_after_days ago. Compression runs in a process pool
+    at the lowest CPU and I/O priority, one file per process at a time, under
+    the background bandwidth limit, and waits whenever the live workers have
+    files queued or in progress. Every replacement is appended to
+    COMPACTION_MANIFEST before the original is deleted, so restore() can
+    always bring it back.
+    """
+    def __init__(self, settings, pool=None, manifest=None):
+        self.pool = pool
+        self.manifest = Path(manifest) if manifest else COMPACTION_MANIFEST
+        self.days = settings.get('compact_after_days', 30)
+        self.extensions = {ext.strip().lstrip('.') for ext in
+                           str(settings.get('compact_extensions', DEFAULT_SETTINGS['compact_extensions'])).split(',')
+                           if ext.strip()}
+        self.codec = settings.get('compact_codec', 'xz')
+        if self.codec not in COMPACTION_CODECS:
+            print(f"⚠️  Unknown compact_codec '{self.codec}', using xz")
+            self.codec = 'xz'
+        self.workers = max(1, int(settings.get('compact_workers', 1)))
+        self.interval = max(1, int(settings.get('compact_interval_hours', 24))) * 3600
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread = None
+    
+    def state(self):
+        """Latest manifest record per original path"""
+        latest = {}
+        try:
+            with open(self.manifest, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line after a crash
+                    latest[record['path']] = record
+        except FileNotFoundError:
+            pass
+        return latest
+    
+    def _append(self, record):
+        record['at'] = time.time()
+        with self.lock, open(self.manifest, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def candidates(self, roots, cutoff):
+        """(path, size) of cold files with a compactable extension"""
+        folders = set().union(*(root.folders(self.extensions) for root in roots))
+        organized = CATALOG.organized_times({folder.name for folder in folders})
+        skipped = {path: record.get('mtime_ns') for path, record in self.state().items()
+                   if record['op'] == 'incompressible'}
+        files = []
+        for folder in folders:
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                if (not entry.is_file(follow_symlinks=False) or
+                        entry.name.rsplit('.', 1)[-1].lower() not in self.extensions):
+                    continue
+                THROTTLE.background.take(IOThrottle.METADATA_COST)
+                stat = entry.stat()
+                if stat.st_nlink > 1:
+                    continue  # A hard link (organize_mode=link): compressing it would free nothing
+                last_used = max(stat.st_mtime, stat.st_atime, organized.get(entry.path) or 0)
+                if last_used < cutoff and skipped.get(entry.path) != stat.st_mtime_ns:
+                    files.append((Path(entry.path), stat.st_size))
+        return files
+    
+    def _wait_for_live_work(self):
+        """Never compete with new downloads: hold off while the live workers are busy"""
+        while self.pool is not None and (self.pool.queued or self.pool.active) and not self.stopping.is_set():
+            self.stopping.wait(1)
+    
+    def run(self, roots, dry_run=False):
+        """One compaction pass over the roots' organizer folders; returns a Counter"""
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        from concurrent.futures.process import BrokenProcessPool
+        start = time.perf_counter()
+        files = self.candidates(roots, time.time() - self.days * 86400)
+        results = Counter(candidates=len(files))
+        if dry_run or not files:
+            total = sum(size for _, size in files)
+            print(f"🗜️  {len(files)} cold file(s) ({format_size(total)}) older than {self.days} days"
+                  + (" would be compacted" if dry_run else ""))
+            return results
+        print(f"🗜️  Compacting {len(files)} cold file(s) with {self.codec} on {self.workers} low-priority process(es)...")
+        # spawn, not fork: the watcher and worker threads may hold locks at fork time
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_compaction_worker_init) as executor:
+                pending = set()
+                for path, size in files:
+                    self._wait_for_live_work()
+                    if self.stopping.is_set():
+                        break
+                    THROTTLE.background.take(size)
+                    pending.add(executor.submit(compact_file, str(path), self.codec))
+                    if len(pending) >= self.workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._finish(future.result(), results)
+                for future in wait(pending).done:
+                    self._finish(future.result(), results)
+        except BrokenProcessPool as e:
+            print(f"❗ Compactor processes stopped unexpectedly: {e}")
+        saved = results['bytes_before'] - results['bytes_after']
+        share = saved / results['bytes_before'] * 100 if results['bytes_before'] else 0
+        print(f"🗜️  Compacted {results['compacted']} file(s): {format_size(results['bytes_before'])} → "
+              f"{format_size(results['bytes_after'])} (saved {format_size(saved)}, {share:.0f}%), "
+              f"CPU {results['cpu_ms'] / 1000:.1f}s, {time.perf_counter() - start:.1f}s elapsed"
+              + (f", {results['incompressible']} not worth compressing" if results['incompressible'] else "")
+              + (f", {results['error']} failed" if results['error'] else ""))
+        return results
+    
+    def _finish(self, record, results):
+        results['cpu_ms'] += record['cpu_ms']
+        METRICS.incr('compaction_cpu_ms', record['cpu_ms'])
+        if record['op'] == 'incompressible':
+            self._append(record)  # Not retried until the file changes
+        if record['op'] != 'compacted':
+            results[record['op']] += 1
+            if record['op'] == 'error':
+                print(f"❗ Could not compact {Path(record['path']).name}: {record['error']}")
+            return
+        path, archive = Path(record['path']), Path(record['archive'])
+        self._append(record)
+        try:
+            unchanged = path.stat().st_mtime_ns == record['mtime_ns']
+            if unchanged:
+                path.unlink()
+        except OSError:
+            unchanged = False
+        if not unchanged:  # Written to since it was compressed: keep it, drop the archive
+            archive.unlink(missing_ok=True)
+            self._append({'op': 'changed', 'path': str(path)})
+            results['changed'] += 1
+            return
+        CATALOG.relocate([(path, archive)])
+        results['compacted'] += 1
+        results['bytes_before'] += record['size']
+        results['bytes_after'] += record['compressed']
+        METRICS.incr('compacted_files')
+        METRICS.incr('compaction_saved_bytes', record['size'] - record['compressed'])
+    
+    def restore(self, target='all', dry_run=False):
+        """Decompress compacted files (all of them, one file or a folder) back to their names"""
+        import importlib
+        entries = [record for record in self.state().values() if record['op'] == 'compacted']
+        if target != 'all':
+            target = os.path.normcase(os.path.abspath(os.path.expanduser(str(target))))
+            entries = [record for record in entries
+                       if any(os.path.normcase(record[key]) == target
+                              or os.path.normcase(record[key]).startswith(target.rstrip(os.sep) + os.sep)
+                              for key in ('path', 'archive'))]
+        results = Counter()
+        for record in entries:
+            path, archive = Path(record['path']), Path(record['archive'])
+            if not archive.exists():
+                results['missing'] += 1
+                continue
+            if dry_run:
+                print(f"🔍 Would restore {archive.name} → {path.name}")
+                results['restored'] += 1
+                continue
+            temp = path.with_name(path.name + '.restoring')
+            try:
+                module = importlib.import_module(COMPACTION_CODECS[record['codec']][0])
+                with module.open(archive, 'rb') as src, open(temp, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                if _hash_file(open, temp) != record['sha256']:
+                    raise OSError("restored data does not match the original")
+                os.utime(temp, ns=(record['atime_ns'], record['mtime_ns']))
+                dest = get_unique_destination(path.parent, path.name)
+                rename_noreplace(temp, dest)
+            except Exception as e:
+                temp.unlink(missing_ok=True)
+                print(f"❗ Could not restore {archive.name}: {e}")
+                results['error'] += 1
+                continue
+            archive.unlink()
+            self._append({'op': 'restored', 'path': str(path), 'dest': str(dest)})
+            CATALOG.relocate([(archive, dest)])
+            results['restored'] += 1
+            if dest != path:
+                results['renamed_on_conflict'] += 1
+        print(f"📦 Restored {results['restored']} file(s)"
+              + (f", {results['missing']} archive(s) missing" if results['missing'] else "")
+              + (f", {results['error']} failed" if results['error'] else ""))
+        return results
+    
+    def start(self, roots):
+        """Run a pass COMPACTION_START_DELAY after startup, then every compact_interval_hours"""
+        def loop():
+            delay = COMPACTION_START_DELAY
+            while not self.stopping.wait(delay):
+                try:
+                    self.run(roots)
+                except Exception as e:
+                    print(f"❗ Compaction pass failed: {e}")
+                delay = self.interval
+        self.stopping.clear()
+        self.thread = threading.Thread(target=loop, name='blamite-compactor', daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Stop after the files being compressed right now"""
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+ARCHIVE_SUFFIXES = {'.zip': 'zip', '.tar': 'tar', '.tgz': 'tar', '.tbz2': 'tar', '.txz': 'tar',
+                    '.tar.gz': 'tar', '.tar.bz2': 'tar', '.tar.xz': 'tar'}
+ARCHIVES_FOLDER = "Archives"  # Where extracted bundles go when no rule covers their extension
+EXTRACT_CHUNK = 1024 * 1024  # Bytes read from an archive member at a time
+EXTRACT_MAX_RATIO = 100  # Expanded/compressed ratio above which an archive counts as a zip bomb
+EXTRACT_RATIO_GRACE = 1024 * 1024  # Output below this size is never a bomb, whatever the ratio
+
+class ArchiveBomb(Exception):
+    """An archive expands beyond the extraction limits"""
+
+class ArchiveExtractor:
+    """Copies the members of downloaded zip/tar bundles into their category folders
+    
+    Member data is read EXTRACT_CHUNK at a time. Tar bundles are read in
+    stream mode, so not even their member list is kept; a zip's member list
+    is its central directory, which is loaded whole when it is opened. Only
+    members whose extension has a rule are written; the rest are never
+    unpacked. Each member goes into its category folder under its base name
+    only, so names like ../../.bashrc cannot escape it, and links and
+    devices are skipped. Actual output is counted against extract_max_mb,
+    extract_max_members and EXTRACT_MAX_RATIO while writing, so a lying
+    header can't get past them.
+    
+    Extraction is all or nothing. Every member is journaled before it is
+    written, so after a crash the journal removes the members written so far
+    and the archive is extracted again. An archive that breaks a limit or
+    can't be read has its members removed right away. Extracted members are
+    recorded in the transaction log, so an undo deletes them.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.max_bytes = 2048 * 1024 * 1024
+        self.max_members = 10000
+    
+    def configure(self, settings):
+        self.enabled = bool(settings.get('extract_archives', False))
+        self.max_bytes = max(1, int(settings.get('extract_max_mb', 2048))) * 1024 * 1024
+        self.max_members = max(1, int(settings.get('extract_max_members', 10000)))
+        if self.enabled:
+            METRICS.register_gauge('extract_mb_per_s', self.throughput)
+    
+    @staticmethod
+    def kind(file_path):
+        """'zip' or 'tar' for a bundle BLAMITE can extract, else None"""
+        name = file_path.name.lower()
+        for suffix in ('.tar.gz', '.tar.bz2', '.tar.xz'):
+            if name.endswith(suffix):
+                return 'tar'
+        return ARCHIVE_SUFFIXES.get(file_path.suffix.lower())
+    
+    @staticmethod
+    def throughput():
+        """MB/s written by extractions so far"""
+        counters = METRICS.counters
+        if not counters['extract_ms']:
+            return 0
+        return round(counters['extract_bytes'] / 1024 / 1024 / (counters['extract_ms'] / 1000), 1)
+    
+    @staticmethod
+    def _members(file_path, kind):
+        """Yield (name, declared size, compressed size or None, opener) for each regular file
+        
+        A zip's central directory is read whole first; a tar is read as one stream.
+        """
+        if kind == 'zip':
+            import zipfile
+            with zipfile.ZipFile(file_path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        yield info.filename, info.file_size, info.compress_size, lambda info=info: archive.open(info)
+        else:
+            import tarfile
+            with tarfile.open(file_path, 'r|*') as archive:
+                for member in archive:
+                    if member.isfile():
+                        yield member.name, member.size, None, lambda member=member: archive.extractfile(member)
+    
+    @staticmethod
+    def _create(dest_folder, name, journal_intent):
+        """Open a new file for name in dest_folder, or for the next free variant of it
+        
+        journal_intent(dest_path) is called before each name is tried.
+        """
+        dest_path = dest_folder / name
+        while True:
+            journal_intent(dest_path)
+            try:
+                return dest_path, open(dest_path, 'xb')
+            except FileExistsError:
+                dest_path = get_unique_destination(dest_folder, name)
+    
+    def _copy(self, stream, dest, declared, compressed, totals):
+        """Copy one member within the limits; raises ArchiveBomb when it breaks one"""
+        written = 0
+        for chunk in iter(lambda: stream.read(EXTRACT_CHUNK), b''):
+            written += len(chunk)
+            totals['bytes'] += len(chunk)
+            if written > declared:
+                raise ArchiveBomb("a member is larger than its header says")
+            if compressed is not None and written > EXTRACT_RATIO_GRACE and written > compressed * EXTRACT_MAX_RATIO:
+                raise ArchiveBomb(f"a member expands more than {EXTRACT_MAX_RATIO}:1")
+            if totals['bytes'] > self.max_bytes:
+                raise ArchiveBomb(f"it expands to more than {self.max_bytes // 1024 // 1024} MB")
+            if totals['bytes'] > EXTRACT_RATIO_GRACE and totals['bytes'] > totals['size'] * EXTRACT_MAX_RATIO:
+                raise ArchiveBomb(f"it expands more than {EXTRACT_MAX_RATIO}:1")
+            THROTTLE.live.take(len(chunk))
+            dest.write(chunk)
+    
+    def extract(self, file_path, root, kind=None, services=None):
+        """Extract the members of file_path that have a rule; returns (outcome, [(member, dest_path)])
+        
+        The outcome is 'extracted', 'extract_rejected' (a limit was broken)
+        or 'extract_error' (unreadable archive or failed write). Members are
+        recorded in the journal, the 'live' transaction, the catalog and the
+        hooks of services (by default the process-wide ones).
+        """
+        services = services or SERVICES
+        journal = services.journal
+        kind = kind or self.kind(file_path)
+        start = time.perf_counter()
+        totals = Counter(size=max(1, file_path.stat().st_size))
+        extracted = []
+        journaled = []  # Members with an open journal entry
+        dest_path = None
+        try:
+            for name, declared, compressed, opener in self._members(file_path, kind):
+                totals['members'] += 1
+                if totals['members'] > self.max_members:
+                    raise ArchiveBomb(f"it has more than {self.max_members} files")
+                base = PurePosixPath(name.replace('\\', '/')).name
+                ext = organizable_extension(Path(base), root.subfolders) if base not in ('', '.', '..') else None
+                if ext is None:
+                    totals['skipped'] += 1
+                    continue
+                dest_folder = root.folder_for(ext, file_path, declared)
+                ensure_folder(dest_folder)
+                member = file_path / name
+                journaled.append(member)
+                dest_path, dest = self._create(dest_folder, base, lambda dest_path: journal.intent(
+                    member, dest_path, declared, root.name, file_path))
+                with dest, opener() as stream:
+                    self._copy(stream, dest, declared, compressed, totals)
+                extracted.append((member, dest_path))
+                dest_path = None
+        except Exception as e:
+            for path in [dest_path] + [dest for _, dest in extracted]:
+                if path is not None:
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+            if isinstance(e, ArchiveBomb):
+                services.say(f"❗ Not extracting {file_path.name}: {e}, so it may be a zip bomb")
+                outcome = 'extract_rejected'
+            else:
+                services.say(f"❗ Could not extract {file_path.name}: {e}")
+                outcome = 'extract_error'
+            for member in journaled:
+                journal.finish(member, outcome)
+            ACTIVITY.error(file_path.name, e)
+            return outcome, []
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        METRICS.incr('archives_extracted', root=root.name)
+        METRICS.incr('extract_members', len(extracted), root=root.name)
+        METRICS.incr('extract_skipped_members', totals['skipped'], root=root.name)
+        METRICS.incr('extract_bytes', totals['bytes'], root=root.name)
+        METRICS.incr('extract_ms', int(elapsed_ms), root=root.name)
+        for src, dest in extracted:
+            services.transactions.record('live', src, dest, extracted=True)
+        for member in journaled:
+            journal.finish(member, 'organized')
+        services.catalog.record_many(extracted, 'extract', root.name)
+        services.hooks.submit_many(extracted, 'extract', root.name)
+        for src, dest in extracted:
+            ACTIVITY.moved(src, dest)
+        rate = totals['bytes'] / 1024 / 1024 / max(elapsed_ms / 1000, 0.001)
+        services.say(f"📦 Extracted {len(extracted)} of {totals['members']} file(s) from {file_path.name} "
+                     f"({totals['bytes'] / 1024 / 1024:.1f} MB in {elapsed_ms / 1000:.1f}s, {rate:.0f} MB/s)")
+        return 'extracted', extracted
+
+EXTRACTOR = ArchiveExtractor()
+
+class FreeSpace:
+    """Cached free space and device of destination folders
+    
+    Placement reads these instead of calling disk_usage() and stat() per
+    file. While the watcher runs a timer thread refreshes every reading each
+    interval; without it (backtrack only, --once) a reading older than the
+    interval is read again when asked for. Bytes copied to a volume are
+    subtracted right away, so a burst between refreshes can't overfill it.
+    """
+    def __init__(self, interval=30):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.readings = {}  # folder -> [free bytes, total bytes, st_dev, monotonic time read]
+        self.devices = {}  # source folder -> st_dev
+        self.stopping = threading.Event()
+        self.thread = None
+    
+    @staticmethod
+    def _read(folder):
+        probe = Path(folder)
+        while not probe.exists() and probe.parent != probe:
+            probe = probe.parent  # Destination folders are created on the first move
+        try:
+            usage = shutil.disk_usage(probe)
+            return [usage.free, usage.total, os.stat(probe).st_dev, time.monotonic()]
+        except OSError:
+            return [0, 0, None, time.monotonic()]  # Unreachable: only used when nothing else has room
+    
+    def reading(self, folder):
+        key = str(folder)
+        with self.lock:
+            reading = self.readings.get(key)
+        if reading is None or (self.thread is None and time.monotonic() - reading[3] > self.interval):
+            reading = self._read(folder)
+            with self.lock:
+                self.readings[key] = reading
+        return reading
+    
+    def device(self, folder):
+        """st_dev of a source folder (cached until the next refresh)"""
+        key = str(folder)
+        with self.lock:
+            device = self.devices.get(key)
+        if device is None:
+            try:
+                device = self.devices[key] = os.stat(folder).st_dev
+            except OSError:
+                pass
+        return device
+    
+    def consume(self, device, size):
+        """Count size bytes as used on a volume until the next refresh"""
+        with self.lock:
+            for reading in self.readings.values():
+                if reading[2] == device:
+                    reading[0] -= size
+    
+    def mark_full(self, folder):
+        """A move ran out of space: nothing more goes to this volume until the next refresh"""
+        device = self.reading(folder)[2]
+        with self.lock:
+            for key, reading in self.readings.items():
+                if key == str(folder) or (device is not None and reading[2] == device):
+                    reading[0] = 0
+    
+    def refresh(self):
+        with self.lock:
+            folders = list(self.readings)
+            self.devices.clear()
+        fresh = {folder: self._read(folder) for folder in folders}
+        with self.lock:
+            self.readings.update(fresh)
+    
+    def start(self, interval=None):
+        """Refresh every interval seconds on a background thread"""
+        if interval:
+            self.interval = interval
+        if self.thread is not None:
+            return
+        def loop():
+            while not self.stopping.wait(self.interval):
+                self.refresh()
+        self.stopping.clear()
+        self.thread = threading.Thread(target=loop, name='blamite-free-space', daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+FREE_SPACE = FreeSpace()
+
+class DestinationPool:
+    """Folders one category can be organized into, in order of preference
+    
+    A file goes to the first folder on the same device as the file (a cheap
+    rename) that keeps the reserve free after it, else to the first folder
+    elsewhere that does: the pool spills over before a volume fills. The
+    reserve is reserve_mb or reserve_percent of the volume, whichever is more.
+    """
+    def __init__(self, folders, reserve_mb=1024, reserve_percent=5, say=print):
+        self.say = say
+        self.folders = list(folders)
+        self.reserve = int(reserve_mb) * 1024 * 1024
+        self.reserve_percent = reserve_percent
+        self.warned = False
+    
+    def pick(self, file_path=None, size=None):
+        source_device = FREE_SPACE.device(file_path.parent) if file_path is not None else None
+        if size is None:
+            size = (file_size(file_path) if file_path is not None else None) or 0
+        fitting = []
+        for order, folder in enumerate(self.folders):
+            free, total, device, _ = FREE_SPACE.reading(folder)
+            if free - size >= max(self.reserve, total * self.reserve_percent / 100):
+                fitting.append((device != source_device, order, folder, device))
+        if fitting:
+            _, order, folder, device = min(fitting)
+            if order:
+                METRICS.incr('pool_spilled')
+            self.warned = False
+        else:
+            folder = max(self.folders, key=lambda f: FREE_SPACE.reading(f)[0])
+            device = FREE_SPACE.reading(folder)[2]
+            METRICS.incr('pool_exhausted')
+            if not self.warned:
+                self.warned = True
+                self.say(f"⚠️  Every folder for {self.folders[0].name} is nearly full; using the emptiest, {folder}")
+        if device != source_device:
+            FREE_SPACE.consume(device, size)
+        return folder
+
+class WatchRoot:
+    """A source folder to watch and where its files get organized"""
+    def __init__(self, name, source, destination, subfolders,
+                 recursive=False, max_depth=3, exclude=(), backend='auto', pools=None):
+        self.name = name
+        self.source = Path(source)
+        self.destination = Path(destination)
+        self.subfolders = subfolders  # extension -> destination folder (the first of its pool)
+        self.pools = pools or {}  # extension -> DestinationPool, for rules with several folders
+        self.recursive = recursive
+        self.max_depth = max_depth if recursive else 0
+        self.exclude = {name.lower() for name in exclude}
+        self.backend = backend  # auto, native or polling
+
+    def __repr__(self):
+        return f"WatchRoot({self.name!r}, {str(self.source)!r} -> {str(self.destination)!r})"
+
+    def folder_for(self, ext, file_path=None, size=None):
+        """Where a file with this extension goes: its rule's folder, or the pick of its pool"""
+        pool = self.pools.get(ext)
+        return pool.pick(file_path, size) if pool is not None else self.subfolders[ext]
+    
+    def folders(self, extensions=None):
+        """Every destination folder, including spill-over folders (only for extensions, if given)"""
+        folders = {folder for ext, folder in self.subfolders.items() if extensions is None or ext in extensions}
+        for ext, pool in self.pools.items():
+            if extensions is None or ext in extensions:
+                folders.update(pool.folders)
+        return folders
+    
+    def watches_dir(self, directory):
+        """True if files in this directory (the root or a subfolder) belong to the root"""
+        try:
+            parts = Path(directory).relative_to(self.source).parts
+        except ValueError:
+            return False
+        if not parts:
+            return True
+        if len(parts) > self.max_depth:
+            return False
+        if any(part.lower() in self.exclude for part in parts):
+            return False
+        # Never re-organize the organizer's own output if it lives inside the source
+        directory = Path(directory)
+        return not (directory == self.destination or self.destination in directory.parents)
+
+    def iter_files(self):
+        """Existing files in the root, including allowed subfolders when recursive"""
+        if not self.recursive:
+            for entry in os.scandir(self.source):
+                if entry.is_file():
+                    yield Path(entry.path)
+            return
+        for dirpath, dirnames, filenames in os.walk(self.source):
+            dirnames[:] = [d for d in dirnames if self.watches_dir(Path(dirpath) / d)]
+            for filename in filenames:
+                yield Path(dirpath) / filename
+
+def recursive_options(settings):
+    """Watch options (recursion, backend) for WatchRoot from user settings"""
+    if not settings:
+        return {}
+    exclude = str(settings.get('recursive_exclude', DEFAULT_SETTINGS['recursive_exclude']))
+    return {
+        'recursive': settings.get('recursive_watch', False),
+        'max_depth': settings.get('recursive_max_depth', 3),
+        'exclude': [name.strip() for name in exclude.split(',') if name.strip()],
+        'backend': settings.get('watch_backend', 'auto')
+    }
+
+def default_root(settings=None):
+    """The classic setup: Downloads organized into Desktop/BLAMITE_Organizer"""
+    # Shares the SUBFOLDERS dict so configure_paths() keeps it current
+    return WatchRoot('Downloads', DOWNLOADS, ORGANIZER, SUBFOLDERS, **recursive_options(settings))
+
+def load_roots(roots_file=None, settings=None):
+    """Load per-root configuration from blamite_roots.json
+    
+    Example:
+        {"roots": [
+            {"name": "alice", "source": "/home/alice/Downloads",
+             "destination": "/srv/organized/alice", "rules": {"dwg": "CAD"}},
+            {"name": "scanner", "source": "/srv/scans", "destination": "/srv/organized/scans",
+             "rules": {"pdf": "Scans"}, "inherit_rules": false}
+        ]}
+    
+    Rules map extensions to folder names inside the destination and extend the
+    built-in SUBFOLDER_NAMES unless "inherit_rules" is false; a null folder
+    disables an extension. "recursive", "max_depth" and "exclude" override the
+    recursive-watch settings per root, and "backend" the watch_backend setting.
+    Without the file only Downloads is watched.
+    """
+    roots_file = Path(roots_file) if roots_file else ROOTS_FILE
+    if not roots_file.exists():
+        return [default_root(settings)]
+    try:
+        config = json.loads(roots_file.read_text(encoding='utf-8'))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️  Error loading {roots_file.name}: {e}. Watching Downloads only.")
+        return [default_root(settings)]
+    return roots_from_config(config.get('roots', []), settings, roots_file.name) or [default_root(settings)]
+
+def roots_from_config(entries, settings=None, origin='the configuration', say=print):
+    """Build WatchRoots from root entries in the blamite_roots.json format; invalid entries are skipped"""
+    roots = []
+    seen = set()
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or 'source' not in entry:
+            say(f"⚠️  Root #{index + 1} in {origin} has no 'source', skipping")
+            continue
+        source = Path(entry['source']).expanduser()
+        key = os.path.normcase(str(source))
+        if key in seen:
+            say(f"⚠️  {source} is listed twice in {origin}, skipping the duplicate")
+            continue
+        seen.add(key)
+        destination = Path(entry.get('destination', str(ORGANIZER))).expanduser()
+        rules = dict(SUBFOLDER_NAMES) if entry.get('inherit_rules', True) else {}
+        for ext, folder in entry.get('rules', {}).items():
+            rules[ext.lower().lstrip('.')] = folder
+        subfolders, pools = {}, {}
+        for ext, folder in rules.items():
+            # A list of folders is a pool: the first one, then the others once it is nearly full
+            folders = [destination / Path(f).expanduser() for f in
+                       (folder if isinstance(folder, list) else [folder]) if f]
+            if not folders:
+                continue
+            subfolders[ext] = folders[0]
+            if len(folders) > 1:
+                pools[ext] = DestinationPool(folders, (settings or {}).get('pool_reserve_mb', 1024),
+                                             (settings or {}).get('pool_reserve_percent', 5), say)
+        options = recursive_options(settings) or {'recursive': False}
+        for key in ('recursive', 'max_depth', 'exclude', 'backend'):
+            if key in entry:
+                options[key] = entry[key]
+        roots.append(WatchRoot(entry.get('name', source.name), source, destination, subfolders,
+                               pools=pools, **options))
+    return roots
+
+def inotify_limits():
+    """Read the kernel's inotify limits (Linux only; empty elsewhere)"""
+    limits = {}
+    for name in ('max_user_watches', 'max_user_instances', 'max_queued_events'):
+        try:
+            limits[name] = int(Path(f"/proc/sys/fs/inotify/{name}").read_text())
+        except (OSError, ValueError):
+            pass
+    return limits
+
+# File systems where the OS never reports changes made by other machines
+NETWORK_FILESYSTEMS = {'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'ncpfs', 'afs', '9p',
+                       'fuse.sshfs', 'fuse.rclone', 'davfs', 'fuse.davfs2'}
+
+def read_mounts():
+    """(mount point, file system type) pairs, longest mount point first (Linux only)"""
+    mounts = []
+    try:
+        with open('/proc/self/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3:
+                    mounts.append((fields[1].replace('\\040', ' '), fields[2]))
+    except OSError:
+        pass
+    return sorted(mounts, key=lambda mount: len(mount[0]), reverse=True)
+
+def is_network_path(path, mounts=None):
+    """Best-effort check whether a folder lives on a network share"""
+    path = os.path.realpath(str(path))
+    if sys.platform == 'win32':
+        if path.startswith('\\\\'):
+            return True  # UNC path
+        try:
+            import ctypes
+            drive = os.path.splitdrive(path)[0] + '\\'
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == 4  # DRIVE_REMOTE
+        except Exception:
+            return False
+    for mount_point, fstype in (read_mounts() if mounts is None else mounts):
+        if path == mount_point or path.startswith(mount_point.rstrip('/') + '/'):
+            return fstype in NETWORK_FILESYSTEMS
+    return False
+
+_ensured_folders = set()
+
+def ensure_folder(folder):
+    """Create a destination folder the first time it is needed"""
+    key = str(folder)
+    if key not in _ensured_folders:
+        folder.mkdir(parents=True, exist_ok=True)
+        _ensured_folders.add(key)
+
+# Create organizer folders if they don't exist
+def setup_folders(roots=None):
+    """Create organizer folders if they don't exist and show info"""
+    roots = roots or [default_root()]
+    print("\n" + "="*50)
+    print("📁 SETTING UP BLAMITE ORGANIZER FOLDERS")
+    print("="*50)
+    
+    if len(roots) > 1:
+        # Creating every folder for thousands of roots up front would slow startup
+        available = sum(1 for root in roots if root.source.exists())
+        print(f"📡 {len(roots)} watch roots configured ({available} available)")
+        print("📂 Destination folders are created the first time a file needs them")
+        print("="*50)
+        return
+    
+    organizer = roots[0].destination
+    
+    # Create main organizer folder
+    if not organizer.exists():
+        organizer.mkdir(parents=True, exist_ok=True)
+        print(f"✅ Created main folder: {organizer}")
+    else:
+        print(f"📁 Main folder exists: {organizer}")
+    
+    # Create subfolders
+    folders_created = 0
+    unique_folders = set(roots[0].subfolders.values())  # Use set to avoid duplicates
+    for folder in unique_folders:
+        if not folder.exists():
+            folder.mkdir(parents=True, exist_ok=True)
+            print(f"✅ Created subfolder: {folder.name}")
+            folders_created += 1
+        else:
+            print(f"📂 Subfolder exists: {folder.name}")
+    
+    if folders_created > 0:
+        print(f"\n🎉 Created {folders_created} new subfolders!")
+    
+    print("\n📋 Supported file types:")
+    print("   📄 Documents: PDF, DOC, DOCX, XLS, XLSX")
+    print("   📝 Text Files: TXT")
+    print("   🖼️  Images: PNG, JPG, JPEG, GIF")
+    print("   🎵 Audio: MP3")
+    print("   🎬 Video: MP4, MOV")
+    print("="*50)
+
+def create_desktop_shortcuts():
+    """No longer needed - function disabled"""
+    pass
+
+def get_unique_destination(dest_folder, file_name):
+    """Return a path in dest_folder for file_name that doesn't overwrite anything"""
+    dest_path = dest_folder / file_name
+    counter = 1
+    original_dest = dest_path
+    while dest_path.exists():
+        name_part = original_dest.stem
+        ext_part = original_dest.suffix
+        dest_path = dest_folder / f"{name_part}_{counter}{ext_part}"
+        counter += 1
+    return dest_path
+
+AT_FDCWD = -100
+RENAME_NOREPLACE = 1  # renameat2() flag: fail with EEXIST instead of replacing the target
+
+_renameat2 = None
+_RENAME_LOCK = threading.Lock()  # Last-resort check-then-rename (no renameat2, no hard links)
+
+def _load_renameat2():
+    """Look up renameat2() once, on the first move rather than at import"""
+    global _renameat2
+    if _renameat2 is None:
+        _renameat2 = _find_renameat2() or False
+    return _renameat2
+
+def _find_renameat2():
+    if not sys.platform.startswith('linux'):
+        return None
+    import ctypes
+    try:
+        func = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return None  # glibc older than 2.28
+    func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+    return func
+
+def rename_noreplace(src, dst, src_dir_fd=None, dst_dir_fd=None):
+    """os.rename that raises FileExistsError instead of replacing dst
+    
+    On Linux this is one renameat2(RENAME_NOREPLACE) call, so the check and
+    the rename can't race. Filesystems without the flag get a hard link
+    (which fails atomically if dst exists) and then an unlink of src. Where
+    hard links aren't supported either, the check and rename are serialized
+    within this process; another program can still race them there.
+    Windows' rename never replaces anyway.
+    """
+    renameat2 = _load_renameat2()
+    if renameat2:
+        result = renameat2(AT_FDCWD if src_dir_fd is None else src_dir_fd, os.fsencode(src),
+                            AT_FDCWD if dst_dir_fd is None else dst_dir_fd, os.fsencode(dst),
+                            RENAME_NOREPLACE)
+        if result == 0:
+            return
+        import ctypes
+        error = ctypes.get_errno()
+        if error not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+            raise OSError(error, os.strerror(error), src, None, dst)
+    if sys.platform == 'win32':
+        os.rename(src, dst, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
+        return
+    try:
+        os.link(src, dst, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd, follow_symlinks=False)
+    except OSError as e:
+        if e.errno not in (errno.EPERM, errno.EOPNOTSUPP, errno.ENOSYS, errno.EMLINK):
+            raise  # FileExistsError, EXDEV, ENOENT... mean the same as for rename
+    else:
+        try:
+            os.unlink(src, dir_fd=src_dir_fd)
+        except OSError:
+            os.unlink(dst, dir_fd=dst_dir_fd)
+            raise
+        return
+    with _RENAME_LOCK:
+        try:
+            os.lstat(dst, dir_fd=dst_dir_fd)
+        except FileNotFoundError:
+            pass
+        else:
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+        os.rename(src, dst, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
+
+PARTIAL_SUFFIX = '.blamite-partial'  # Cross-drive copies are written under a hidden temp name first
+
+def partial_copies(dest_path):
+    """Temp files a cross-drive copy to dest_path may have left behind"""
+    dest_path = Path(dest_path)
+    prefix = f".{dest_path.name}."
+    try:
+        names = os.listdir(dest_path.parent)
+    except FileNotFoundError:
+        return []
+    return [dest_path.parent / name for name in names if name.startswith(prefix) and name.endswith(PARTIAL_SUFFIX)]
+
+def copy_across(file_path, dest_path, bucket, on_conflict=None):
+    """Move a file to another drive, copying at the bucket's rate; returns where it ended up
+    
+    The copy goes to a hidden temp name in the destination folder and is
+    renamed into place without replacing anything, so a half copy never
+    shows up under the real name and another writer's file is never touched.
+    A taken name raises FileExistsError, unless on_conflict(dest_path)
+    returns another name to try.
+    """
+    if on_conflict is None and os.path.lexists(dest_path):
+        # Only saves a useless copy; the no-replace rename below is what guarantees it
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(dest_path))
+    temp = dest_path.with_name(f".{dest_path.name}.{short_id(6)}{PARTIAL_SUFFIX}")
+    try:
+        if bucket.rate <= 0:
+            open(temp, 'xb').close()  # Claim the temp name; copyfile then uses the kernel's fast path
+            shutil.copyfile(file_path, temp)
+        else:
+            with open(file_path, 'rb') as src, open(temp, 'xb') as dst:
+                while True:
+                    chunk = src.read(IOThrottle.CHUNK)
+                    if not chunk:
+                        break
+                    bucket.take(len(chunk))
+                    dst.write(chunk)
+        shutil.copystat(file_path, temp)
+        while True:
+            try:
+                rename_noreplace(temp, dest_path)
+                break
+            except FileExistsError:
+                if on_conflict is None:
+                    raise
+                dest_path = on_conflict(dest_path)
+    except BaseException:
+        # Don't leave a half copy behind, e.g. when the other drive filled up
+        try:
+            os.remove(temp)
+        except FileNotFoundError:
+            pass
+        raise
+    os.remove(file_path)
+    return dest_path
+
+def move_file(file_path, dest_path, root_name=None, bucket=None, journal=None):
+    """Move one file without replacing anything; returns where it ended up
+    
+    A successful rename is the verification, so no stats before or after.
+    A name taken since it was picked gets the next free one (journaled again
+    first, in JOURNAL unless another journal is given), and moves to another
+    drive are copied within the bucket's budget.
+    """
+    while True:
+        try:
+            rename_noreplace(file_path, dest_path)
+            return dest_path
+        except FileExistsError:
+            dest_path = next_destination(file_path, dest_path, root_name, journal)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            return copy_across(file_path, dest_path, bucket or THROTTLE.live,
+                               lambda taken: next_destination(file_path, taken, root_name, journal))
+
+def next_destination(file_path, taken, root_name=None, journal=None):
+    """The next free name after `taken`, journaled before it is used"""
+    dest_path = get_unique_destination(taken.parent, taken.name)
+    (journal or JOURNAL).intent(file_path, dest_path, None, root_name)
+    return dest_path
+
+DIR_FDS = os.rename in os.supports_dir_fd  # renameat() with folder descriptors (not on Windows)
+
+class DirectoryMover:
+    """Same-volume fast path for moving many files at once
+    
+    Keeps one open descriptor per source and destination folder for the
+    length of a batch, lists each destination once so free names are picked
+    in memory, and moves with a no-replace renameat relative to those
+    descriptors: one syscall per file, and its return code is the check.
+    Files going to another volume are copied within the background budget.
+    """
+    def __init__(self, root_name=None, bucket=None, journal=None):
+        self.root_name = root_name
+        self.bucket = bucket or THROTTLE.background
+        self.journal = journal or JOURNAL
+        self.fds = {}  # folder -> (descriptor, st_dev)
+        self.taken = {}  # destination folder -> names present or claimed by this batch
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        for fd, _ in self.fds.values():
+            os.close(fd)
+        self.fds.clear()
+        self.taken.clear()
+    
+    def _open(self, folder):
+        key = str(folder)
+        entry = self.fds.get(key)
+        if entry is None:
+            fd = os.open(key, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            entry = self.fds[key] = (fd, os.fstat(fd).st_dev)
+        return entry
+    
+    def reserve(self, dest_folder, name):
+        """Claim a free name in dest_folder; only the first call lists the folder"""
+        key = str(dest_folder)
+        taken = self.taken.get(key)
+        if taken is None:
+            taken = self.taken[key] = set(os.listdir(self._open(dest_folder)[0] if DIR_FDS else key))
+        name = unique_name(name, taken)
+        taken.add(name)
+        return dest_folder / name
+    
+    def move(self, file_path, dest_path):
+        """Move file_path to a reserved dest_path; returns where it ended up"""
+        self.bucket.take(IOThrottle.METADATA_COST)
+        if not DIR_FDS:
+            return move_file(file_path, dest_path, self.root_name, self.bucket, self.journal)
+        src_fd, src_dev = self._open(file_path.parent)
+        dest_fd, dest_dev = self._open(dest_path.parent)
+        if src_dev != dest_dev:
+            return copy_across(file_path, dest_path, self.bucket,
+                               lambda taken: next_destination(file_path, taken, self.root_name, self.journal))
+        while True:
+            try:
+                rename_noreplace(file_path.name, dest_path.name, src_dir_fd=src_fd, dst_dir_fd=dest_fd)
+                return dest_path
+            except FileExistsError:
+                # Created after the listing; journal the next free name before using it
+                dest_path = self.reserve(dest_path.parent, dest_path.name)
+                self.journal.intent(file_path, dest_path, None, self.root_name)
+
+BACKTRACK_BATCH = 500  # Files planned, journaled and moved together during a scan
+
+def organizable_extension(file_path, subfolders):
+    """The extension that decides where file_path goes, or None for temporary and unsupported files"""
+    name = file_path.name
+    if (name.startswith('.') or name.startswith('~') or
+            name.endswith(('.tmp', '.part', '.crdownload'))):
+        return None
+    ext = file_path.suffix.lower().lstrip('.')
+    return ext if ext in subfolders else None
+
+def link_file(file_path, dest_path):
+    """Link dest_path to file_path without replacing anything; returns (where the link ended up, kind)
+    
+    A hard link when both are on one volume, else a symbolic link (kind
+    'hard' or 'symbolic'): one metadata operation whatever the file's size.
+    """
+    hard = True
+    while True:
+        try:
+            if hard:
+                os.link(file_path, dest_path)
+                return dest_path, 'hard'
+            os.symlink(os.path.abspath(file_path), dest_path)
+            return dest_path, 'symbolic'
+        except FileExistsError:
+            dest_path = get_unique_destination(dest_path.parent, dest_path.name)
+        except OSError as e:
+            if not hard or e.errno in (errno.ENOENT, errno.ENOSPC):
+                raise
+            hard = False  # Another volume (EXDEV), or a file system without hard links
+
+class LinkView:
+    """Organizer folders made of links to files that stay where they are
+    
+    With organize_mode=link, files are linked into their category folder
+    instead of moved. Every link is appended to LINKS_MANIFEST with the
+    file's device and inode. That is how backtracks and rescans know which
+    files already have a link. It is also how prune() checks each link with
+    two stats, without walking the organizer, and never touches files that
+    BLAMITE did not link. Only symbolic links are ever removed.
+    """
+    def __init__(self, say=print):
+        self.say = say
+        self.enabled = False
+        self.path = LINKS_MANIFEST
+        self.lock = threading.Lock()
+        self.sources = None  # normalized source path -> (link path, dev, ino), loaded on first use
+    
+    def configure(self, settings, manifest=None):
+        self.enabled = settings.get('organize_mode', 'move') == 'link'
+        self.path = Path(manifest) if manifest else LINKS_MANIFEST
+        self.sources = None
+    
+    def close(self):
+        """Back to moving files"""
+        self.enabled = False
+        self.sources = None
+    
+    def _records(self):
+        """Latest record per link"""
+        records = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    records[record['link']] = record
+        except FileNotFoundError:
+            pass
+        return records
+    
+    def _source(self, file_path):
+        """The (link, dev, ino) recorded for file_path, or None; call with the lock held"""
+        if self.sources is None:
+            self.sources = {os.path.normcase(r['src']): (r['link'], r['dev'], r['ino'])
+                            for r in self._records().values()}
+        return self.sources.get(os.path.normcase(str(file_path)))
+    
+    def linked(self, file_path):
+        """True if file_path already has a link in the organizer
+        
+        A file that arrived again under the same name (a new device and inode)
+        does not count: it still needs a link of its own.
+        """
+        with self.lock:
+            source = self._source(file_path)
+        if source is None:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return (stat.st_dev, stat.st_ino) == source[1:]
+    
+    def retire(self, file_path):
+        """Clear the way for a new link to file_path when its recorded link is stale
+        
+        A symbolic link is removed, it only pointed at the name. A hard link
+        holds the earlier download, so it is renamed to a free name instead.
+        Links that were changed by hand are left alone.
+        """
+        from stat import S_ISLNK
+        with self.lock:
+            source = self._source(file_path)
+        if source is None:
+            return
+        link, dev, ino = source
+        try:
+            current, link_stat = os.stat(file_path), os.lstat(link)
+        except OSError:
+            return
+        if (current.st_dev, current.st_ino) == (dev, ino):
+            return
+        try:
+            if S_ISLNK(link_stat.st_mode):
+                os.remove(link)
+            elif (link_stat.st_dev, link_stat.st_ino) == (dev, ino):
+                link = Path(link)
+                while True:
+                    aside = get_unique_destination(link.parent, link.name)
+                    try:
+                        rename_noreplace(link, aside)
+                        break
+                    except FileExistsError:
+                        continue
+                self.say(f"🔗 {link.name} was downloaded again, the earlier one is now {aside.name}")
+        except OSError as e:
+            self.say(f"❗ Could not replace the link {link}: {e}")
+    
+    def record(self, links):
+        """Append (source, link, kind) entries; one write, so shard processes can share the file"""
+        lines, recorded = [], []
+        for src, link, kind in links:
+            try:
+                stat = os.stat(src)
+            except OSError:
+                continue
+            lines.append(json.dumps({'src': str(src), 'link': str(link), 'kind': kind,
+                                     'dev': stat.st_dev, 'ino': stat.st_ino}) + '\n')
+            recorded.append((src, link, stat))
+        if not lines:
+            return
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+            if self.sources is not None:
+                for src, link, stat in recorded:
+                    self.sources[os.path.normcase(str(src))] = (str(link), stat.st_dev, stat.st_ino)
+    
+    def prune(self, dry_run=False):
+        """Remove symbolic links whose file is gone; returns a Counter
+        
+        A hard link whose download was deleted or replaced is the only name
+        left for that data, so it is kept as a plain file and only dropped
+        from the manifest. Links that were deleted or replaced by hand are
+        only forgotten too.
+        """
+        from stat import S_ISLNK
+        start = time.perf_counter()
+        results = Counter()
+        keep, removed = [], []
+        with self.lock:
+            records = self._records()
+        for link, record in records.items():
+            try:
+                link_stat = os.lstat(link)
+            except FileNotFoundError:
+                results['missing'] += 1
+                continue
+            symbolic = record['kind'] == 'symbolic'
+            if (S_ISLNK(link_stat.st_mode) != symbolic or
+                    (not symbolic and (link_stat.st_dev, link_stat.st_ino) != (record['dev'], record['ino']))):
+                results['replaced'] += 1
+                continue
+            try:
+                source = os.stat(record['src'])
+                same = (source.st_dev, source.st_ino) == (record['dev'], record['ino'])
+            except FileNotFoundError:
+                source, same = None, False
+            if symbolic and source is None:
+                if not dry_run:
+                    try:
+                        os.remove(link)
+                    except OSError as e:
+                        self.say(f"❗ Could not remove {link}: {e}")
+                        keep.append(record)
+                        results['error'] += 1
+                        continue
+                removed.append(link)
+            elif symbolic or same:
+                keep.append(record)
+            else:
+                results['orphaned'] += 1  # The organizer folder now holds the only copy
+        results.update(pruned=len(removed), kept=len(keep))
+        if not dry_run:
+            temp = self.path.with_name(self.path.name + '.tmp')
+            with self.lock:
+                # Links recorded while we were checking are kept as they are
+                for link, record in self._records().items():
+                    if link not in records:
+                        keep.append(record)
+                with open(temp, 'w', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(record) + '\n' for record in keep))
+                os.replace(temp, self.path)
+                self.sources = None
+            CATALOG.forget(removed)
+        forgotten = results['missing'] + results['replaced']
+        self.say(f"🔗 {'Would prune' if dry_run else 'Pruned'} {len(removed)} dangling link(s), kept {len(keep)} "
+                 f"in {time.perf_counter() - start:.2f}s"
+                 + (f", {results['orphaned']} hard link(s) kept as the last copy of a deleted download"
+                    if results['orphaned'] else "")
+                 + (f", forgot {forgotten} removed or replaced by hand" if forgotten else ""))
+        return results
+
+LINKS = LinkView()
+
+class Services:
+    """The journal, transaction log, catalog, post-move hooks and link view moves are recorded in
+    
+    SERVICES stands for the process-wide JOURNAL, TRANSACTIONS, CATALOG, HOOKS
+    and LINKS, looked up on every use so shard processes can rebind them. A
+    library Organizer (blamite.py) passes its own to move_files and
+    FileHandler, so organizers never share or close each other's. say is
+    where FileHandler's messages go.
+    """
+    GLOBALS = {'journal': 'JOURNAL', 'transactions': 'TRANSACTIONS', 'catalog': 'CATALOG',
+               'hooks': 'HOOKS', 'links': 'LINKS'}
+    
+    def __init__(self, journal=None, transactions=None, catalog=None, hooks=None, links=None, say=print):
+        self.own = {'journal': journal, 'transactions': transactions, 'catalog': catalog,
+                    'hooks': hooks, 'links': links}
+        self.say = say
+    
+    def __getattr__(self, name):
+        if name not in self.GLOBALS:
+            raise AttributeError(name)
+        own = self.own[name]
+        return globals()[self.GLOBALS[name]] if own is None else own
+
+SERVICES = Services()
+
+def link_files(planned, root_name, kind='backtrack', services=None):
+    """Link a batch of (file_path, destination folder, trace) into the organizer; returns what move_files does"""
+    services = services or SERVICES
+    results, done, links = [], [], []
+    for file_path, dest_folder, trace in planned:
+        try:
+            with trace.span('link', dest=dest_folder.name):
+                ensure_folder(dest_folder)
+                services.links.retire(file_path)
+                dest_path, link_kind = link_file(file_path, dest_folder / file_path.name)
+        except Exception as e:
+            trace.finish('error', error=str(e))
+            ACTIVITY.error(file_path.name, e)
+            results.append((file_path, None, e))
+            continue
+        links.append((file_path, dest_path, link_kind))
+        done.append((file_path, dest_path))
+        ACTIVITY.moved(file_path, dest_path)
+        METRICS.incr(f'links_{link_kind}', root=root_name)
+        trace.finish('organized')
+        results.append((file_path, dest_path, None))
+    services.links.record(links)
+    services.catalog.record_many(done, 'link', root_name)
+    services.hooks.submit_many(done, kind, root_name)
+    return results
+
+def move_files(planned, root_name, mover, kind='backtrack', services=None):
+    """Move a batch of (file_path, destination folder, trace); returns (file_path, dest_path, error) per file
+    
+    The engine behind backtracks and the library API: moves are grouped by
+    destination, journaled with one fsync, renamed through the mover and
+    recorded in the transaction log and the catalog (those of services, by
+    default the process-wide ones). With organize_mode=link the files are
+    linked instead (link_files) and stay where they are.
+    """
+    services = services or SERVICES
+    if services.links.enabled:
+        return link_files(planned, root_name, kind, services)
+    results = []
+    moves = []
+    for file_path, dest_folder, trace in sorted(planned, key=lambda item: str(item[1])):
+        try:
+            with trace.span('name_resolution'):
+                ensure_folder(dest_folder)
+                moves.append((file_path, mover.reserve(dest_folder, file_path.name), trace))
+        except Exception as e:
+            trace.finish('error', error=str(e))
+            results.append((file_path, None, e))
+    services.journal.intents([(file_path, dest_path) for file_path, dest_path, _ in moves], root_name)
+    done = []
+    for file_path, dest_path, trace in moves:
+        try:
+            with trace.span('move', dest=dest_path.parent.name):
+                dest_path = mover.move(file_path, dest_path)
+        except Exception as e:
+            if getattr(e, 'errno', None) == errno.ENOSPC:
+                FREE_SPACE.mark_full(dest_path.parent)
+            services.journal.finish(file_path, 'error')
+            trace.finish('error', error=str(e))
+            ACTIVITY.error(file_path.name, e)
+            results.append((file_path, None, e))
+            continue
+        services.transactions.record(kind, file_path, dest_path)
+        services.journal.finish(file_path, 'organized')
+        ACTIVITY.moved(file_path, dest_path)
+        done.append((file_path, dest_path))
+        METRICS.incr(f'{kind}_organized', root=root_name)
+        trace.finish('organized')
+        results.append((file_path, dest_path, None))
+    services.catalog.record_many(done, kind, root_name)
+    services.hooks.submit_many(done, kind, root_name)
+    return results
+
+def organize_existing_files(folder_path, settings, root=None, since=None, handler=None, until=None, stop=None):
+    """Organize existing files based on user settings
+    
+    The overflow rescan passes since (only files changed after it count) and
+    handler, which queues the files for the live pipeline instead of moving
+    them right away, so downloads still in progress get the stability wait.
+    A backtrack running next to the watcher passes until: files changed after
+    it are left to the watcher. Once stop (a threading.Event) is set, no more
+    files are planned and the ones planned but not yet moved are left alone.
+    """
+    folder = Path(folder_path)
+    services = handler.services if handler is not None else SERVICES
+    say = services.say
+    subfolders = root.subfolders if root is not None else SUBFOLDERS
+    root_name = root.name if root is not None else folder.name
+    if not folder.exists():
+        say(f"⚠️  Folder {folder} does not exist, skipping backtrack...")
+        return
+    
+    if since is not None:
+        say(f"🔍 Rescanning {folder.name} for files changed since {since:%H:%M:%S}...")
+        cutoff_date = since
+    elif settings['backtrack_all_files']:
+        say(f"🔍 Scanning {folder.name} for ALL files (ignoring date)...")
+        cutoff_date = None
+    else:
+        days_back = settings['backtrack_days']
+        say(f"🔍 Scanning {folder.name} for files from the last {days_back} days...")
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+    
+    organized_count = 0
+    planned = []  # (file_path, destination folder, trace) waiting for the next batch of moves
+    
+    def move_planned(mover):
+        moved = 0
+        for file_path, dest_path, error in move_files(planned, root_name, mover):
+            if error is None:
+                say(f"✅ Organized: {file_path.name} → {dest_path.parent.name}")
+                moved += 1
+            else:
+                say(f"❗ Error processing {file_path.name}: {error}")
+        planned.clear()
+        return moved
+    
+    # Get all files in the folder (not directories)
+    try:
+        if root is not None and root.recursive and folder == root.source:
+            files = list(root.iter_files())
+        else:
+            files = [f for f in folder.iterdir() if f.is_file()]
+        say(f"📂 Found {len(files)} files to check in {folder.name}")
+        
+        with DirectoryMover(root_name) as mover:
+            for file_path in files:
+                if stop is not None and stop.is_set():
+                    for _, _, trace in planned:
+                        trace.finish('stopped')
+                    planned.clear()
+                    break
+                trace = NULL_TRACE
+                try:
+                    # Skip temporary files, system files and unsupported extensions
+                    ext = organizable_extension(file_path, subfolders)
+                    if ext is None or (services.links.enabled and services.links.linked(file_path)):
+                        continue
+                    
+                    trace = TRACER.start(file_path, 'backtrack' if since is None else 'rescan')
+                    trace.event('event_received')
+                    
+                    # Check if file is recent enough (skip if backtrack_all_files is True)
+                    if cutoff_date is not None or until is not None:
+                        THROTTLE.background.take(IOThrottle.METADATA_COST)
+                        with trace.span('first_stat') as span:
+                            stat = file_path.stat()
+                            span['size'] = stat.st_size
+                        # A rename or copy that keeps the old mtime still updates ctime
+                        changed = stat.st_mtime if since is None else max(stat.st_mtime, stat.st_ctime)
+                        if cutoff_date is not None and datetime.fromtimestamp(changed) < cutoff_date:
+                            trace.finish('too_old')
+                            continue
+                        if until is not None and stat.st_mtime >= until:
+                            trace.finish('left_to_watcher')
+                            continue
+                    
+                    # Get file type description
+                    file_type_desc = {
+                        'pdf': 'PDF', 'doc': 'Word', 'docx': 'Word',
+                        'xls': 'Excel', 'xlsx': 'Excel', 'mp3': 'Audio',
+                        'mp4': 'Video', 'mov': 'Video', 'txt': 'Text',
+                        'png': 'Image', 'jpg': 'Image', 'jpeg': 'Image', 'gif': 'Image'
+                    }.get(ext, ext.upper())
+                    
+                    say(f"📋 Found recent {file_type_desc} file: {file_path.name}")
+                    
+                    if handler is not None:
+                        METRICS.incr('rescan_found', root=root_name)
+                        handler.enqueue(root, file_path, trace, 'rescan')
+                        organized_count += 1
+                        continue
+                    
+                    dest_folder = root.folder_for(ext, file_path) if root is not None else subfolders[ext]
+                    planned.append((file_path, dest_folder, trace))
+                    if len(planned) >= BACKTRACK_BATCH:
+                        organized_count += move_planned(mover)
+                    
+                except Exception as e:
+                    say(f"❗ Error processing {file_path.name}: {e}")
+                    trace.finish('error', error=str(e))
+                    continue
+            
+            organized_count += move_planned(mover)
+        
+        if organized_count > 0 and handler is not None:
+            say(f"🔁 Queued {organized_count} missed files from {folder.name}")
+        elif organized_count > 0:
+            say(f"🎉 Organized {organized_count} files from {folder.name}")
+        else:
+            say(f"ℹ️  No recent supported files found in {folder.name}")
+            
+    except Exception as e:
+        say(f"❗ Error scanning {folder}: {e}")
+
+def backtrack_and_organize(settings, roots=None, until=None, stop=None):
+    """Organize existing files from Downloads based on user settings
+    
+    With fast start this runs after the watcher is up; until (a timestamp)
+    leaves files that changed since then to the watcher, and stop (a
+    threading.Event) ends the backtrack early when the organizer shuts down.
+    """
+    roots = roots or [default_root()]
+    if not settings['backtrack_enabled']:
+        print("\n" + "="*50)
+        print("⏭️  BACKTRACKING DISABLED (check settings to enable)")
+        print("="*50)
+        return
+    
+    source_desc = "Downloads" if len(roots) == 1 else f"{len(roots)} watched folders"
+    print("\n" + "="*50)
+    if settings['backtrack_all_files']:
+        print(f"🔄 BACKTRACKING: Organizing ALL files from {source_desc}")
+    else:
+        print(f"🔄 BACKTRACKING: Organizing files from {source_desc} (last {settings['backtrack_days']} days)")
+    print("="*50)
+    
+    # Only check the watched source folders to avoid conflicts with Desktop organization
+    txn = TRANSACTIONS.begin('backtrack')
+    try:
+        for root in roots:
+            if stop is not None and stop.is_set():
+                break
+            if root.source.exists():
+                organize_existing_files(root.source, settings, root, until=until, stop=stop)
+            else:
+                print(f"⚠️  {root.source} does not exist, skipping...")
+    finally:
+        TRANSACTIONS.end(txn)
+    if txn is not None and txn.moves:
+        print(f"↩️  Moved {txn.moves} files (undo with: python main.py --undo {txn.id})")
+    
+    if stop is not None and stop.is_set():
+        print("⏹️  Backtracking stopped early")
+        return
+    print("="*50)
+    print("✅ Backtracking complete! Now monitoring Downloads folder...")
+    print("="*50 + "\n")
+
+# Exit codes of --once
+EXIT_OK = 0
+EXIT_FILE_ERRORS = 1  # Some files could not be moved
+EXIT_USAGE = 2  # Bad arguments (argparse uses 2 as well)
+EXIT_FOLDER_ERRORS = 3  # Some folders could not be scanned
+
+def organize_folder_once(folder, destination, settings, cutoff, dry_run):
+    """Organize one folder for --once; returns its summary entry"""
+    start = time.perf_counter()
+    entry = {'path': str(folder), 'scanned': 0, 'matched': 0, 'too_old': 0, 'organized': 0, 'bytes': 0,
+             'failed': 0, 'failures': [], 'error': None}
+    rules = {ext: destination / name for ext, name in SUBFOLDER_NAMES.items()}
+    root = WatchRoot(folder.name or str(folder), folder, destination, rules, **recursive_options(settings))
+    planned, sizes = [], {}
+    
+    def flush(mover):
+        for file_path, dest_path, error in move_files(planned, root.name, mover, 'once'):
+            if error is None:
+                entry['organized'] += 1
+                entry['bytes'] += sizes.pop(file_path, 0)
+            else:
+                entry['failed'] += 1
+                entry['failures'].append({'path': str(file_path), 'error': str(error)})
+        planned.clear()
+    
+    try:
+        with THROTTLE.background_priority(), DirectoryMover(root.name) as mover:
+            for file_path in root.iter_files():
+                entry['scanned'] += 1
+                ext = organizable_extension(file_path, rules)
+                if ext is None:
+                    continue
+                try:
+                    stat = file_path.stat()
+                except OSError:
+                    continue  # Gone since the listing
+                if cutoff is not None and stat.st_mtime < cutoff:
+                    entry['too_old'] += 1
+                    continue
+                entry['matched'] += 1
+                if dry_run:
+                    entry['bytes'] += stat.st_size
+                    continue
+                sizes[file_path] = stat.st_size
+                planned.append((file_path, rules[ext], NULL_TRACE))
+                if len(planned) >= BACKTRACK_BATCH:
+                    flush(mover)
+            flush(mover)
+    except OSError as e:
+        entry['error'] = str(e)
+    entry['duration_s'] = round(time.perf_counter() - start, 3)
+    return entry
+
+def organize_once(folders, settings, destination=None, jobs=8, dry_run=False, summary_path=None):
+    """Non-interactive sweep of folders (--once); writes a JSON summary and returns an exit code
+    
+    Folders are organized in parallel, --jobs at a time, into destination
+    with the built-in rules. No prompt, no update check and no watcher. The
+    moves are one transaction, so --undo reverts the whole sweep.
+    """
+    # With the summary on stdout, progress goes to stderr so the JSON stays parseable
+    out = sys.stderr if summary_path == '-' else sys.stdout
+    destination = Path(destination).expanduser() if destination else ORGANIZER
+    if settings['backtrack_all_files']:
+        cutoff, window = None, "all files"
+    else:
+        cutoff = (datetime.now() - timedelta(days=settings['backtrack_days'])).timestamp()
+        window = f"last {settings['backtrack_days']} days"
+    action = "Checking" if dry_run else "Organizing"
+    print(f"🗂️  {action} {len(folders)} folder(s) into {destination} ({window}, {jobs} jobs)", file=out)
+    
+    started = datetime.now()
+    start = time.perf_counter()
+    txn = None if dry_run else TRANSACTIONS.begin('once')
+    entries = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for entry in executor.map(lambda folder: organize_folder_once(Path(folder).expanduser(), destination,
+                                                                          settings, cutoff, dry_run), folders):
+                entries.append(entry)
+                if entry['error']:
+                    print(f"❗ {entry['path']}: {entry['error']}", file=out)
+                elif entry['matched']:
+                    print(f"✅ {entry['path']}: {entry['organized'] if not dry_run else entry['matched']}"
+                          f"{' would be' if dry_run else ''} organized, {entry['failed']} failed", file=out)
+    finally:
+        TRANSACTIONS.end(txn)
+    
+    totals = Counter()
+    for entry in entries:
+        totals.update({key: entry[key] for key in ('scanned', 'matched', 'too_old', 'organized', 'bytes', 'failed')})
+    failed_folders = sum(1 for entry in entries if entry['error'])
+    if failed_folders:
+        exit_code = EXIT_FOLDER_ERRORS
+    elif totals['failed']:
+        exit_code = EXIT_FILE_ERRORS
+    else:
+        exit_code = EXIT_OK
+    summary = {
+        'version': get_current_version(),
+        'started': started.isoformat(timespec='seconds'),
+        'duration_s': round(time.perf_counter() - start, 3),
+        'dry_run': dry_run,
+        'window': window,
+        'destination': str(destination),
+        'folders': len(entries),
+        'failed_folders': failed_folders,
+        **{key: totals[key] for key in ('scanned', 'matched', 'too_old', 'organized', 'failed', 'bytes')},
+        'transaction': txn.id if txn is not None and txn.moves else None,
+        'exit_code': exit_code,
+        'directories': entries,
+    }
+    text = json.dumps(summary, indent=2, ensure_ascii=False)
+    if summary_path == '-':
+        print(text)
+    elif summary_path:
+        Path(summary_path).write_text(text + '\n', encoding='utf-8')
+    print(f"🏁 {totals['organized'] if not dry_run else totals['matched']} files"
+          f"{' would be' if dry_run else ''} organized from {len(entries)} folder(s) in {summary['duration_s']}s, "
+          f"{totals['failed']} failed, {failed_folders} folder(s) unreadable (exit code {exit_code})", file=out)
+    return exit_code
+
+class FileHandler(FileSystemEventHandler):
+    def __init__(self, roots=None, pool=None, services=None):
+        super().__init__()
+        self.services = services or SERVICES  # Journal, transactions, catalog, hooks and links it records in
+        self.say = self.services.say
+        self.roots = list(roots) if roots else [default_root()]
+        self.roots_by_source = {os.path.normcase(str(root.source)): root for root in self.roots}
+        self.max_depth = max(root.max_depth for root in self.roots)
+        self.pool = pool  # WorkerPool, or None to process on the watcher thread
+        # Set when the pool shuts down: downloads still settling are left for the next start
+        self.stopped = pool.stopped if isinstance(pool, WorkerPool) else threading.Event()
+        self.recovery = OverflowRecovery(self)
+        self.on_result = None  # Called with a result dict per handled file (library API)
+    
+    def root_for(self, file_path):
+        """Find the watch root a new file belongs to (None if it should be ignored)"""
+        directory = file_path.parent
+        root = self.roots_by_source.get(os.path.normcase(str(directory)))
+        if root is not None:
+            return root
+        # Files in subfolders of recursive roots
+        for level, ancestor in enumerate(directory.parents, start=1):
+            if level > self.max_depth:
+                break
+            root = self.roots_by_source.get(os.path.normcase(str(ancestor)))
+            if root is not None:
+                return root if root.watches_dir(directory) else None
+        if len(self.roots) == 1 and not self.roots[0].recursive:
+            return self.roots[0]
+        return None
+    
+    def on_created(self, event):
+        if event.is_directory:
+            return
+        
+        file_path = Path(event.src_path)
+        root = self.root_for(file_path)
+        if root is None:
+            return
+        METRICS.incr('events', root=root.name)
+        trace = TRACER.start(file_path, 'live')
+        trace.event('event_received', root=root.name)
+        self.enqueue(root, file_path, trace)
+    
+    def enqueue(self, root, file_path, trace, source='live'):
+        """Hand a file to the worker pool (or process it right here without one)"""
+        self.services.journal.detected(file_path, root.name)
+        if self.pool is not None:
+            self.pool.submit(self, root, file_path, trace, source)
+        else:
+            self.handle(root, file_path, trace)
+    
+    def on_overflow(self, folders, since):
+        """The watcher dropped events for some of these (folder, root) pairs"""
+        self.recovery.overflow(folders, since)
+    
+    def handle(self, root, file_path, trace, ready=None, size=None):
+        """Process one file, recording its outcome in the trace and metrics
+        
+        ready and size are for WorkerPool's two stages (see process_file);
+        a file handed on as 'settled' gets its outcome in the second one.
+        """
+        result = {'path': file_path, 'root': root.name, 'dest': None, 'error': None}
+        outcome = None
+        try:
+            with PROFILER.live():
+                outcome = self.process_file(file_path, trace, root, result, ready, size)
+        except Exception as e:
+            METRICS.incr('error', root=root.name)
+            self.services.journal.finish(file_path, 'error')
+            trace.finish('error', error=str(e))
+            ACTIVITY.error(file_path.name, e)
+            if self.on_result is not None:
+                self.on_result(dict(result, status='error', error=str(e)))
+            raise
+        finally:
+            if outcome != 'settled':
+                ACTIVITY.done(file_path)
+        if outcome == 'settled':
+            return outcome
+        if outcome in ('timeout', 'move_error'):
+            ACTIVITY.error(file_path.name, outcome.replace('_', ' '))
+        METRICS.incr(outcome, root=root.name)
+        if outcome != 'interrupted':
+            self.services.journal.finish(file_path, outcome)
+        trace.finish(outcome)
+        if self.on_result is not None:
+            self.on_result(dict(result, status=outcome))
+        return outcome
+    
+    def wait_until_stable(self, file_path, trace, root):
+        """Poll a download until its size stops changing; returns (size, None) or (None, outcome)"""
+        self.say(f"⏳ Waiting for {file_path.name} to finish downloading...")
+        file_size = -1
+        stable_count = 0
+        
+        for attempt in range(STABILITY_MAX_ATTEMPTS):
+            if self.stopped.is_set():
+                # Left in Downloads with an open journal entry, so the next start picks it up
+                self.say(f"⏹️  Stopped while waiting for {file_path.name}; it will be organized on the next start")
+                return None, 'interrupted'
+            try:
+                with trace.span('stability_poll', attempt=attempt) as span:
+                    # Check if file still exists
+                    if not file_path.exists():
+                        self.say(f"❌ File {file_path.name} no longer exists, skipping...")
+                        return None, 'vanished'
+                    
+                    # Check if file size is stable (not growing = download complete)
+                    current_size = file_path.stat().st_size
+                    span['size'] = current_size
+                if attempt == 0:
+                    trace.event('first_stat', size=current_size)
+                if current_size == file_size:
+                    stable_count += 1
+                    if stable_count >= STABILITY_CHECKS:  # Size stable = download complete
+                        self.say(f"✅ Download complete for {file_path.name} ({current_size} bytes)")
+                        return current_size, None
+                else:
+                    file_size = current_size
+                    stable_count = 0
+                    self.say(f"📥 Still downloading {file_path.name}... ({current_size} bytes)")
+                ACTIVITY.download(file_path, root.name, current_size, stable_count)
+                
+                # Check if file is accessible (not locked by downloader)
+                with trace.span('lock_probe', attempt=attempt) as span:
+                    try:
+                        with open(file_path, 'rb') as f:
+                            f.read(1)  # Try to read 1 byte
+                        span['locked'] = False
+                    except (PermissionError, OSError):
+                        span['locked'] = True
+                if span['locked']:
+                    self.say(f"🔒 File {file_path.name} is locked, waiting... (attempt {attempt + 1}/{STABILITY_MAX_ATTEMPTS})")
+                    self.stopped.wait(LOCKED_RETRY_DELAY)
+                    continue
+                
+                self.stopped.wait(STABILITY_POLL_INTERVAL)
+            
+            except Exception as e:
+                self.say(f"❗ Error checking {file_path.name}: {e}")
+                self.stopped.wait(LOCKED_RETRY_DELAY)
+                continue
+        self.say(f"❌ Timeout waiting for {file_path.name} to finish downloading")
+        return None, 'timeout'
+    
+    def process_file(self, file_path, trace, root=None, result=None, ready=None, settled_size=None):
+        """Wait for a new download to settle and move it; returns the outcome
+        
+        When given, result['dest'] is set to where the file ended up. Once
+        the download has settled, ready(size) may take the file over and
+        queue the move (outcome 'settled'); that second pass passes
+        settled_size and skips the wait.
+        """
+        root = root or self.root_for(file_path)
+        self.say(f"📁 File detected: {file_path.name}")
+        
+        # Skip temporary files and partial downloads
+        if (file_path.name.startswith('.') or 
+            file_path.name.endswith('.tmp') or 
+            file_path.name.endswith('.part') or
+            file_path.name.endswith('.crdownload')):
+            self.say(f"⏭️  Skipping temporary file: {file_path.name}")
+            return 'skipped_temporary'
+        
+        ext = file_path.suffix.lower().lstrip('.')
+        archive_kind = EXTRACTOR.kind(file_path) if EXTRACTOR.enabled else None
+        if ext in root.subfolders or archive_kind:
+            # Get file type description
+            file_type_desc = {
+                'pdf': 'PDF Document',
+                'doc': 'Word Document', 'docx': 'Word Document',
+                'xls': 'Excel File', 'xlsx': 'Excel File',
+                'mp3': 'Audio File', 'txt': 'Text File',
+                'mp4': 'Video File', 'mov': 'Video File',
+                'png': 'Image File', 'jpg': 'Image File', 'jpeg': 'Image File', 'gif': 'Image File'
+            }.get(ext, 'Archive' if archive_kind else f'{ext.upper()} File')
+            
+            self.say(f"📋 {file_type_desc} detected, processing...")
+            # Extracted bundles are kept, in their own folder unless a rule covers them
+            dest_folder = root.subfolders.get(ext) or root.destination / ARCHIVES_FOLDER
+            
+            # Wait for file to finish downloading completely (unless the pool's settle stage already did)
+            if settled_size is None:
+                file_size, outcome = self.wait_until_stable(file_path, trace, root)
+                if outcome is not None:
+                    return outcome
+                # A worker pool ranks the rest (extraction, the move) by the size the download settled at
+                if ready is not None and ready(file_size):
+                    return 'settled'
+            else:
+                file_size = settled_size
+            
+            if archive_kind:
+                with trace.span('extract') as span:
+                    outcome, extracted = EXTRACTOR.extract(file_path, root, archive_kind, self.services)
+                    span['members'] = len(extracted)
+                if outcome != 'extracted':
+                    return outcome
+            
+            # Rules with several folders pick one now that the size is known (links take no space)
+            links = self.services.links
+            if ext in root.pools:
+                dest_folder = root.pools[ext].pick(file_path, 0 if links.enabled else file_size)
+            
+            # organize_mode=link: the file stays where it is and gets a link in its folder
+            if links.enabled:
+                if links.linked(file_path):
+                    return 'skipped_linked'  # Seen again by a rescan
+                with trace.span('link', dest=dest_folder.name):
+                    (_, dest_path, error), = link_files([(file_path, dest_folder, NULL_TRACE)], root.name, 'live',
+                                                        self.services)
+                if error is not None:
+                    self.say(f"❗ Error linking {file_path.name}: {error}")
+                    return 'move_error'
+                if result is not None:
+                    result['dest'] = dest_path
+                self.say(f"🔗 Linked {file_path.name} into {dest_path.parent.name} (it stays in {root.source.name})")
+                return 'organized'
+            
+            # Now move the file (this automatically deletes from source); a full pool folder gets one retry elsewhere
+            for spill in range(2):
+                try:
+                    # Avoid duplicate files in destination
+                    with trace.span('name_resolution'):
+                        ensure_folder(dest_folder)
+                        dest_path = get_unique_destination(dest_folder, file_path.name)
+                    
+                    self.say(f"🚀 Moving {file_path.name} from {root.source.name} to {root.destination.parent.name}/{dest_path.parent.name}")
+                    with trace.span('journal'):
+                        self.services.journal.intent(file_path, dest_path, file_size, root.name)
+                    # The rename either moved the file or raised, so it needs no extra checks
+                    with trace.span('move', dest=dest_path.parent.name, size=file_size):
+                        dest_path = move_file(file_path, dest_path, root.name, None, self.services.journal)
+                    if result is not None:
+                        result['dest'] = dest_path
+                    self.services.transactions.record('live', file_path, dest_path)
+                    self.services.catalog.record(file_path, dest_path, 'live', root.name, file_size)
+                    self.services.hooks.submit(file_path, dest_path, 'live', root.name, file_size)
+                    ACTIVITY.moved(file_path, dest_path, file_size)
+                    METRICS.incr('bytes_moved', file_size, root=root.name)
+                    self.say(f"✅ Successfully moved and organized: {dest_path.name}")
+                    self.say(f"🗑️  File automatically removed from {root.source.name} folder")
+                    if root.destination.parent in dest_path.parents:
+                        self.say(f"📁 File now available in {root.destination.parent.name}: {dest_path.relative_to(root.destination.parent)}")
+                    else:
+                        self.say(f"📁 File now available in {dest_path}")
+                    return 'organized'
+                    
+                except FileNotFoundError:
+                    if file_path.exists():
+                        self.say(f"❗ Error moving {file_path.name}: destination folder {dest_folder} is missing")
+                        _ensured_folders.discard(str(dest_folder))
+                        return 'move_error'
+                    self.say(f"❌ File {file_path.name} disappeared before move")
+                    return 'vanished'
+                except Exception as e:
+                    if getattr(e, 'errno', None) == errno.ENOSPC:
+                        FREE_SPACE.mark_full(dest_folder)
+                        if ext in root.pools and spill == 0 and file_path.exists():
+                            dest_folder = root.pools[ext].pick(file_path, file_size)
+                            self.say(f"💾 No space left for {file_path.name}, trying {dest_folder}")
+                            continue
+                    self.say(f"❗ Error moving {file_path.name}: {e}")
+                    return 'move_error'
+                
+        else:
+            self.say(f"ℹ️  File type '{ext}' not supported, ignoring {file_path.name}")
+            return 'unsupported'
+
+class OverflowRecovery:
+    """Turns dropped watcher events into one targeted rescan per burst
+    
+    Only folders whose mtime moved since the watcher's last complete read
+    are rescanned, by the backtrack scan limited to files changed in that
+    window. Overflows that keep arriving during a burst push the rescan back
+    (up to MAX_DELAY) so a burst costs one reconciliation pass.
+    """
+    SETTLE_DELAY = 2  # Seconds without a new overflow before rescanning
+    MAX_DELAY = 30  # Rescan at least this often during a never-ending burst
+    
+    def __init__(self, handler):
+        self.handler = handler
+        self.lock = threading.Lock()
+        self.pending = {}  # folder -> root
+        self.since = None
+        self.first = None
+        self.timer = None
+    
+    def overflow(self, folders, since):
+        METRICS.incr('overflows')
+        with self.lock:
+            for folder, root in folders:
+                self.pending[folder] = root
+            self.since = since if self.since is None else min(self.since, since)
+            now = time.monotonic()
+            if self.first is None:
+                self.first = now
+            if self.timer is not None:
+                if now - self.first >= self.MAX_DELAY:
+                    return  # Let the scheduled rescan run instead of pushing it back again
+                self.timer.cancel()
+            self.timer = threading.Timer(self.SETTLE_DELAY, self.rescan)
+            self.timer.daemon = True
+            self.timer.start()
+    
+    def rescan(self):
+        """Find files whose events were lost and queue them like new arrivals"""
+        with self.lock:
+            pending, since = self.pending, self.since
+            self.pending, self.since, self.first, self.timer = {}, None, None, None
+        if not pending:
+            return 0
+        changed = []
+        for folder, root in pending.items():
+            try:
+                if os.stat(folder).st_mtime >= since:
+                    changed.append((folder, root))
+            except OSError:
+                continue
+        since = datetime.fromtimestamp(since)
+        self.handler.say(f"🔁 Catching up after dropped events: {len(changed)} of {len(pending)} "
+                         f"folders changed since {since:%H:%M:%S}")
+        METRICS.incr('overflow_rescans')
+        METRICS.incr('overflow_rescan_folders', len(changed))
+        with THROTTLE.background_priority():
+            for folder, root in changed:
+                organize_existing_files(folder, None, root, since=since, handler=self.handler)
+        return len(changed)
+
+# Seconds a queued file may be overtaken by later ones, by where it came from and how big it is
+SOURCE_DELAYS = {'live': 0, 'journal': 2, 'rescan': 5, 'backtrack': 30}
+SIZE_DELAYS = [(10 * 1024 ** 2, 0), (200 * 1024 ** 2, 5), (2 * 1024 ** 3, 15)]  # (up to bytes, delay)
+LARGE_FILE_DELAY = 30
+
+def parse_priority_weights(text):
+    """'pdfs:2,video_files:0.5' -> {'pdfs': 2.0, 'video_files': 0.5}"""
+    weights = {}
+    for item in str(text or '').split(','):
+        folder, _, weight = item.partition(':')
+        try:
+            weights[folder.strip().lower()] = max(0.1, float(weight))
+        except ValueError:
+            if item.strip():
+                print(f"⚠️  Ignoring priority weight '{item.strip()}'")
+    return weights
+
+class PriorityScheduler:
+    """Orders queued files by source, size and destination folder
+    
+    Every file gets a deadline: the time it was queued plus a delay for its
+    source (live downloads first, historical files last) and its size class
+    (documents before multi-GB videos), divided by the weight of the folder
+    it goes to. Workers take the earliest deadline, so a file can only be
+    overtaken by files queued less than its delay after it and nothing
+    starves behind a steady stream of small downloads.
+    """
+    def __init__(self, weights=None, enabled=True):
+        self.weights = weights or {}
+        self.enabled = enabled
+    
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(parse_priority_weights(settings.get('priority_weights')),
+                   settings.get('priority_scheduling', True))
+    
+    def delay(self, root, file_path, source, size=None):
+        """Seconds this file may wait behind files queued after it"""
+        if not self.enabled:
+            return 0
+        if size is None:
+            size = file_size(file_path) or 0
+        size_delay = next((delay for limit, delay in SIZE_DELAYS if size <= limit), LARGE_FILE_DELAY)
+        folder = root.subfolders.get(file_path.suffix.lower().lstrip('.'))
+        weight = self.weights.get(folder.name.lower(), 1) if folder is not None else 1
+        return (SOURCE_DELAYS.get(source, 0) + size_delay) / weight
+
+SETTLE_THREADS_PER_WORKER = 4  # Downloads mostly sleep while they settle, so they get more threads than moves
+
+class WorkerPool:
+    """Shared worker threads that wait for downloads to finish and move them
+    
+    A file goes through two stages, each a heap ordered by the scheduler's
+    deadline with one executor task per entry. Settle threads wait until a
+    download stops growing; only then is its size known, so the move stage
+    ranks it by that size and worker threads do the extraction and move.
+    A large download still in progress never holds a worker that a small
+    finished file could use.
+    """
+    def __init__(self, workers=4, scheduler=None):
+        self.workers = max(1, int(workers))
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='blamite-worker')
+        self.settlers = ThreadPoolExecutor(max_workers=self.workers * SETTLE_THREADS_PER_WORKER,
+                                           thread_name_prefix='blamite-settle')
+        self.scheduler = scheduler or PriorityScheduler(enabled=False)
+        self.lock = threading.Lock()
+        self.heap = []  # Settled files waiting for a worker
+        self.settling = []  # Files waiting for a settle thread
+        self.sequence = 0
+        self.in_flight = set()
+        self.queued = 0
+        self.active = 0
+        self.running = threading.Event()  # Cleared by pause(): queued files wait, files in progress finish
+        self.running.set()
+        self.stopped = threading.Event()  # Set by shutdown(): stability waits give up, moves in progress finish
+        METRICS.register_gauge('queue_depth', lambda: self.queued)
+        METRICS.register_gauge('in_flight', lambda: self.active)
+    
+    def submit(self, handler, root, file_path, trace, source='live', size=None):
+        """Queue a file; repeated events for a file already in progress are dropped
+        
+        Until the download settles only its source and folder count, plus
+        size when the caller already knows it.
+        """
+        key = os.path.normcase(str(file_path))
+        with self.lock:
+            if key in self.in_flight:
+                METRICS.incr('duplicate_events', root=root.name)
+                trace.finish('duplicate_event')
+                return False
+            self.in_flight.add(key)
+        queued_at = time.time()
+        deadline = queued_at + self.scheduler.delay(root, file_path, source, size or 0)
+        with self.lock:
+            self.sequence += 1
+            heapq.heappush(self.settling, (deadline, self.sequence, handler, root, file_path, trace, key,
+                                           queued_at, source))
+            self.queued += 1
+        self.settlers.submit(self._settle)
+        return True
+    
+    def _ready(self, handler, root, file_path, trace, key, source, size):
+        """Queue a settled file for the move stage; False once shutting down (the caller moves it itself)"""
+        queued_at = time.time()
+        deadline = queued_at + self.scheduler.delay(root, file_path, source, size)
+        with self.lock:
+            if self.stopped.is_set():
+                return False
+            self.sequence += 1
+            heapq.heappush(self.heap, (deadline, self.sequence, handler, root, file_path, trace, key,
+                                       queued_at, size))
+            self.queued += 1
+            self.executor.submit(self._run)
+        return True
+    
+    @property
+    def paused(self):
+        return not self.running.is_set()
+    
+    def pause(self):
+        self.running.clear()
+    
+    def resume(self):
+        self.running.set()
+    
+    def _settle(self):
+        self.running.wait()
+        with self.lock:
+            _, sequence, handler, root, file_path, trace, key, queued_at, source = heapq.heappop(self.settling)
+            self.queued -= 1
+            self.active += 1
+        trace.record('queue_wait', queued_at, time.time())
+        outcome = None
+        try:
+            if self.stopped.is_set():
+                trace.finish('interrupted')  # Still journaled as detected, so the next start organizes it
+                return
+            outcome = handler.handle(root, file_path, trace, ready=lambda size: self._ready(
+                handler, root, file_path, trace, key, source, size))
+        except Exception as e:
+            handler.say(f"❗ Error processing {file_path.name}: {e}")
+        finally:
+            with self.lock:
+                self.active -= 1
+                if outcome != 'settled':
+                    self.in_flight.discard(key)
+    
+    def _run(self):
+        self.running.wait()
+        with self.lock:
+            _, sequence, handler, root, file_path, trace, key, queued_at, size = heapq.heappop(self.heap)
+            self.queued -= 1
+            self.active += 1
+        trace.record('move_wait', queued_at, time.time())
+        try:
+            if self.stopped.is_set():
+                trace.finish('interrupted')
+                return
+            handler.handle(root, file_path, trace, size=size)
+        except Exception as e:
+            handler.say(f"❗ Error processing {file_path.name}: {e}")
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.in_flight.discard(key)
+    
+    def shutdown(self, wait=True):
+        """Stop taking files; queued and still-downloading files stay journaled for the next start"""
+        with self.lock:
+            self.stopped.set()
+        self.settlers.shutdown(wait=False, cancel_futures=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.running.set()  # Release workers held by pause() so they can finish
+        if wait:
+            self.settlers.shutdown(wait=True)
+            self.executor.shutdown(wait=True)
+
+SHARD_TIMINGS = ('STABILITY_POLL_INTERVAL', 'STABILITY_CHECKS', 'STABILITY_MAX_ATTEMPTS', 'LOCKED_RETRY_DELAY')
+RELAYED = ('CATALOG', 'TRANSACTIONS', 'HOOKS', 'ACTIVITY')  # Shared state the coordinator owns
+
+def shard_for(file_path, shards):
+    """The shard that organizes file_path: stable across runs and processes, unlike hash()"""
+    from zlib import crc32
+    return crc32(os.path.normcase(str(file_path)).encode('utf-8', 'surrogateescape')) % shards
+
+def shard_journal(index):
+    return JOURNAL_FILE.with_name(f"blamite_journal.shard{index}.jsonl")
+
+class RelayTarget:
+    """Stands in for CATALOG, HOOKS, ... in a shard: every method call is relayed"""
+    def __init__(self, relay, name):
+        self.relay = relay
+        self.name = name
+    
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            args = tuple(str(arg) if isinstance(arg, BaseException) else arg for arg in args)
+            self.relay.send(('call', self.name, method, args, kwargs))
+        return call
+
+class ShardRelay:
+    """A shard's channel back to the coordinator
+    
+    Relayed calls and file results are queued and sent, together with the
+    metric counters that changed and the shard's queue gauges, as one
+    message every FLUSH_INTERVAL or every BATCH entries.
+    """
+    FLUSH_INTERVAL = 0.05
+    BATCH = 256
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.pending = []
+        self.sent = Counter()
+        self.sent_per_root = defaultdict(Counter)
+        self.gauges = None
+        self.stopping = threading.Event()
+        self.thread = None
+    
+    def target(self, name):
+        return RelayTarget(self, name)
+    
+    def send(self, message):
+        with self.lock:
+            self.pending.append(message)
+            full = len(self.pending) >= self.BATCH
+        if full:
+            self.flush()
+    
+    def result(self, result):
+        self.send(('result', result))
+    
+    def flush(self):
+        snapshot = METRICS.snapshot()
+        with self.lock:
+            batch, self.pending = self.pending, []
+            counters = {name: value - self.sent[name] for name, value in snapshot['counters'].items()
+                        if value != self.sent[name]}
+            per_root = {}
+            for root, counts in snapshot['roots'].items():
+                sent = self.sent_per_root[root]
+                changed = {name: value - sent[name] for name, value in counts.items() if value != sent[name]}
+                if changed:
+                    per_root[root] = changed
+                    sent.update(changed)
+            self.sent.update(counters)
+            if counters or snapshot['gauges'] != self.gauges:
+                batch.append(('metrics', counters, per_root, snapshot['gauges']))
+                self.gauges = snapshot['gauges']
+            if not batch:
+                return
+            try:
+                self.conn.send(batch)
+            except OSError:
+                pass  # The coordinator is gone; the task pipe will tell the shard to stop
+    
+    def start(self):
+        def loop():
+            while not self.stopping.wait(self.FLUSH_INTERVAL):
+                self.flush()
+        self.thread = threading.Thread(target=loop, name='blamite-relay', daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.flush()
+        self.conn.close()
+
+def _shard_main(index, roots, settings, timings, tasks, results):
+    """Organize the files the coordinator sends to shard `index` (runs in its own process)"""
+    global CATALOG, TRANSACTIONS, HOOKS, ACTIVITY
+    globals().update(timings)
+    relay = ShardRelay(results)
+    CATALOG, TRANSACTIONS, HOOKS, ACTIVITY = (relay.target(name) for name in RELAYED)
+    THROTTLE.configure(settings)
+    EXTRACTOR.configure(settings)
+    LINKS.configure(settings)
+    if any(root.pools for root in roots):
+        FREE_SPACE.start(settings.get('pool_refresh_seconds', 30))
+    if settings.get('journal_enabled', True):
+        JOURNAL.open(shard_journal(index))
+    pool = WorkerPool(settings.get('worker_threads', 4), PriorityScheduler.from_settings(settings))
+    handler = FileHandler(roots, pool)
+    handler.on_result = relay.result
+    roots_by_name = {root.name: root for root in roots}
+    relay.start()
+    try:
+        while True:
+            try:
+                message = tasks.recv()
+            except (EOFError, OSError):
+                break
+            if message is None:
+                break
+            if message[0] == 'file':
+                _, root_name, path, source = message
+                pool.submit(handler, roots_by_name[root_name], Path(path), NULL_TRACE, source)
+            elif message[0] == 'pause':
+                pool.pause()
+            elif message[0] == 'resume':
+                pool.resume()
+    finally:
+        pool.shutdown(wait=True)
+        JOURNAL.close()
+        relay.stop()
+
+class ShardPool:
+    """Worker processes for when one process is CPU-bound; a drop-in for WorkerPool
+    
+    The coordinator keeps the watcher and the shared state (catalog,
+    transactions, hooks, activity, its own journal's "detected" records).
+    Each file goes to shard shard_for(path), so every event for a path
+    reaches the same process, which waits for it and moves it with its own
+    WorkerPool and journals the move in shard_journal(i). Its relayed calls,
+    results and metric deltas come back in batches over a pipe per shard. A
+    shard that dies is restarted: its journal is recovered and the files it
+    had not reported yet are sent to the new process.
+    """
+    POLL_INTERVAL = 0.5
+    
+    def __init__(self, shards, roots, settings):
+        import multiprocessing
+        self.context = multiprocessing.get_context('spawn')
+        self.shards = max(1, int(shards))
+        self.roots = list(roots)
+        self.settings = dict(settings)
+        self.scheduler = PriorityScheduler.from_settings(settings)  # Shards schedule with their own copy
+        self.lock = threading.Lock()
+        self.outstanding = {}  # normalized path -> (shard, handler, root, file_path, trace, source)
+        self.gauges = [{} for _ in range(self.shards)]
+        self.processes = [None] * self.shards
+        self.tasks = [None] * self.shards
+        self.results = [None] * self.shards
+        self.task_locks = [threading.Lock() for _ in range(self.shards)]
+        self.running = threading.Event()
+        self.running.set()
+        self.stopping = False
+        self.stopped = set()
+        for index in range(self.shards):
+            self._start(index)
+        self.collector = threading.Thread(target=self._collect, name='blamite-shards', daemon=True)
+        self.collector.start()
+        METRICS.register_gauge('queue_depth', lambda: self.queued)
+        METRICS.register_gauge('in_flight', lambda: self.active)
+        METRICS.register_gauge('shards_alive', lambda: sum(p.is_alive() for p in self.processes))
+    
+    def _start(self, index):
+        task_reader, task_writer = self.context.Pipe(duplex=False)
+        result_reader, result_writer = self.context.Pipe(duplex=False)
+        timings = {name: globals()[name] for name in SHARD_TIMINGS}
+        process = self.context.Process(target=_shard_main, name=f'blamite-shard-{index}',
+                                       args=(index, self.roots, self.settings, timings, task_reader, result_writer))
+        process.start()
+        task_reader.close()
+        result_writer.close()
+        self.processes[index], self.tasks[index], self.results[index] = process, task_writer, result_reader
+        if self.paused:
+            self._send(index, ('pause',))
+    
+    def _send(self, index, message):
+        with self.task_locks[index]:
+            try:
+                self.tasks[index].send(message)
+            except OSError:
+                pass  # The shard died; _restart() sends its files again
+    
+    @property
+    def active(self):
+        return sum(gauges.get('in_flight', 0) for gauges in self.gauges)
+    
+    @property
+    def queued(self):
+        with self.lock:
+            return max(0, len(self.outstanding) - self.active)
+    
+    def submit(self, handler, root, file_path, trace, source='live', size=None):
+        """Send a file to its shard; repeated events for a file already in progress are dropped"""
+        key = os.path.normcase(str(file_path))
+        index = shard_for(file_path, self.shards)
+        with self.lock:
+            if key in self.outstanding:
+                METRICS.incr('duplicate_events', root=root.name)
+                trace.finish('duplicate_event')
+                return False
+            self.outstanding[key] = (index, handler, root, file_path, trace, source)
+        self._send(index, ('file', root.name, str(file_path), source))
+        return True
+    
+    @property
+    def paused(self):
+        return not self.running.is_set()
+    
+    def pause(self):
+        self.running.clear()
+        for index in range(self.shards):
+            self._send(index, ('pause',))
+    
+    def resume(self):
+        self.running.set()
+        for index in range(self.shards):
+            self._send(index, ('resume',))
+    
+    def _collect(self):
+        from multiprocessing.connection import wait
+        while len(self.stopped) < self.shards:
+            readers = {conn: index for index, conn in enumerate(self.results) if index not in self.stopped}
+            for conn in wait(list(readers), timeout=self.POLL_INTERVAL):
+                index = readers[conn]
+                try:
+                    batch = conn.recv()
+                except (EOFError, OSError):
+                    # Every message is in; the shard exited or died
+                    conn.close()
+                    self.processes[index].join()
+                    if self.stopping:
+                        self.stopped.add(index)
+                    else:
+                        self._restart(index)
+                    continue
+                for message in batch:
+                    try:
+                        self._apply(index, message)
+                    except Exception as e:
+                        print(f"❗ Shard {index}: could not apply {message[0]}: {e}")
+    
+    def _apply(self, index, message):
+        if message[0] == 'call':
+            _, target, method, args, kwargs = message
+            if target in RELAYED:
+                getattr(globals()[target], method)(*args, **kwargs)
+        elif message[0] == 'result':
+            self._finish(message[1])
+        elif message[0] == 'metrics':
+            _, counters, per_root, gauges = message
+            METRICS.merge(counters, per_root)
+            self.gauges[index] = gauges
+    
+    def _finish(self, result):
+        with self.lock:
+            entry = self.outstanding.pop(os.path.normcase(str(result['path'])), None)
+        if entry is None:
+            return
+        _, handler, root, file_path, trace, _ = entry
+        status = result['status']
+        JOURNAL.finish(file_path, status)
+        if result.get('error'):
+            trace.finish(status, error=result['error'])
+        else:
+            trace.finish(status)
+        on_result = getattr(handler, 'on_result', None)
+        if on_result is not None:
+            on_result(result)
+    
+    def _restart(self, index):
+        METRICS.incr('shard_restarts')
+        self.gauges[index] = {}
+        print(f"⚠️  Shard {index} stopped (exit code {self.processes[index].exitcode}); restarting it")
+        if self.settings.get('journal_enabled', True):
+            JOURNAL.recover(shard_journal(index))
+        self.tasks[index].close()
+        self._start(index)
+        with self.lock:
+            lost = [entry for entry in self.outstanding.values() if entry[0] == index]
+        for _, handler, root, file_path, trace, source in lost:
+            if file_path.exists():
+                self._send(index, ('file', root.name, str(file_path), source))
+            else:
+                self._finish({'path': file_path, 'root': root.name, 'dest': None, 'error': None,
+                              'status': 'vanished'})
+    
+    def shutdown(self, wait=True):
+        """Stop the shards; queued files are dropped, files in progress finish first
+        
+        Shards are not daemon processes, so even without wait the interpreter
+        only exits once they have finished.
+        """
+        self.stopping = True
+        self.running.set()
+        for index in range(self.shards):
+            self._send(index, None)
+        if wait:
+            self.collector.join()
+
+class SharedInotifyWatcher:
+    """Watches many roots through one inotify instance and one reader thread
+    
+    watchdog's Observer opens an inotify instance and a thread per scheduled
+    folder, which hits fs.inotify.max_user_instances (often 128) long before
+    thousands of roots. Here each folder costs one watch descriptor, and only
+    the events the organizer acts on are requested from the kernel.
+    
+    Subfolders of recursive roots are registered lazily: new folders when
+    they appear, existing ones by a background walk after startup, so the
+    number of folders never delays the first watch.
+    
+    The instance is read directly (not through watchdog's Inotify, which
+    discards it) so IN_Q_OVERFLOW is seen: when a burst overflows the kernel
+    queue, the handler is told which folders may have lost events.
+    """
+    READ_BUFFER = 256 * 1024  # Drain the kernel queue in big reads during bursts
+    OVERFLOW_SLACK = 2  # Seconds subtracted from the last complete read for the rescan window
+    
+    def __init__(self, event_handler, roots):
+        import ctypes
+        from watchdog.observers.inotify_c import (InotifyConstants, inotify_add_watch,
+                                                  inotify_init, inotify_rm_watch)
+        
+        self.handler = event_handler
+        self.say = getattr(event_handler, 'say', print)  # A library Organizer logs instead
+        self.roots = [root for root in roots if root.source.is_dir()]
+        if not self.roots:
+            raise OSError(errno.ENOENT, "None of the watch roots exist")
+        self.constants = InotifyConstants
+        self._add_watch, self._rm_watch = inotify_add_watch, inotify_rm_watch
+        self._errno = ctypes.get_errno
+        self.mask = (InotifyConstants.IN_CREATE | InotifyConstants.IN_MOVED_FROM |
+                     InotifyConstants.IN_MOVED_TO | InotifyConstants.IN_DELETE_SELF |
+                     InotifyConstants.IN_MOVE_SELF)
+        self.fd = inotify_init()
+        if self.fd == -1:
+            error = self._errno()
+            raise OSError(error, os.strerror(error))
+        self.wake_r, self.wake_w = os.pipe()
+        self.lock = threading.Lock()
+        self.dirs = {}  # watched folder (bytes) -> (root, depth below root, watch descriptor)
+        self.paths = {}  # watch descriptor -> watched folder
+        self.limit_reached = False
+        for root in self.roots:
+            if not self._watch(os.fsencode(str(root.source)), root, 0):
+                if self.limit_reached:
+                    break
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='blamite-inotify', daemon=True)
+        self.warmup_thread = None
+        self.overflows = 0
+        METRICS.register_gauge('watched_folders', lambda: len(self.dirs))
+    
+    def _watch(self, path, root, depth):
+        """Add one watch; returns False if it could not be added"""
+        if self.limit_reached:
+            return False
+        wd = self._add_watch(self.fd, path, self.mask)
+        if wd == -1:
+            error = self._errno()
+            if error == errno.ENOSPC:
+                self.limit_reached = True
+                self.say(f"⚠️  inotify watch limit reached after {len(self.dirs)} folders "
+                         f"(raise fs.inotify.max_user_watches)")
+            elif error not in (errno.ENOENT, errno.ENOTDIR):
+                self.say(f"⚠️  Cannot watch {os.fsdecode(path)}: {os.strerror(error)}")
+            return False
+        with self.lock:
+            self.dirs[path] = (root, depth, wd)
+            self.paths[wd] = path
+        return True
+    
+    def _forget(self, path):
+        """Stop watching a folder that was moved away, and everything below it"""
+        prefix = path + os.sep.encode()
+        with self.lock:
+            gone = [folder for folder in self.dirs if folder == path or folder.startswith(prefix)]
+            for folder in gone:
+                wd = self.dirs.pop(folder)[2]
+                if self.paths.get(wd) == folder:
+                    del self.paths[wd]
+                    self._rm_watch(self.fd, wd)
+    
+    def _add_subfolder(self, path, scan_files):
+        """Watch a subfolder of a recursive root if its depth and name allow it"""
+        with self.lock:
+            parent = self.dirs.get(os.path.dirname(path))
+        if parent is None:
+            return
+        root, depth = parent[0], parent[1]
+        if not root.recursive or not root.watches_dir(Path(os.fsdecode(path))):
+            return
+        if path in self.dirs or not self._watch(path, root, depth + 1):
+            return
+        # Anything written before the watch existed (e.g. unzip, mkdir -p) is picked up here
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                self._add_subfolder(entry.path, scan_files)
+            elif scan_files and entry.is_file(follow_symlinks=False):
+                self._dispatch(entry.path)
+    
+    def _warm_up(self, scan_files=False):
+        # Register folders that already existed at startup without blocking it
+        # (after an overflow, folders whose creation was missed are registered and scanned)
+        for root in self.roots:
+            if not root.recursive:
+                continue
+            pending = [os.fsencode(str(root.source))]
+            registered = 0
+            while pending and not self.stopped.is_set() and not self.limit_reached:
+                path = pending.pop()
+                try:
+                    entries = [e.path for e in os.scandir(path) if e.is_dir(follow_symlinks=False)]
+                except OSError:
+                    continue
+                for sub in entries:
+                    if sub in self.dirs:
+                        pending.append(sub)
+                        continue
+                    if scan_files:
+                        self._add_subfolder(sub, scan_files=True)
+                        continue
+                    with self.lock:
+                        parent = self.dirs.get(os.path.dirname(sub))
+                    if parent is None or not parent[0].watches_dir(Path(os.fsdecode(sub))):
+                        continue
+                    if self._watch(sub, parent[0], parent[1] + 1):
+                        pending.append(sub)
+                        registered += 1
+                        if registered % 500 == 0:
+                            time.sleep(0.01)  # stay out of the way of live events
+    
+    def _dispatch(self, path):
+        try:
+            self.handler.on_created(FileCreatedEvent(os.fsdecode(path)))
+        except Exception as e:
+            self.say(f"❗ Error handling {os.fsdecode(path)}: {e}")
+    
+    def _overflow(self, since):
+        """The kernel dropped events: rescan what may have been missed"""
+        self.overflows += 1
+        if self.overflows == 1:
+            self.say("⚠️  Too many changes at once, the inotify queue overflowed "
+                     "(raise fs.inotify.max_queued_events); catching up with a rescan")
+        if any(root.recursive for root in self.roots) and not (
+                self.warmup_thread and self.warmup_thread.is_alive()):
+            self.warmup_thread = threading.Thread(target=self._warm_up, args=(True,),
+                                                  name='blamite-warmup', daemon=True)
+            self.warmup_thread.start()
+        on_overflow = getattr(self.handler, 'on_overflow', None)
+        if on_overflow is not None:
+            with self.lock:
+                folders = [(Path(os.fsdecode(path)), info[0]) for path, info in self.dirs.items()]
+            on_overflow(folders, since - self.OVERFLOW_SLACK)
+    
+    def _read(self):
+        """Block for the next batch of events; yields (wd, mask, cookie, path)"""
+        readable, _, _ = select.select([self.fd, self.wake_r], [], [])
+        if self.stopped.is_set() or self.fd not in readable:
+            return []
+        data = os.read(self.fd, self.READ_BUFFER)
+        events = []
+        offset = 0
+        while offset + 16 <= len(data):
+            wd, mask, cookie, length = struct.unpack_from('iIII', data, offset)
+            name = data[offset + 16:offset + 16 + length].rstrip(b'\0')
+            offset += 16 + length
+            folder = self.paths.get(wd)
+            path = os.path.join(folder, name) if folder is not None and name else folder
+            events.append((wd, mask, cookie, path))
+        return events
+    
+    def start(self):
+        self.thread.start()
+        if any(root.recursive for root in self.roots):
+            self.warmup_thread = threading.Thread(target=self._warm_up, name='blamite-warmup', daemon=True)
+            self.warmup_thread.start()
+    
+    def _run(self):
+        c = self.constants
+        last_read = time.time()
+        try:
+            while not self.stopped.is_set():
+                try:
+                    events = self._read()
+                except OSError as e:
+                    self.say(f"❗ inotify read failed: {e}")
+                    break
+                previous, last_read = last_read, time.time()
+                for wd, mask, cookie, path in events:
+                    if mask & c.IN_Q_OVERFLOW:
+                        self._overflow(previous)
+                    elif path is None:
+                        continue  # Late event for a folder that is no longer watched
+                    elif mask & c.IN_IGNORED:
+                        with self.lock:
+                            if self.paths.get(wd) == path:
+                                del self.paths[wd]
+                                self.dirs.pop(path, None)
+                    elif mask & (c.IN_DELETE_SELF | c.IN_MOVE_SELF):
+                        info = self.dirs.get(path)
+                        if info is not None and info[1] == 0 and not os.path.isdir(path):
+                            self.say(f"⚠️  Watched folder {os.fsdecode(path)} was removed or moved")
+                            self._forget(path)
+                    elif mask & c.IN_ISDIR:
+                        if mask & c.IN_MOVED_FROM:
+                            self._forget(path)
+                        elif mask & (c.IN_CREATE | c.IN_MOVED_TO):
+                            self._add_subfolder(path, scan_files=True)
+                    elif mask & (c.IN_CREATE | c.IN_MOVED_TO):
+                        self._dispatch(path)
+        finally:
+            for fd in (self.fd, self.wake_r, self.wake_w):
+                os.close(fd)
+    
+    def stop(self):
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        try:
+            os.write(self.wake_w, b'!')
+        except OSError:
+            pass  # The reader already exited and closed the pipe
+    
+    def join(self, timeout=None):
+        self.thread.join(timeout)
+
+class PollingWatcher:
+    """Watches roots on network shares by diffing folder snapshots
+    
+    SMB and NFS mounts never deliver change notifications for files written
+    by other machines, so these roots are polled. Each folder's snapshot maps
+    names to (inode, size, mtime); a folder is only listed again when its own
+    mtime changed, so an idle poll costs one stat per folder. The interval
+    drops to the minimum after activity and backs off while idle, and a
+    periodic full rescan catches changes hidden by server attribute caching.
+    """
+    FULL_RESCAN_INTERVAL = 300  # Seconds between rescans that ignore folder mtimes
+    RACY_WINDOW_NS = 2_000_000_000  # Folder mtimes this recent may hide a later change
+    
+    def __init__(self, event_handler, roots, min_interval=1, max_interval=30):
+        self.handler = event_handler
+        self.say = getattr(event_handler, 'say', print)
+        self.roots = list(roots)
+        self.min_interval = max(min_interval, 0.01)
+        self.max_interval = max(max_interval, self.min_interval)
+        self.interval = self.min_interval
+        self.dirs = {}  # folder -> [root, depth, folder mtime_ns, {name: (inode, size, mtime_ns, is_dir)}]
+        self.offline = set()  # roots whose source folder is currently unreachable
+        self.last_full_scan = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='blamite-poll', daemon=True)
+        METRICS.register_gauge('polled_folders', lambda: len(self.dirs))
+        METRICS.register_gauge('poll_interval_s', lambda: round(self.interval, 2))
+    
+    def _list(self, path):
+        """Snapshot one folder: name -> (inode, size, mtime_ns, is_dir)"""
+        entries = {}
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        entries[entry.name] = (entry.inode(), 0, 0, True)
+                    else:
+                        # st_ino is 0 on Windows, so moves there show up as delete + create
+                        st = entry.stat(follow_symlinks=False)
+                        entries[entry.name] = (st.st_ino, st.st_size, st.st_mtime_ns, False)
+                except OSError:
+                    continue
+        return entries
+    
+    def _scan(self, path, root, depth, changes, baseline, full):
+        """Re-list a folder if it changed and collect what happened in it"""
+        state = self.dirs.get(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            if depth == 0:
+                if root not in self.offline:
+                    self.offline.add(root)
+                    self.say(f"⚠️  {root.source} is unreachable, will keep polling")
+            else:
+                self._forget(path)
+            return
+        if depth == 0:
+            if root in self.offline:
+                self.offline.discard(root)
+                self.say(f"✅ {root.source} is reachable again")
+            # A root's first listing (at startup or once its share is mounted) is the baseline
+            baseline = baseline or state is None
+        if state is not None and state[2] == mtime and not full:
+            return
+        try:
+            entries = self._list(path)
+        except OSError:
+            if depth and not os.path.isdir(path):
+                self._forget(path)
+            return  # Otherwise keep the old snapshot rather than report everything as deleted
+        old = state[3] if state else {}
+        racy = 0 <= time.time_ns() - mtime < self.RACY_WINDOW_NS
+        self.dirs[path] = [root, depth, None if racy else mtime, entries]
+        
+        for name, info in entries.items():
+            before = old.get(name)
+            child = os.path.join(path, name)
+            if before is None or before[0] != info[0] or before[3] != info[3]:
+                if not baseline:
+                    changes['created'].append((child, info[0], info[3]))
+                if info[3] and root.recursive and root.watches_dir(Path(child)):
+                    self._scan(child, root, depth + 1, changes, baseline, full)
+            elif not info[3] and before[1:3] != info[1:3] and not baseline:
+                changes['modified'].append(child)
+        for name, before in old.items():
+            info = entries.get(name)
+            if info is None or info[0] != before[0] or info[3] != before[3]:
+                changes['deleted'].append((os.path.join(path, name), before[0], before[3]))
+    
+    def _forget(self, path):
+        """Drop a vanished folder and everything below it from the snapshot"""
+        prefix = path + os.sep
+        for folder in [folder for folder in self.dirs if folder == path or folder.startswith(prefix)]:
+            del self.dirs[folder]
+    
+    def poll(self, baseline=False, full=False):
+        """Run one poll and dispatch its events; returns the number of changes"""
+        changes = {'created': [], 'deleted': [], 'modified': []}
+        known = list(self.dirs)
+        for root in self.roots:
+            source = str(root.source)
+            if source not in self.dirs:
+                self._scan(source, root, 0, changes, baseline, full)
+        for path in known:
+            info = self.dirs.get(path)
+            if info is not None:
+                self._scan(path, info[0], info[1], changes, baseline, full)
+        
+        # Pair deletes and creates of the same inode into moves, like native observers report them
+        deleted = {(inode, is_dir): path for path, inode, is_dir in changes['deleted'] if inode}
+        events = []
+        for path, inode, is_dir in changes['created']:
+            src = deleted.pop((inode, is_dir), None) if inode else None
+            if src is not None:
+                events.append((DirMovedEvent if is_dir else FileMovedEvent)(src, path))
+            else:
+                events.append((DirCreatedEvent if is_dir else FileCreatedEvent)(path))
+        moved = {event.src_path for event in events if event.event_type == 'moved'}
+        events[:0] = [(DirDeletedEvent if is_dir else FileDeletedEvent)(path)
+                      for path, inode, is_dir in changes['deleted'] if path not in moved]
+        events.extend(FileModifiedEvent(path) for path in changes['modified'])
+        for event in events:
+            try:
+                self.handler.dispatch(event)
+            except Exception as e:
+                self.say(f"❗ Error handling {event.src_path}: {e}")
+        return len(events)
+    
+    def start(self):
+        self.thread.start()
+    
+    def _run(self):
+        self.poll(baseline=True)
+        self.last_full_scan = time.monotonic()
+        while not self.stopped.wait(self.interval):
+            started = time.monotonic()
+            full = started - self.last_full_scan >= self.FULL_RESCAN_INTERVAL
+            if full:
+                self.last_full_scan = started
+            changed = self.poll(full=full)
+            cost = time.monotonic() - started
+            if changed:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * 1.5, self.max_interval)
+            # Never spend more than about a third of the time polling a slow share
+            self.interval = max(self.interval, cost * 2)
+    
+    def stop(self):
+        self.stopped.set()
+    
+    def join(self, timeout=None):
+        self.thread.join(timeout)
+
+class WatcherGroup:
+    """Stops and joins native and polling watchers together"""
+    def __init__(self, watchers):
+        self.watchers = watchers
+    
+    def stop(self):
+        for watcher in self.watchers:
+            watcher.stop()
+    
+    def join(self, timeout=None):
+        for watcher in self.watchers:
+            watcher.join(timeout)
+
+# Short codes keep recorded event traces compact
+EVENT_CODES = {
+    'created': 'c', 'modified': 'm', 'moved': 'v', 'deleted': 'd',
+    'opened': 'o', 'closed': 'x', 'closed_no_write': 'n'
+}
+
+class EventRecorder(FileSystemEventHandler):
+    """Records the raw watchdog event stream and file growth to a gzipped JSONL trace
+    
+    Line formats:
+      {"type": "header", "version": 1, ...}   once, at the top
+      {"p": id, "path": "relative/name"}       first time a path is seen
+      [ms, code, path_id, is_dir, size]        one event (moves add the destination path id)
+    """
+    def __init__(self, trace_path, root, anonymize=False):
+        self.trace_path = Path(trace_path)
+        self.root = Path(root)
+        self.anonymize = anonymize
+        self.lock = threading.Lock()
+        self.paths = {}
+        self.last_size = {}
+        self.count = 0
+        self.started = time.monotonic()
+        self.last_flush = self.started
+        import gzip
+        self.file = gzip.open(self.trace_path, 'wt', encoding='utf-8')
+        self._write({
+            'type': 'header', 'version': 1, 'root': str(self.root),
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'platform': sys.platform, 'anonymized': anonymize
+        })
+
+    def _write(self, item):
+        self.file.write(json.dumps(item, separators=(',', ':')) + '\n')
+
+    def _path_id(self, path):
+        try:
+            rel = Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            rel = Path(path).as_posix()
+        if self.anonymize:
+            rel = self._anonymized(rel)
+        if rel not in self.paths:
+            self.paths[rel] = len(self.paths)
+            self._write({'p': self.paths[rel], 'path': rel})
+        return self.paths[rel]
+
+    @staticmethod
+    def _anonymized(rel):
+        """Hash every path component on its own, so a folder keeps one name for all its files"""
+        # Keep the extensions so the organizer classifies replayed files the same way
+        import hashlib
+        parts = []
+        for part in PurePosixPath(rel).parts:
+            if part in ('/', '.', '..'):
+                parts.append(part)
+                continue
+            p = PurePosixPath(part)
+            parts.append(hashlib.sha1(p.stem.encode('utf-8')).hexdigest()[:12] + p.suffix)
+        return PurePosixPath(*parts).as_posix()
+
+    def on_any_event(self, event):
+        code = EVENT_CODES.get(event.event_type)
+        if code is None:
+            return
+        size = None
+        if not event.is_directory and event.event_type != 'deleted':
+            target = event.dest_path if event.event_type == 'moved' else event.src_path
+            try:
+                size = os.stat(target).st_size
+            except OSError:
+                pass
+        now = time.monotonic()
+        with self.lock:
+            if self.file is None:
+                return
+            # Modified events that didn't change the size add nothing to the growth timeline
+            if code == 'm' and size is not None and self.last_size.get(event.src_path) == size:
+                return
+            if code == 'd' or code == 'v':
+                self.last_size.pop(event.src_path, None)
+            else:
+                self.last_size[event.src_path] = size
+            record = [int((now - self.started) * 1000), code,
+                      self._path_id(event.src_path), int(event.is_directory), size]
+            if code == 'v':
+                record.append(self._path_id(event.dest_path))
+            self._write(record)
+            self.count += 1
+            if now - self.last_flush > 1:
+                self.file.flush()
+                self.last_flush = now
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+        print(f"🎞️  Recorded {self.count} events to {self.trace_path}")
+
+def load_event_trace(trace_path):
+    """Read a recorded event trace; returns (header, events with resolved paths)"""
+    import gzip
+    header = {}
+    paths = {}
+    events = []
+    with gzip.open(trace_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                break  # truncated tail of a trace from a process that was killed
+            if isinstance(item, dict):
+                if item.get('type') == 'header':
+                    header = item
+                else:
+                    paths[item['p']] = item['path']
+                continue
+            event = {
+                'ms': item[0], 'type': item[1], 'path': paths[item[2]],
+                'is_dir': bool(item[3]), 'size': item[4]
+            }
+            if len(item) > 5:
+                event['dest'] = paths[item[5]]
+            events.append(event)
+    return header, events
+
+def uses_polling(root, mounts=None):
+    """True if a root must be polled rather than watched natively"""
+    if root.backend == 'polling':
+        return True
+    if root.backend == 'native':
+        return False
+    return is_network_path(root.source, mounts)
+
+def start_observer(event_handler, roots=None, settings=None):
+    """Start watching every root (Downloads by default)
+    
+    Roots on network shares (or with backend "polling") are polled; the rest
+    share one native watcher.
+    """
+    settings = settings or DEFAULT_SETTINGS
+    roots = roots or [default_root(settings)]
+    mounts = read_mounts() if sys.platform.startswith('linux') else None
+    polled = [root for root in roots if uses_polling(root, mounts)]
+    if not polled:
+        return start_native_observer(event_handler, roots)
+    
+    watcher = PollingWatcher(event_handler, polled, settings.get('poll_interval_min', 1),
+                             settings.get('poll_interval_max', 30))
+    watcher.start()
+    say = getattr(event_handler, 'say', print)  # A library Organizer logs instead
+    say(f"🐢 Polling {len(polled)} folder(s) every {watcher.min_interval:g}-{watcher.max_interval:g}s")
+    polled_ids = {id(root) for root in polled}
+    native = [root for root in roots if id(root) not in polled_ids]
+    if not native:
+        return watcher
+    return WatcherGroup([watcher, start_native_observer(event_handler, native)])
+
+def start_native_observer(event_handler, roots):
+    """Watch roots with inotify/FSEvents/ReadDirectoryChangesW"""
+    # FileHandler only needs creations, which the shared watcher delivers (and it notices overflows)
+    if isinstance(event_handler, FileHandler) and sys.platform.startswith('linux'):
+        try:
+            watcher = SharedInotifyWatcher(event_handler, roots)
+            watcher.start()
+            return watcher
+        except (ImportError, OSError) as e:
+            say = getattr(event_handler, 'say', print)
+            say(f"⚠️  Shared inotify watcher unavailable ({e}), using one watch per root")
+    from watchdog.observers import Observer
+    observer = Observer()
+    for root in roots:
+        if root.source.exists():
+            # FileHandler.root_for() applies depth limits and exclusions here
+            observer.schedule(event_handler, str(root.source), recursive=root.recursive)
+    observer.start()
+    return observer
+
+def set_throttle(values, settings):
+    """The 'throttle' runtime command: show or change the bandwidth limits"""
+    if values == ['off']:
+        values = ['0', '0']
+    if values:
+        try:
+            live, background = (float(v) for v in (values * 2)[:2])
+        except ValueError:
+            print("❌ Usage: throttle LIVE_MB BACKGROUND_MB (or 'throttle off')")
+            return
+        settings['io_limit_live_mb'] = f"{live:g}"
+        settings['io_limit_background_mb'] = f"{background:g}"
+        THROTTLE.configure(settings)
+    print(f"🚦 I/O limits: {THROTTLE.describe()}")
+
+DASHBOARD_FPS = 4  # Redraws per second of the live dashboard
+THROUGHPUT_WINDOW = 5  # Seconds of history behind the dashboard's files/s and MB/s
+
+class OutputTail:
+    """Takes sys.stdout's place while the dashboard is up
+    
+    Per-event prints are dropped instead of scrolling the terminal; warnings
+    and errors are kept for the dashboard's message panel.
+    """
+    KEEP = ('⚠️', '❗', '❌', '🔔')
+    encoding = 'utf-8'
+    
+    def __init__(self, lines=4):
+        self.lines = deque(maxlen=lines)
+        self.partial = ''
+        self.lock = threading.Lock()
+    
+    def write(self, text):
+        with self.lock:
+            *complete, self.partial = (self.partial + text).split('\n')
+            for line in complete:
+                if line.lstrip().startswith(self.KEEP):
+                    self.lines.append(line.strip())
+        return len(text)
+    
+    def flush(self):
+        pass
+    
+    def isatty(self):
+        return False
+
+class KeyReader:
+    """Single key presses from the console, without waiting for Enter"""
+    def __init__(self):
+        self.fd = None
+        self.saved = None
+    
+    def __enter__(self):
+        if sys.platform != 'win32' and sys.stdin.isatty():
+            import termios
+            import tty
+            self.fd = sys.stdin.fileno()
+            self.saved = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)  # Ctrl+C still raises KeyboardInterrupt
+        return self
+    
+    def __exit__(self, *exc):
+        if self.saved is not None:
+            import termios
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved)
+            self.saved = None
+    
+    def read(self, timeout):
+        """The next key pressed within timeout seconds, or None"""
+        if sys.platform == 'win32':
+            import msvcrt
+            deadline = time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                if time.monotonic() >= deadline:
+                    return None
+                time.sleep(0.02)
+            return msvcrt.getwch()
+        if self.saved is None:
+            time.sleep(timeout)  # stdin is not a terminal: no keys, just pace the redraws
+            return None
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        return os.read(self.fd, 1).decode(errors='ignore') if readable else None
+
+class Dashboard:
+    """Full-screen status view redrawn DASHBOARD_FPS times a second with ANSI escapes
+    
+    Everything on it is read from METRICS and ACTIVITY when a frame is
+    drawn, so a burst of files costs one redraw per frame rather than a
+    line per event. Keys: p pauses and resumes the workers; other keys
+    (s for settings, q to quit) go to on_key.
+    """
+    KEYS = "[p] pause/resume  [s] settings  [q] quit"
+    
+    def __init__(self, pool=None, on_key=None, fps=DASHBOARD_FPS, metrics=None, activity=None):
+        self.pool = pool
+        self.on_key = on_key
+        self.fps = fps
+        self.metrics = metrics or METRICS
+        self.activity = activity or ACTIVITY
+        self.history = deque()  # (monotonic time, files organized, bytes moved)
+        self.tail = OutputTail()
+        self.out = None
+        self.thread = None
+        self.stop_event = threading.Event()
+    
+    def start(self):
+        if sys.platform == 'win32':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle, mode = kernel32.GetStdHandle(-11), ctypes.c_uint32()
+            if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        self.out, sys.stdout = sys.stdout, self.tail
+        self.out.write("\x1b[?1049h\x1b[?25l")  # Alternate screen, hide the cursor
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name='blamite-dashboard', daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Restore the terminal and normal output; kept warnings are printed"""
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.out.write("\x1b[?25h\x1b[?1049l")
+        self.out.flush()
+        sys.stdout = self.out
+        while self.tail.lines:
+            print(self.tail.lines.popleft())
+    
+    def _loop(self):
+        with KeyReader() as keys:
+            next_frame = time.monotonic()
+            while not self.stop_event.is_set():
+                if time.monotonic() >= next_frame:
+                    self.draw()
+                    next_frame = time.monotonic() + 1 / self.fps
+                key = keys.read(max(0, next_frame - time.monotonic()))
+                if key:
+                    self.press(key.lower())
+    
+    def press(self, key):
+        if key == 'p' and self.pool is not None:
+            if self.pool.paused:
+                self.pool.resume()
+            else:
+                self.pool.pause()
+        elif self.on_key is not None:
+            self.on_key(key)
+    
+    def draw(self):
+        size = shutil.get_terminal_size()
+        try:
+            self.out.write("\x1b[H" + "\x1b[K\n".join(self.render(size.columns, size.lines)) + "\x1b[K\x1b[J")
+            self.out.flush()
+        except (OSError, ValueError):
+            pass  # Terminal went away; the organizer keeps running
+    
+    def render(self, width=80, height=24):
+        """The frame as a list of lines at most width characters wide"""
+        snapshot = self.metrics.snapshot()
+        counters, gauges = snapshot['counters'], snapshot['gauges']
+        downloads, moves, errors = self.activity.snapshot()
+        organized = counters.get('organized', 0) + sum(value for name, value in counters.items()
+                                                       if name.endswith('_organized'))
+        moved_bytes = counters.get('bytes_moved', 0)
+        now = time.monotonic()
+        self.history.append((now, organized, moved_bytes))
+        while len(self.history) > 2 and now - self.history[1][0] >= THROUGHPUT_WINDOW:
+            self.history.popleft()
+        then, organized_then, bytes_then = self.history[0]
+        elapsed = now - then
+        files_rate = (organized - organized_then) / elapsed if elapsed > 0 else 0.0
+        bytes_rate = (moved_bytes - bytes_then) / elapsed if elapsed > 0 else 0.0
+        failed = sum(counters.get(name, 0) for name in ('error', 'move_error', 'timeout', 'extract_error', 'extract_rejected'))
+        state = "⏸  PAUSED" if self.pool is not None and self.pool.paused else "▶ running"
+        
+        lines = [
+            f"BLAMITE Organizer   {datetime.now():%H:%M:%S}   up {timedelta(seconds=int(snapshot['uptime_s']))}   {state}",
+            f"Throughput  {files_rate:.1f} files/s   {format_size(bytes_rate)}/s   "
+            f"organized {organized}   failed {failed}",
+            "Queues      " + "   ".join(f"{name} {value}" for name, value in sorted(gauges.items())),
+        ]
+        # Rows left after the fixed lines go to downloads first, then recent moves
+        room = max(2, height - 17)
+        download_rows = min(len(downloads), max(1, room // 2))
+        lines += ["", f"Downloading ({len(downloads)})"]
+        name_width = max(10, min(40, width - 40))
+        for entry in sorted(downloads, key=lambda entry: -entry['rate'])[:download_rows]:
+            if entry['stable'] == 0:
+                eta = "growing"  # Downloads don't announce their final size
+            else:
+                eta = f"done in ~{max(0, STABILITY_CHECKS - entry['stable']) * STABILITY_POLL_INTERVAL}s"
+            lines.append(f"  {entry['name'][:name_width]:<{name_width}} {format_size(entry['size']):>10} "
+                         f"{format_size(entry['rate']) + '/s':>12}  {eta}")
+        lines += ["", "Recent moves"]
+        for at, name, category, size in list(moves)[-max(1, room - download_rows):][::-1]:
+            lines.append(f"  {datetime.fromtimestamp(at):%H:%M:%S}  {name} → {category}"
+                         + (f" ({format_size(size)})" if size is not None else ""))
+        lines += ["", "Errors"]
+        for at, name, message in errors[-3:][::-1]:
+            lines.append(f"  {datetime.fromtimestamp(at):%H:%M:%S}  {name}: {message}")
+        lines += list(self.tail.lines)[-2:]
+        lines += ["", self.KEYS]
+        return [line[:width] for line in lines[:max(1, height - 1)]]
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="BLAMITE Organizer - organize your Downloads folder")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile startup phases with cProfile and track memory with tracemalloc")
+    parser.add_argument('--profile-dir', default=str(PROFILE_DIR),
+                        help="Where to write .pstats files and memory diffs")
+    parser.add_argument('--profile-interval', type=int, default=300,
+                        help="Seconds between tracemalloc snapshots while running")
+    parser.add_argument('--profile-top', type=int, default=15,
+                        help="Number of allocation sites to list in each memory diff")
+    parser.add_argument('--roots', metavar='FILE',
+                        help="Per-root configuration file (default: blamite_roots.json next to the program)")
+    parser.add_argument('--record-events', metavar='FILE',
+                        help="Record the raw watchdog event stream to FILE for replay_events.py")
+    parser.add_argument('--anonymize', action='store_true',
+                        help="Replace file and folder names with hashes in the recorded event trace")
+    parser.add_argument('--list-transactions', action='store_true',
+                        help="List recorded backtrack runs and live sessions that can be undone")
+    parser.add_argument('--undo', nargs='?', const='last', metavar='TRANSACTION',
+                        help="Move the files of a transaction (default: the latest) back where they came from")
+    parser.add_argument('--once', nargs='+', metavar='FOLDER',
+                        help="Organize these folders once and exit, without prompts or watching ('-' reads "
+                             "folder paths from stdin)")
+    parser.add_argument('--days', type=int, help="With --once: only files modified in the last DAYS days")
+    parser.add_argument('--all-files', action='store_true', help="With --once: ignore the date window")
+    parser.add_argument('--destination', metavar='FOLDER',
+                        help="With --once: organize into FOLDER (default: BLAMITE_Organizer on the Desktop)")
+    parser.add_argument('--summary', metavar='FILE', help="With --once: write a JSON summary to FILE ('-' for stdout)")
+    parser.add_argument('--jobs', type=int, default=8, help="Parallel workers for --undo and folders for --once")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Show what --undo, --once, --compact, --restore or --prune-links would do without changing anything")
+    parser.add_argument('--hooks', metavar='FILE',
+                        help="Post-move hook configuration (default: blamite_hooks.json next to the program)")
+    parser.add_argument('--compact', action='store_true',
+                        help="Compress cold files in the organizer folders now (see compact_* settings)")
+    parser.add_argument('--restore', nargs='?', const='all', metavar='PATH',
+                        help="Decompress compacted files: one file, everything under a folder, or all (default)")
+    parser.add_argument('--prune-links', action='store_true',
+                        help="Remove symbolic links in the organizer folders whose files are gone (organize_mode=link)")
+    parser.add_argument('--dashboard', action='store_true',
+                        help="Show a live status screen (keys: p pause, s settings, q quit) instead of a line per event")
+    parser.add_argument('--shards', type=int, metavar='N',
+                        help="Organize in N worker processes, each with worker_threads threads (default: shards setting)")
+    parser.add_argument('--fast-start', action='store_true',
+                        help="Start watching right away: no Enter prompt, update check and backtrack in the background")
+    parser.add_argument('--find', metavar='QUERY', help="Search the catalog of organized files by name")
+    parser.add_argument('--limit', type=int, default=20, help="Maximum number of --find results")
+    parser.add_argument('--reconcile', action='store_true',
+                        help="Update the catalog after files were moved, deleted or added in the organizer by hand")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    started = time.perf_counter()
+    args = parse_args(argv)
+    if args.list_transactions:
+        list_transactions()
+        return
+    if args.undo:
+        if CATALOG_FILE.exists():
+            CATALOG.open()
+        undo_transaction(args.undo, args.jobs, args.dry_run)
+        CATALOG.close()
+        return
+    if args.once:
+        folders = args.once
+        if folders == ['-']:
+            folders = [line.strip() for line in sys.stdin if line.strip()]
+        settings = load_settings()
+        if args.days is not None:
+            settings.update(backtrack_days=args.days, backtrack_all_files=False)
+        if args.all_files:
+            settings['backtrack_all_files'] = True
+        THROTTLE.configure(settings)
+        LINKS.configure(settings)
+        TRANSACTIONS.open()
+        if settings.get('catalog_enabled', True):
+            CATALOG.open()
+        if not args.dry_run:
+            HOOKS.load(args.hooks)
+        try:
+            return organize_once(folders, settings, args.destination, args.jobs, args.dry_run, args.summary)
+        finally:
+            HOOKS.close()
+            CATALOG.close()
+    if args.compact or args.restore:
+        settings = load_settings()
+        THROTTLE.configure(settings)
+        if settings.get('catalog_enabled', True) and CATALOG_FILE.exists():
+            CATALOG.open()
+        compactor = Compactor(settings)
+        try:
+            if args.restore:
+                compactor.restore(args.restore, args.dry_run)
+            else:
+                compactor.run(load_roots(args.roots, settings), args.dry_run)
+        finally:
+            CATALOG.close()
+        return
+    if args.prune_links:
+        settings = load_settings()
+        if settings.get('catalog_enabled', True) and CATALOG_FILE.exists():
+            CATALOG.open()
+        LINKS.configure(settings)
+        try:
+            LINKS.prune(args.dry_run)
+        finally:
+            CATALOG.close()
+        return
+    if args.find or args.reconcile:
+        CATALOG.open()
+        if args.reconcile:
+            reconcile_catalog(load_roots(args.roots, load_settings()))
+        if args.find:
+            find_files(args.find, args.limit)
+        CATALOG.close()
+        return
+    if args.days is not None or args.all_files or args.destination or args.summary:
+        print("❌ --days, --all-files, --destination and --summary only work with --once", file=sys.stderr)
+        return EXIT_USAGE
+    if args.profile:
+        PROFILER.start(args.profile_dir, args.profile_interval, args.profile_top)
+    
+    # Load user settings
+    with PROFILER.phase('load_settings'):
+        settings = load_settings()
+    configure_tracing(settings)
+    THROTTLE.configure(settings)
+    EXTRACTOR.configure(settings)
+    LINKS.configure(settings)
+    THROTTLE.lower_process_priority()
+    fast_start = args.fast_start or settings.get('fast_start', False)
+    print_banner(fast_start)
+    
+    # Check for updates on startup (on a background thread with fast start, so the network can't hold it up)
+    if fast_start:
+        threading.Thread(target=announce_update, name='blamite-update-check', daemon=True).start()
+    else:
+        announce_update()
+        
+        # Show welcome message and settings option
+        print("\n" + "="*50)
+        print("⚙️  Press 'S' + Enter for Settings, or just Enter to continue...")
+        print("="*50)
+        
+        try:
+            user_input = input().strip().lower()
+            if user_input == 's':
+                settings = show_settings_menu()
+        except KeyboardInterrupt:
+            print("\n👋 Goodbye!")
+            PROFILER.stop()
+            return
+    
+    # Watch Downloads (or every root from blamite_roots.json) and organize to Desktop
+    roots = load_roots(args.roots, settings)
+    
+    # Setup folders (create any missing ones) and backtrack based on settings;
+    # fast start leaves the destination folders to ensure_folder() on the first move
+    if not fast_start:
+        with PROFILER.phase('setup_folders'):
+            setup_folders(roots)
+    
+    # Finish or roll back moves a crash interrupted before anything else touches those files
+    requeue = []
+    if settings.get('journal_enabled', True):
+        with PROFILER.phase('journal_recovery'):
+            requeue = JOURNAL.recover()
+            for path in sorted(JOURNAL_FILE.parent.glob(shard_journal('*').name)):
+                requeue += JOURNAL.recover(path)
+        JOURNAL.open()
+    
+    # Backtrack and organize existing files based on user settings
+    TRANSACTIONS.open()
+    if settings.get('catalog_enabled', True):
+        CATALOG.open()
+    hooks = HOOKS.load(args.hooks)
+    if hooks:
+        print(f"🪝 {hooks} post-move hook{'s' if hooks != 1 else ''} from {Path(args.hooks or HOOKS_FILE).name}")
+    
+    # Links whose downloads were deleted since the last run would otherwise linger in the folders
+    if LINKS.enabled:
+        with PROFILER.phase('prune_links'):
+            LINKS.prune()
+    if not fast_start:
+        with PROFILER.phase('backtrack_and_organize'), THROTTLE.background_priority():
+            backtrack_and_organize(settings, roots)
+    
+    # Record the raw event stream if requested
+    # (own observer, so event timestamps aren't delayed behind FileHandler's waits)
+    recorder = None
+    if args.record_events:
+        recorder = EventRecorder(args.record_events, DOWNLOADS, args.anonymize)
+        recorder_observer = start_observer(recorder, settings=settings)
+        print(f"🎞️  Recording events to {args.record_events}")
+    
+    # Start monitoring for new files
+    # Monitor Downloads folder (don't monitor Desktop to avoid conflicts)
+    shards = args.shards or settings.get('shards', 1)
+    if shards > 1:
+        pool = ShardPool(shards, roots, settings)
+        print(f"🧩 Organizing in {shards} processes with {settings['worker_threads']} threads each")
+    else:
+        pool = WorkerPool(settings['worker_threads'], PriorityScheduler.from_settings(settings))
+    event_handler = FileHandler(roots, pool)
+    observer = start_observer(event_handler, roots, settings)
+    if any(root.pools for root in roots):
+        FREE_SPACE.start(settings.get('pool_refresh_seconds', 30))
+    compactor = Compactor(settings, pool)
+    if settings.get('compaction_enabled', False):
+        compactor.start(roots)
+    
+    live_txn = TRANSACTIONS.begin('live')
+    backtrack_thread, backtrack_stop = None, threading.Event()
+    if fast_start:
+        print(f"👀 Watching for new files ({(time.perf_counter() - started) * 1000:.0f} ms after launch)")
+        
+        def background_backtrack(until):
+            with THROTTLE.background_priority():
+                backtrack_and_organize(settings, roots, until, backtrack_stop)
+        
+        backtrack_thread = threading.Thread(target=background_backtrack, args=(time.time(),),
+                                            name='blamite-backtrack', daemon=True)
+        backtrack_thread.start()
+    
+    # Files that were detected before the last run stopped, without a full backtrack
+    roots_by_name = {root.name: root for root in roots}
+    for file_path, root_name in requeue:
+        root = roots_by_name.get(root_name) or event_handler.root_for(file_path)
+        if root is not None and file_path.exists():
+            event_handler.enqueue(root, file_path, TRACER.start(file_path, 'journal'), 'journal')
+    if len(roots) > 1:
+        print(f"📡 Monitoring {len(roots)} folders from {ROOTS_FILE.name if not args.roots else args.roots}")
+        limits = inotify_limits()
+        if limits.get('max_user_watches') and len(roots) > limits['max_user_watches']:
+            print(f"⚠️  {len(roots)} roots exceed fs.inotify.max_user_watches ({limits['max_user_watches']})")
+    elif roots[0].source.exists():
+        print(f"📡 Monitoring: {roots[0].source}")
+    else:
+        print(f"⚠️  Warning: {roots[0].source} does not exist")
+    
+    print("🚀 BLAMITE Organizer is running...")
+    if len(roots) == 1:
+        print(f"📥 Watching {roots[0].source.name} folder, organizing to {roots[0].destination.parent.name}...")
+        print(f"📁 Organized files location: {roots[0].destination}")
+    print("💡 Type 'settings' + Enter to access Settings, or Ctrl+C to stop...")
+    
+    # Flag to control the input thread
+    running = True
+    settings_requested = False
+    
+    def input_handler():
+        """Handle user input in separate thread"""
         nonlocal running, settings_requested
         while running:
             try:
@@ -819,24 +5714,61 @@ def main():
                 if user_input in ['s', 'settings', 'setting']:
                     settings_requested = True
                     print("\n⚙️  Settings request received... stopping monitor...")
+                elif user_input in ['stats', 'status']:
+                    print_metrics()
+                elif user_input in ['profile', 'p']:
+                    if PROFILER.enabled:
+                        PROFILER.stop()
+                    else:
+                        PROFILER.start(args.profile_dir, args.profile_interval, args.profile_top)
+                elif user_input.split()[:1] == ['find']:
+                    find_files(user_input[4:].strip())
+                elif user_input == 'reconcile':
+                    reconcile_catalog(roots)
+                elif user_input.split()[:1] == ['throttle']:
+                    set_throttle(user_input.split()[1:], settings)
+                elif user_input == 'compact':
+                    threading.Thread(target=compactor.run, args=(roots,), name='blamite-compact-now',
+                                     daemon=True).start()
                 elif user_input in ['help', 'h']:
                     print("\nAvailable commands:")
                     print("  'settings' or 's' - Open settings menu")
+                    print("  'stats' - Show counters for all watched folders")
+                    print("  'profile' or 'p' - Start/stop profiling")
+                    print("  'throttle [LIVE_MB BACKGROUND_MB | off]' - Show or change disk bandwidth limits")
+                    print("  'find QUERY' - Search organized files by name")
+                    print("  'reconcile' - Update the catalog after moving or deleting organized files by hand")
+                    print("  'compact' - Compress cold files in the organizer now (undo with --restore)")
                     print("  'help' or 'h' - Show this help")
                     print("  Ctrl+C - Stop program")
             except (EOFError, KeyboardInterrupt):
                 running = False
                 break
     
-    # Start input handler thread
-    input_thread = threading.Thread(target=input_handler, daemon=True)
-    input_thread.start()
+    def on_key(key):
+        """Dashboard keys other than pause"""
+        nonlocal running, settings_requested
+        if key == 's':
+            settings_requested = True
+        elif key == 'q':
+            running = False
+    
+    # The dashboard takes single keys itself; otherwise commands are typed + Enter
+    dashboard = None
+    if args.dashboard or settings.get('dashboard', False):
+        dashboard = Dashboard(pool, on_key)
+        dashboard.start()
+    else:
+        input_thread = threading.Thread(target=input_handler, daemon=True)
+        input_thread.start()
     
     try:
         while running:
             # Check if user requested settings
             if settings_requested:
                 settings_requested = False
+                if dashboard is not None:
+                    dashboard.stop()
                 
                 print("🛑 Temporarily stopping file monitoring...")
                 observer.stop()
@@ -846,30 +5778,54 @@ def main():
                 print("\n" + "="*50)
                 new_settings = show_settings_menu()
                 settings.update(new_settings)
+                configure_tracing(settings)
+                THROTTLE.configure(settings)
+                EXTRACTOR.configure(settings)
+                LINKS.configure(settings)
+                pool.scheduler = PriorityScheduler.from_settings(settings)
                 
                 # Restart monitoring
                 print("🔄 Restarting file monitoring...")
-                event_handler = FileHandler()
-                observer = Observer()
-                if DOWNLOADS.exists():
-                    observer.schedule(event_handler, str(DOWNLOADS), recursive=False)
-                observer.start()
+                event_handler = FileHandler(roots, pool)
+                observer = start_observer(event_handler, roots, settings)
                 
                 print("\n🚀 BLAMITE Organizer resumed monitoring...")
-                print("💡 Type 'settings' + Enter to access Settings, or Ctrl+C to stop...")
+                if dashboard is not None:
+                    dashboard.start()
+                else:
+                    print("💡 Type 'settings' + Enter to access Settings, or Ctrl+C to stop...")
             
             time.sleep(0.1)  # Small delay to prevent high CPU usage
             
     except KeyboardInterrupt:
-        print("\n🛑 Stopping BLAMITE Organizer...")
         running = False
-        observer.stop()
-    
+    finally:
+        if dashboard is not None:
+            dashboard.stop()
+    print("\n🛑 Stopping BLAMITE Organizer...")
+    backtrack_stop.set()
+    observer.stop()
     observer.join()
+    # Moves in progress must reach the journal, transaction log, catalog and hooks before those close
+    if backtrack_thread is not None and backtrack_thread.is_alive():
+        print("⏳ Waiting for the startup backtrack to finish its current batch...")
+        backtrack_thread.join()
+    pool.shutdown(wait=True)
+    TRANSACTIONS.end(live_txn)
+    compactor.stop()
+    FREE_SPACE.stop()
+    HOOKS.close()
+    JOURNAL.close()
+    CATALOG.close()
+    PROFILER.stop()
+    if recorder is not None:
+        recorder_observer.stop()
+        recorder_observer.join()
+        recorder.close()
     print("✅ BLAMITE Organizer stopped.")
 
-if __name__ == "__main__":
-    # Set terminal title and print welcome message
+def print_banner(short=False):
+    """Set the terminal title and print the welcome message (just the title when short)"""
     title_file = Path(__file__).parent / "BLAMITE_TITLE.txt"
     if title_file.exists():
         with open(title_file, "r", encoding="utf-8") as f:
@@ -877,9 +5833,13 @@ if __name__ == "__main__":
     else:
         project_title = "BLAMITE Organizer"
 
-    # Set terminal title (works on Windows)
-    os.system(f"title {project_title}")
+    # Set terminal title (Windows only; elsewhere it would just spawn a shell that fails)
+    if sys.platform == 'win32':
+        os.system(f"title {project_title}")
 
+    if short:
+        print(project_title)
+        return
     description = (
         f"{project_title}\n"
         "----------------------------------------\n"
@@ -889,5 +5849,9 @@ if __name__ == "__main__":
         "Thank you for using BLAMITE Organizer!\n"
     )
     print(description)
-    
-    main()
+
+if __name__ == "__main__":
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()  # Compactor processes re-run the executable
+    sys.exit(main())
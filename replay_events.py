@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded BLAMITE event trace against the organizer in a sandbox
+
+Record real traffic first:
+    python main.py --record-events downloads_events.jsonl.gz [--anonymize]
+
+Then replay it (speed 1 = real time, 10 = ten times faster, 0 = as fast as possible):
+    python replay_events.py downloads_events.jsonl.gz --speed 10
+    python replay_events.py downloads_events.jsonl.gz --speed 0 --save before.json
+    python replay_events.py downloads_events.jsonl.gz --speed 0 --compare before.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import main
+import analyze_trace
+from benchmark_organizer import compare_results, count_organized, latency_stats, prepare_sandbox, quiet
+
+def resize(path, size, dense):
+    """Grow (or shrink) a file to the recorded size"""
+    with open(path, 'ab') as f:
+        current = f.tell()
+        if size is None or size == current:
+            return
+        if size < current or not dense:
+            f.truncate(size)
+            return
+        remaining = size - current
+        while remaining > 0:
+            chunk = min(remaining, 1024 * 1024)
+            f.write(b'\0' * chunk)
+            remaining -= chunk
+
+def apply_event(root, event, dense):
+    """Recreate one recorded event; returns False if its file was already gone"""
+    path = root / event['path']
+    kind = event['type']
+    if kind in ('o', 'x', 'n'):
+        return True  # open/close carry no filesystem change
+    if event['is_dir']:
+        if kind == 'c':
+            path.mkdir(parents=True, exist_ok=True)
+        elif kind == 'd' and path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+        elif kind == 'v' and path.exists():
+            os.replace(path, root / event['dest'])
+        return True
+    if kind == 'c':
+        path.parent.mkdir(parents=True, exist_ok=True)
+        resize(path, event['size'] or 0, dense)
+        return True
+    if not path.exists():
+        # The organizer already moved it, e.g. before the download really finished
+        return False
+    if kind == 'm':
+        resize(path, event['size'], dense)
+    elif kind == 'v':
+        dest = root / event['dest']
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, dest)
+    elif kind == 'd':
+        path.unlink()
+    return True
+
+def expected_files(events):
+    """Supported files that still exist in Downloads at the end of the trace"""
+    alive = {}
+    for event in events:
+        if event['is_dir']:
+            continue
+        if event['type'] == 'c':
+            alive[event['path']] = True
+        elif event['type'] == 'd':
+            alive.pop(event['path'], None)
+        elif event['type'] == 'v':
+            alive.pop(event['path'], None)
+            alive[event['dest']] = True
+    return [p for p in alive
+            if '/' not in p and Path(p).suffix.lower().lstrip('.') in main.SUBFOLDERS]
+
+def replay(trace_path, speed, poll_interval, dense, settle_timeout, show_output):
+    header, events = main.load_event_trace(trace_path)
+    expected = expected_files(events)
+    duration = events[-1]['ms'] / 1000 if events else 0
+    print(f"🎞️  {len(events):,} events over {duration:.1f}s recorded {header.get('started', '?')} "
+          f"on {header.get('platform', '?')}; {len(expected)} files should end up organized")
+
+    workdir = Path(tempfile.mkdtemp(prefix="blamite_replay_"))
+    saved_paths = (main.DOWNLOADS, main.ORGANIZER)
+    saved_timing = (main.STABILITY_POLL_INTERVAL, main.LOCKED_RETRY_DELAY)
+    try:
+        sandbox, downloads = prepare_sandbox(workdir, "replay")
+        if poll_interval is not None:
+            main.STABILITY_POLL_INTERVAL = poll_interval
+            main.LOCKED_RETRY_DELAY = poll_interval * 2
+        trace_file = sandbox / "trace.jsonl"
+        main.TRACER.configure(True, 100, trace_file, new_run=True)
+        observer = main.start_observer(main.FileHandler())
+
+        vanished = 0
+        max_lag = 0.0
+        start = time.monotonic()
+        print(f"▶️  Replaying at {'max speed' if speed == 0 else f'{speed}x'}...")
+        try:
+            with quiet(not show_output):
+                for event in events:
+                    if speed > 0:
+                        due = start + event['ms'] / 1000 / speed
+                        delay = due - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                        else:
+                            max_lag = max(max_lag, -delay)
+                    try:
+                        if not apply_event(downloads, event, dense):
+                            vanished += 1
+                    except OSError:
+                        vanished += 1
+                replayed = time.monotonic() - start
+
+                deadline = time.monotonic() + settle_timeout
+                while count_organized() < len(expected) and time.monotonic() < deadline:
+                    time.sleep(0.05)
+            elapsed = time.monotonic() - start
+        finally:
+            observer.stop()
+            observer.join()
+            main.TRACER.configure(False)
+
+        organized = count_organized()
+        records = analyze_trace.load_trace(trace_file) if trace_file.exists() else []
+        outcomes = Counter(r.get('outcome') for r in records if r['span'] == 'file')
+        result = {
+            'events': len(events),
+            'recorded_s': round(duration, 3),
+            'replayed_s': round(replayed, 3),
+            'max_lag_ms': round(max_lag * 1000, 1),
+            'supported': len(expected),
+            'organized': organized,
+            'missed': max(0, len(expected) - organized),
+            'events_on_moved_files': vanished,
+            'elapsed_s': round(elapsed, 3),
+            'files_per_s': round(organized / elapsed, 1) if elapsed else 0,
+            'outcomes': dict(outcomes),
+        }
+        result.update(latency_stats(trace_file, main.TRACER.run_id))
+        return header, result
+    finally:
+        main.configure_paths(*saved_paths)
+        main.STABILITY_POLL_INTERVAL, main.LOCKED_RETRY_DELAY = saved_timing
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded BLAMITE event trace")
+    parser.add_argument('trace', help="Trace recorded with main.py --record-events")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Replay speed: 1 = real time, 10 = 10x faster, 0 = as fast as possible")
+    parser.add_argument('--poll-interval', type=float,
+                        help="Override the organizer's stability poll interval (seconds)")
+    parser.add_argument('--dense', action='store_true', help="Write real data instead of sparse growth")
+    parser.add_argument('--settle-timeout', type=float, default=300,
+                        help="Seconds to wait for the organizer after the last event")
+    parser.add_argument('--save', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Compare against results saved from an earlier replay")
+    parser.add_argument('--threshold', type=float, default=15.0)
+    parser.add_argument('--show-output', action='store_true', help="Show the organizer's per-file output")
+    return parser.parse_args(argv)
+
+def main_replay(argv=None):
+    args = parse_args(argv)
+    print("=" * 60)
+    print("🎞️  BLAMITE EVENT REPLAY")
+    print("=" * 60)
+    header, result = replay(args.trace, args.speed, args.poll_interval, args.dense,
+                            args.settle_timeout, args.show_output)
+
+    print("\n📊 Replay results:")
+    for key, value in result.items():
+        print(f"  {key:<22}{value}")
+
+    results = {
+        'trace': str(args.trace),
+        'params': {'speed': args.speed, 'poll_interval': args.poll_interval, 'dense': args.dense},
+        'recorded': header.get('started'),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'version': main.get_current_version(),
+        'live': result,
+    }
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Results saved to {args.save}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\n🔍 Comparing with {args.compare} (threshold {args.threshold}%):")
+        if compare_results(results, baseline, args.threshold):
+            print("\n❌ Replay regressed")
+            return 1
+        print("\n✅ No regressions")
+    return 0 if result['missed'] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main_replay())
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Fault-injection stress harness for BLAMITE Organizer
+
+Runs the live organizer (Observer + FileHandler) against a sandbox while files
+arrive and faults are injected: files locked for random periods, writers that
+pause mid-download and resume, files deleted during the stability check,
+ENOSPC/EACCES on the destination and renames racing with moves.
+
+Every file carries its id in its name, so at the end the harness can tell
+which files were organized, stranded in Downloads, lost or duplicated.
+
+Usage:
+    python stress_organizer.py
+    python stress_organizer.py --files 500 --lock-rate 0.2 --enospc-rate 0.05 --save stress.json
+    python stress_organizer.py --journal --enospc-rate 0.1
+"""
+
+import argparse
+import builtins
+import errno
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import main
+import analyze_trace
+from benchmark_organizer import latency_stats, prepare_sandbox, quiet
+
+EXTENSIONS = ['pdf', 'docx', 'xlsx', 'txt', 'png', 'jpg', 'mp3', 'mp4']
+ID_PATTERN = re.compile(r'(\d{6})')
+
+class FaultInjector:
+    """Replaces the organizer's open() and move functions with faulty versions
+
+    Moves are hooked where main.py makes them: move_file() for live files,
+    rename_noreplace() for the batch renames and copy_across() for copies to
+    another drive. Only the outermost of those calls rolls for a fault, so a
+    live move that goes through all three is counted once.
+    """
+    MOVES = ('move_file', 'rename_noreplace', 'copy_across')
+
+    def __init__(self, rng, enospc_rate, eacces_rate, partial_rate):
+        self.rng = rng
+        self.enospc_rate = enospc_rate
+        self.eacces_rate = eacces_rate
+        self.partial_rate = partial_rate
+        self.locked = {}
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.real = {name: getattr(main, name) for name in self.MOVES}
+        self.inside = threading.local()
+
+    def lock_for(self, path, seconds):
+        """Make the lock probe and moves fail for a while, like a busy downloader"""
+        with self.lock:
+            self.locked[str(path)] = time.monotonic() + seconds
+
+    def is_locked(self, path):
+        with self.lock:
+            until = self.locked.get(str(path))
+            if until is None:
+                return False
+            if time.monotonic() >= until:
+                del self.locked[str(path)]
+                return False
+            return True
+
+    def open(self, file, mode='r', *args, **kwargs):
+        if self.is_locked(file):
+            self.counts['lock_probe_denied'] += 1
+            raise PermissionError(errno.EACCES, "Injected lock", str(file))
+        return builtins.open(file, mode, *args, **kwargs)
+
+    def fault(self, src, dst, src_dir_fd=None, dst_dir_fd=None):
+        """Maybe raise an injected error for a move of src to dst (names relative to the folder fds if given)"""
+        if self.is_locked(src):
+            self.counts['move_locked'] += 1
+            raise PermissionError(errno.EACCES, "Injected lock", str(src))
+        roll = self.rng.random()
+        if roll < self.enospc_rate:
+            self.counts['enospc'] += 1
+            if self.rng.random() < self.partial_rate:
+                # A cross-device copy that runs out of space leaves half a file behind
+                src_fd = os.open(src, os.O_RDONLY, dir_fd=src_dir_fd)
+                try:
+                    dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644, dir_fd=dst_dir_fd)
+                    try:
+                        os.write(dst_fd, os.read(src_fd, max(1, os.fstat(src_fd).st_size // 2)))
+                    finally:
+                        os.close(dst_fd)
+                finally:
+                    os.close(src_fd)
+                self.counts['partial_copy'] += 1
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC), str(dst))
+        if roll < self.enospc_rate + self.eacces_rate:
+            self.counts['eacces'] += 1
+            raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), str(dst))
+
+    def wrap(self, name):
+        real = self.real[name]
+
+        def faulty(src, dst, *args, **kwargs):
+            if getattr(self.inside, 'depth', 0):
+                return real(src, dst, *args, **kwargs)
+            self.inside.depth = 1
+            try:
+                self.fault(src, dst, kwargs.get('src_dir_fd'), kwargs.get('dst_dir_fd'))
+                return real(src, dst, *args, **kwargs)
+            finally:
+                self.inside.depth = 0
+        return faulty
+
+    @contextmanager
+    def installed(self):
+        # main looks up open() and its move helpers in its module globals
+        main.open = self.open
+        for name in self.MOVES:
+            setattr(main, name, self.wrap(name))
+        try:
+            yield
+        finally:
+            for name, real in self.real.items():
+                setattr(main, name, real)
+            del main.open
+
+    def missing(self, params):
+        """Faults that were asked for but never fired, so the run proved nothing about them"""
+        expected = {'enospc_rate': ('enospc',), 'eacces_rate': ('eacces',),
+                    'lock_rate': ('lock_probe_denied', 'move_locked')}
+        return [rate for rate, counters in expected.items()
+                if params[rate] > 0 and not any(self.counts[c] for c in counters)]
+
+class TrackingHandler(main.FileHandler):
+    """FileHandler that tracks activity so the harness knows when things settle"""
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.in_progress = 0
+        self.handled = 0
+        self.last_activity = time.monotonic()
+
+    def on_created(self, event):
+        with self.lock:
+            self.in_progress += 1
+            self.last_activity = time.monotonic()
+        try:
+            super().on_created(event)
+        finally:
+            with self.lock:
+                self.in_progress -= 1
+                self.handled += 1
+                self.last_activity = time.monotonic()
+
+    def idle_for(self):
+        with self.lock:
+            if self.in_progress:
+                return 0.0
+            return time.monotonic() - self.last_activity
+
+def plan_faults(rng, count, params):
+    """Decide up front which faults hit which file"""
+    plan = []
+    for file_id in range(count):
+        faults = set()
+        for fault in ('lock', 'pause', 'delete', 'rename'):
+            if rng.random() < params[f'{fault}_rate']:
+                faults.add(fault)
+        plan.append((file_id, rng.choice(EXTENSIONS), rng.randint(1024, 512 * 1024), faults))
+    return plan
+
+def run_file(downloads, injector, rng, file_id, ext, size, faults, window, events):
+    """Write one file and apply its faults; records what happened to it"""
+    path = downloads / f"stress_{file_id:06d}.{ext}"
+    half = size // 2
+    with open(path, 'wb') as f:
+        f.write(b'\0' * half)
+        if 'lock' in faults:
+            injector.lock_for(path, rng.uniform(0.5, 4) * window)
+            events['locked'] += 1
+        if 'pause' not in faults:
+            f.write(b'\0' * (size - half))
+
+    if 'pause' in faults:
+        # Stall longer than the stability window, then resume by path like a browser would
+        time.sleep(rng.uniform(1.2, 3) * window)
+        with open(path, 'ab') as f:
+            f.write(b'\0' * (size - half))
+        events['paused'] += 1
+
+    if 'delete' in faults:
+        time.sleep(rng.uniform(0, window))
+        try:
+            path.unlink()
+            events['deleted'] += 1
+            return 'deleted'
+        except FileNotFoundError:
+            events['delete_missed'] += 1
+    elif 'rename' in faults:
+        time.sleep(rng.uniform(0, window))
+        try:
+            os.rename(path, downloads / f"renamed_{file_id:06d}.{ext}")
+            events['renamed'] += 1
+        except FileNotFoundError:
+            events['rename_missed'] += 1
+    return 'written'
+
+def audit(downloads, organizer, plan, fates):
+    """Find every copy of every file id and classify the result"""
+    copies = defaultdict(list)
+    for area, root in (('downloads', downloads), ('organizer', organizer)):
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                match = ID_PATTERN.search(name)
+                if match:
+                    full = os.path.join(dirpath, name)
+                    copies[int(match.group(1))].append((area, os.path.getsize(full)))
+
+    report = Counter()
+    for file_id, ext, size, faults in plan:
+        found = copies.get(file_id, [])
+        if fates.get(file_id) == 'deleted':
+            report['deleted_by_harness'] += 1
+            if found:
+                report['resurrected'] += 1
+            continue
+        if not found:
+            report['lost'] += 1
+        elif len(found) > 1:
+            report['duplicated'] += 1
+        elif found[0][0] == 'organizer':
+            report['organized'] += 1
+            if found[0][1] != size:
+                report['organized_incomplete'] += 1
+        else:
+            report['stranded_in_downloads'] += 1
+    return report
+
+def run_stress(params, show_output):
+    rng = random.Random(params['seed'])
+    injector = FaultInjector(random.Random(params['seed'] + 1), params['enospc_rate'],
+                             params['eacces_rate'], params['partial_rate'])
+    plan = plan_faults(rng, params['files'], params)
+    window = params['poll_interval'] * (main.STABILITY_CHECKS + 1)
+
+    workdir = Path(tempfile.mkdtemp(prefix="blamite_stress_"))
+    saved_paths = (main.DOWNLOADS, main.ORGANIZER)
+    saved_timing = (main.STABILITY_POLL_INTERVAL, main.LOCKED_RETRY_DELAY, main.STABILITY_MAX_ATTEMPTS)
+    try:
+        sandbox, downloads = prepare_sandbox(workdir, "stress")
+        main.STABILITY_POLL_INTERVAL = params['poll_interval']
+        main.LOCKED_RETRY_DELAY = params['poll_interval'] * 2
+        main.STABILITY_MAX_ATTEMPTS = params['max_attempts']
+        trace_file = sandbox / "trace.jsonl"
+        main.TRACER.configure(True, 100, trace_file, new_run=True)
+        if params['journal']:
+            main.JOURNAL.open(sandbox / "journal.jsonl")
+
+        handler = TrackingHandler()
+        events = Counter()
+        fates = {}
+        print(f"💥 Stressing with {len(plan)} files at {params['rate']}/s "
+              f"(stability window {window:.2f}s)...")
+        start = time.monotonic()
+        with injector.installed(), quiet(not show_output):
+            observer = main.start_observer(handler)
+            try:
+                with ThreadPoolExecutor(max_workers=params['writers']) as pool:
+                    futures = {}
+                    for file_id, ext, size, faults in plan:
+                        futures[file_id] = pool.submit(run_file, downloads, injector,
+                                                       random.Random(rng.random()), file_id, ext,
+                                                       size, faults, window, events)
+                        time.sleep(1 / params['rate'])
+                    for file_id, future in futures.items():
+                        fates[file_id] = future.result()
+
+                # Let the organizer drain: nothing in progress and no events for a while
+                deadline = time.monotonic() + params['settle_timeout']
+                while handler.idle_for() < window * 3 and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                elapsed = time.monotonic() - start
+            finally:
+                observer.stop()
+                observer.join()
+                main.TRACER.configure(False)
+                main.JOURNAL.close()
+
+        report = audit(downloads, main.ORGANIZER, plan, fates)
+        records = analyze_trace.load_trace(trace_file) if trace_file.exists() else []
+        outcomes = Counter(r.get('outcome') for r in records if r['span'] == 'file')
+        result = {
+            'files': len(plan),
+            'elapsed_s': round(elapsed, 3),
+            'files_per_s': round(report['organized'] / elapsed, 1) if elapsed else 0,
+            'handled_events': handler.handled,
+            'audit': dict(report),
+            'outcomes': dict(outcomes),
+            'faults_applied': dict(events),
+            'faults_injected': dict(injector.counts),
+            'faults_missing': injector.missing(params),
+        }
+        result.update(latency_stats(trace_file, main.TRACER.run_id))
+        return result
+    finally:
+        main.configure_paths(*saved_paths)
+        (main.STABILITY_POLL_INTERVAL, main.LOCKED_RETRY_DELAY,
+         main.STABILITY_MAX_ATTEMPTS) = saved_timing
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="BLAMITE fault-injection stress harness")
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--rate', type=float, default=50, help="New files per second")
+    parser.add_argument('--writers', type=int, default=16, help="Concurrent writer threads")
+    parser.add_argument('--lock-rate', type=float, default=0.15, help="Share of files locked for a random period")
+    parser.add_argument('--pause-rate', type=float, default=0.1, help="Share of writers that stall mid-download")
+    parser.add_argument('--delete-rate', type=float, default=0.05, help="Share of files deleted during the stability check")
+    parser.add_argument('--rename-rate', type=float, default=0.05, help="Share of files renamed while being organized")
+    parser.add_argument('--enospc-rate', type=float, default=0.03, help="Chance a move fails with ENOSPC")
+    parser.add_argument('--eacces-rate', type=float, default=0.03, help="Chance a move fails with EACCES")
+    parser.add_argument('--partial-rate', type=float, default=0.5,
+                        help="Chance an ENOSPC failure leaves a half-copied destination file")
+    parser.add_argument('--poll-interval', type=float, default=0.02)
+    parser.add_argument('--max-attempts', type=int, default=60)
+    parser.add_argument('--settle-timeout', type=float, default=300)
+    parser.add_argument('--journal', action='store_true',
+                        help="Run with the move journal, which rolls back half-copied destinations")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--save', help="Write results to this JSON file")
+    parser.add_argument('--show-output', action='store_true', help="Show the organizer's per-file output")
+    return parser.parse_args(argv)
+
+def main_stress(argv=None):
+    args = parse_args(argv)
+    params = {key: value for key, value in vars(args).items() if key not in ('save', 'show_output')}
+
+    print("=" * 60)
+    print("💥 BLAMITE FAULT-INJECTION STRESS TEST")
+    print("=" * 60)
+    result = run_stress(params, args.show_output)
+
+    print("\n📊 Results:")
+    for key, value in result.items():
+        print(f"  {key:<18}{value}")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps({
+            'params': params,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'version': main.get_current_version(),
+            'stress': result,
+        }, indent=2))
+        print(f"\n💾 Results saved to {args.save}")
+
+    if result['faults_missing']:
+        print(f"\n❌ Requested faults never fired: {', '.join(result['faults_missing'])}; "
+              f"the run did not exercise them")
+        return 1
+    audit_report = result['audit']
+    if audit_report.get('lost') or audit_report.get('duplicated'):
+        print(f"\n❌ Correctness problems: {audit_report.get('lost', 0)} lost, "
+              f"{audit_report.get('duplicated', 0)} duplicated")
+        return 1
+    print("\n✅ No files lost or duplicated")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_stress())
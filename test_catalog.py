@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the catalog of organized files and its reconcile pass
+"""
+
+import tempfile
+from pathlib import Path
+
+import main
+
+def test_catalog_find():
+    """Backtracked files are searchable by any word prefix of their name"""
+    print("🧪 Testing catalog search")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source, organizer = tmp / "Downloads", tmp / "Organized"
+        source.mkdir()
+        for name in ["Invoice_2024-03.pdf", "holiday photo.png", "notes.txt"]:
+            (source / name).write_text(name)
+        root = main.WatchRoot("dl", source, organizer, {"pdf": organizer / "PDFs", "png": organizer / "Images",
+                                                        "txt": organizer / "Text"})
+        catalog = main.CATALOG
+        catalog.open(tmp / "catalog.db")
+        try:
+            main.organize_existing_files(source, dict(main.DEFAULT_SETTINGS, backtrack_all_files=True), root)
+            [match] = catalog.find("invo 2024")
+            assert match['path'] == str(organizer / "PDFs" / "Invoice_2024-03.pdf")
+            assert match['category'] == "PDFs" and match['kind'] == 'backtrack' and match['size'] == 19
+            assert [m['name'] for m in catalog.find("PHOTO")] == ["holiday photo.png"]
+            assert [m['name'] for m in catalog.find("images")] == ["holiday photo.png"]
+            assert catalog.find("missing") == [] and catalog.find("  ") == []
+            print("   ✅ Prefix, case-insensitive and category matches")
+
+            (organizer / "PDFs" / "Invoice_2024-03.pdf").rename(organizer / "Text" / "Invoice_2024-03.pdf")
+            (organizer / "Images" / "holiday photo.png").unlink()
+            (organizer / "PDFs" / "manual.pdf").write_text("added by hand")
+            results = catalog.reconcile([root])
+            assert (results['moved'], results['removed'], results['added']) == (1, 1, 1)
+            assert catalog.find("invoice")[0]['path'] == str(organizer / "Text" / "Invoice_2024-03.pdf")
+            assert catalog.find("holiday") == [] and catalog.find("manual")[0]['kind'] == 'reconcile'
+            assert catalog.reconcile([root])['checked'] == 3
+            print("   ✅ Reconcile follows manual moves, deletes and additions")
+        finally:
+            catalog.close()
+
+if __name__ == "__main__":
+    test_catalog_find()
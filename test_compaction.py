@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script to verify cold-file compaction and restoring compacted files
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import main
+
+def test_compact_and_restore():
+    """Cold compressible files are replaced by verified archives and come back intact"""
+    print("🧪 Testing cold-file compaction")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        texts, pdfs = tmp / "Organized" / "Text_Files", tmp / "Organized" / "PDFs"
+        texts.mkdir(parents=True)
+        pdfs.mkdir()
+        old = time.time() - 90 * 86400
+        files = {
+            "notes.txt": b"the same line over and over\n" * 2000,
+            "random.txt": os.urandom(20000),
+            "fresh.txt": b"still in use\n" * 2000,
+            "report.pdf": b"%PDF " * 2000,
+        }
+        for name, data in files.items():
+            path = (pdfs if name.endswith('.pdf') else texts) / name
+            path.write_bytes(data)
+            if name != "fresh.txt":
+                os.utime(path, (old, old))
+        root = main.WatchRoot("dl", tmp / "Downloads", tmp / "Organized",
+                              {"txt": texts, "pdf": pdfs})
+        settings = dict(main.DEFAULT_SETTINGS, compact_codec='gz')
+        compactor = main.Compactor(settings, manifest=tmp / "compacted.jsonl")
+
+        assert compactor.run([root], dry_run=True)['candidates'] == 2
+        assert (texts / "notes.txt").exists()
+        results = compactor.run([root])
+        assert results['compacted'] == 1 and results['incompressible'] == 1
+        assert results['bytes_after'] < results['bytes_before'] / 10
+        assert sorted(p.name for p in texts.iterdir()) == ["fresh.txt", "notes.txt.gz", "random.txt"]
+        assert (pdfs / "report.pdf").exists()
+        assert int((texts / "notes.txt.gz").stat().st_mtime) == int(old)
+        print("   ✅ Only the cold, compressible text file was compacted")
+
+        assert compactor.run([root])['candidates'] == 0
+        print("   ✅ Incompressible files are not retried")
+
+        (texts / "notes.txt").write_text("a new file with the same name")
+        assert compactor.restore(texts / "notes.txt.gz")['renamed_on_conflict'] == 1
+        assert (texts / "notes_1.txt").read_bytes() == files["notes.txt"]
+        assert int((texts / "notes_1.txt").stat().st_mtime) == int(old)
+        assert not (texts / "notes.txt.gz").exists()
+        assert compactor.restore()['restored'] == 0
+        print("   ✅ Restored byte for byte with its dates, without overwriting anything")
+
+if __name__ == "__main__":
+    test_compact_and_restore()
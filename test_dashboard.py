@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the live dashboard's frame, output capture and pause key
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import main
+
+def test_render_frame():
+    """The frame is built from shared counters and activity and fits the terminal"""
+    print("🧪 Testing dashboard frames")
+    metrics, activity = main.Metrics(), main.Activity()
+    metrics.register_gauge('queue_depth', lambda: 7)
+    activity.download(Path("/dl/movie.mp4"), 'dl', 1000)
+    time.sleep(0.05)
+    activity.download(Path("/dl/movie.mp4"), 'dl', 3000)
+    activity.download(Path("/dl/done.pdf"), 'dl', 10, stable=2)
+    activity.moved(Path("/dl/a.pdf"), Path("/out/PDFs/a.pdf"), 2048)
+    activity.error("b.pdf", "timeout")
+    dashboard = main.Dashboard(metrics=metrics, activity=activity)
+    dashboard.render()
+    metrics.incr('organized', 5)
+    metrics.incr('backtrack_organized', 5)
+    frame = dashboard.render(60, 24)
+
+    text = "\n".join(frame)
+    assert all(len(line) <= 60 for line in frame) and len(frame) < 24
+    assert "organized 10" in text and "queue_depth 7" in text
+    assert "Downloading (2)" in text and "growing" in text
+    assert f"done in ~{(main.STABILITY_CHECKS - 2) * main.STABILITY_POLL_INTERVAL}s" in text
+    assert "a.pdf → PDFs (2.0 KB)" in text and "b.pdf: timeout" in text
+    print("   ✅ Downloads, queues, throughput, moves and errors shown")
+
+    activity.done(Path("/dl/movie.mp4"))
+    assert "Downloading (1)" in "\n".join(dashboard.render(60, 24))
+    print("   ✅ Finished downloads leave the list")
+
+def test_output_tail():
+    """Per-event lines are dropped; warnings are kept for the message panel"""
+    tail = main.OutputTail(lines=2)
+    tail.write("📁 File detected: a.pdf\n⚠️  Could not")
+    tail.write(" update the catalog\n✅ Organized: a.pdf\n")
+    assert list(tail.lines) == ["⚠️  Could not update the catalog"]
+
+def test_pause_key():
+    """p holds queued files until it is pressed again"""
+    print("🧪 Testing the pause key")
+    handled = threading.Event()
+
+    class Handler:
+        def handle(self, root, file_path, trace, ready=None, size=None):
+            handled.set()
+
+    pool = main.WorkerPool(1)
+    dashboard = main.Dashboard(pool, metrics=main.Metrics(), activity=main.Activity())
+    dashboard.press('p')
+    pool.submit(Handler(), main.WatchRoot('dl', '/dl', '/out', {}), Path("/dl/a.pdf"), main.NULL_TRACE)
+    assert not handled.wait(0.2) and "PAUSED" in dashboard.render()[0]
+    dashboard.press('p')
+    assert handled.wait(2)
+    pool.shutdown()
+    keys = []
+    main.Dashboard(on_key=keys.append).press('q')
+    assert keys == ['q']
+    print("   ✅ Workers pause and resume; other keys reach the app")
+
+if __name__ == "__main__":
+    test_render_frame()
+    test_output_tail()
+    test_pause_key()
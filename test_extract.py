@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script to verify archive extraction: rule matching, path traversal and zip bomb limits
+"""
+
+import io
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+
+import main
+
+def make_root(tmp):
+    source, out = tmp / "Downloads", tmp / "Organized"
+    source.mkdir()
+    return main.WatchRoot("dl", source, out, {"pdf": out / "PDFs", "png": out / "Images"})
+
+def test_extract_matching_members():
+    """Only members with a rule are written, flattened into their category folder"""
+    print("🧪 Testing archive extraction")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        root = make_root(tmp)
+        (root.destination / "PDFs").mkdir(parents=True)
+        (root.destination / "PDFs" / "report.pdf").write_text("already here")
+        bundle = root.source / "bundle.zip"
+        with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("docs/report.pdf", "report")
+            archive.writestr("../../escape.pdf", "sneaky")
+            archive.writestr("img/logo.png", "png")
+            archive.writestr("setup.exe", "binary")
+        outcome, extracted = main.ArchiveExtractor().extract(bundle, root)
+        assert outcome == 'extracted' and len(extracted) == 3
+        assert (root.destination / "PDFs" / "report_1.pdf").read_text() == "report"
+        assert (root.destination / "PDFs" / "escape.pdf").read_text() == "sneaky"
+        assert (root.destination / "Images" / "logo.png").exists()
+        assert not list(tmp.rglob("setup.exe")) and not (tmp / "escape.pdf").exists()
+        print("   ✅ PDFs and images extracted, ../ stripped, the .exe never written")
+
+        bundle = root.source / "photos.tar.gz"
+        with tarfile.open(bundle, 'w:gz') as archive:
+            data = b"image"
+            info = tarfile.TarInfo("photos/cat.png")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+            link = tarfile.TarInfo("photos/passwd.png")
+            link.type, link.linkname = tarfile.SYMTYPE, "/etc/passwd"
+            archive.addfile(link)
+        outcome, extracted = main.ArchiveExtractor().extract(bundle, root)
+        assert outcome == 'extracted' and [dest.name for _, dest in extracted] == ["cat.png"]
+        print("   ✅ tar.gz streamed, links skipped")
+
+def test_zip_bomb_rejected():
+    """An archive that expands too far is rolled back and left in place"""
+    print("🧪 Testing zip bomb protection")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        root = make_root(tmp)
+        bundle = root.source / "bomb.zip"
+        with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("a.pdf", "fine")
+            archive.writestr("b.pdf", b"\0" * 20 * 1024 * 1024)
+        outcome, extracted = main.ArchiveExtractor().extract(bundle, root)
+        assert outcome == 'extract_rejected' and extracted == []
+        assert not list((root.destination / "PDFs").iterdir()) and bundle.exists()
+        print("   ✅ 1000:1 archive rejected and nothing left behind")
+
+        extractor = main.ArchiveExtractor()
+        extractor.configure({'extract_archives': True, 'extract_max_members': 1})
+        outcome, _ = extractor.extract(bundle, root)
+        assert outcome == 'extract_rejected'
+        print("   ✅ Member count limit enforced")
+
+def test_extract_journal_and_undo():
+    """Members are journaled, so a crash mid-archive leaves none behind, and an undo deletes them"""
+    print("🧪 Testing extraction recovery and undo")
+
+    class Killed(BaseException):
+        """The process dying mid-write"""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        root = make_root(tmp)
+        bundle = root.source / "scans.zip"
+        with zipfile.ZipFile(bundle, 'w') as archive:
+            archive.writestr("one.pdf", "one")
+            archive.writestr("two.pdf", "two")
+        journal, log = main.MoveJournal(), main.TransactionLog()
+        journal.open(tmp / "journal.jsonl")
+        log.open(tmp / "transactions")
+        services = main.Services(journal, log)
+        extractor = main.ArchiveExtractor()
+        copy = extractor._copy
+
+        def dying_copy(stream, dest, *args):
+            if dest.name.endswith("two.pdf"):
+                dest.write(b"tw")
+                raise Killed()
+            return copy(stream, dest, *args)
+
+        extractor._copy = dying_copy
+        journal.detected(bundle, root.name)
+        try:
+            extractor.extract(bundle, root, services=services)
+        except Killed:
+            pass
+        journal.close()
+        assert sorted(p.name for p in (root.destination / "PDFs").iterdir()) == ["one.pdf", "two.pdf"]
+        assert main.MoveJournal().recover(tmp / "journal.jsonl") == [(bundle, root.name)]
+        assert not list((root.destination / "PDFs").iterdir())
+        print("   ✅ Members of an interrupted extraction removed, the archive queued again")
+
+        journal.open(tmp / "journal.jsonl")
+        txn = log.begin('live')
+        outcome, extracted = main.ArchiveExtractor().extract(bundle, root, services=services)
+        log.end(txn)
+        journal.close()
+        assert outcome == 'extracted' and len(extracted) == 2
+        assert main.MoveJournal().recover(tmp / "journal.jsonl") == []
+        results = main.undo_transaction(txn.id, folder=tmp / "transactions")
+        assert results['removed'] == 2 and not list((root.destination / "PDFs").iterdir())
+        assert bundle.exists()
+        print("   ✅ Members closed in the journal, and removed by an undo")
+
+def test_live_archive():
+    """A downloaded bundle is extracted by the worker and then kept in Archives"""
+    print("🧪 Testing live extraction")
+    saved = main.STABILITY_POLL_INTERVAL, main.EXTRACTOR.enabled
+    main.STABILITY_POLL_INTERVAL = 0.01
+    main.EXTRACTOR.enabled = True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            root = make_root(tmp)
+            bundle = root.source / "papers.zip"
+            with zipfile.ZipFile(bundle, 'w') as archive:
+                archive.writestr("paper.pdf", "paper")
+            assert main.FileHandler([root]).handle(root, bundle, main.NULL_TRACE) == 'organized'
+            assert (root.destination / "PDFs" / "paper.pdf").exists()
+            assert (root.destination / main.ARCHIVES_FOLDER / "papers.zip").exists()
+            print("   ✅ Members organized, bundle moved to Archives")
+    finally:
+        main.STABILITY_POLL_INTERVAL, main.EXTRACTOR.enabled = saved
+
+if __name__ == "__main__":
+    test_extract_matching_members()
+    test_zip_bomb_rejected()
+    test_extract_journal_and_undo()
+    test_live_archive()
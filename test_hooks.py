@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script to verify post-move hooks: batching, retries and a slow hook not blocking moves
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import main
+
+class StandInEndpoint(BaseHTTPRequestHandler):
+    """Local stand-in for a notification service; fails the first `failures` requests"""
+    received = []
+    failures = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        cls = type(self)
+        if cls.failures > 0:
+            cls.failures -= 1
+            self.send_response(503)
+        else:
+            cls.received.append(body)
+            self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def test_http_hook_batches():
+    """Moves reach the endpoint in batches, after a failed call is retried"""
+    print("🧪 Testing the HTTP post-move hook")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInEndpoint)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StandInEndpoint.received, StandInEndpoint.failures = [], 1
+    pipeline = main.HookPipeline()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "hooks.json").write_text(json.dumps({"hooks": [
+                {"name": "index", "url": f"http://127.0.0.1:{server.server_port}/organized",
+                 "batch_size": 3, "batch_wait": 5, "backoff": 0.01, "extensions": ["pdf"]},
+                {"name": "broken", "type": "ftp"}
+            ]}))
+            assert pipeline.load(tmp / "hooks.json") == 1
+            moves = [(tmp / f"in{i}.pdf", tmp / "PDFs" / f"doc{i}.pdf") for i in range(7)]
+            pipeline.submit_many(moves + [(tmp / "a.png", tmp / "Images" / "a.png")], 'backtrack', 'dl', 10)
+            pipeline.close()
+        batches = [[move['name'] for move in body['files']] for body in StandInEndpoint.received]
+        assert sorted(len(batch) for batch in batches) == [1, 3, 3]
+        assert sorted(sum(batches, [])) == [f"doc{i}.pdf" for i in range(7)]
+        assert StandInEndpoint.received[0]['files'][0]['kind'] == 'backtrack'
+        print("   ✅ 7 PDFs delivered in 3 calls, the failed call retried, other files filtered out")
+    finally:
+        server.shutdown()
+
+def hang(moves, timeout):
+    """A python hook that never returns in time"""
+    time.sleep(5)
+
+def test_slow_hook_is_isolated():
+    """A full queue drops moves instead of blocking; a command hook times out"""
+    print("🧪 Testing hook isolation")
+    release = threading.Event()
+    calls = []
+
+    def stuck(moves, timeout):
+        calls.append(len(moves))
+        release.wait(5)
+
+    pipeline = main.HookPipeline()
+    hook = pipeline.add(main.PostMoveHook('stuck', stuck, queue_size=2, batch_wait=0))
+    start = time.perf_counter()
+    pipeline.submit_many([(f"/in/{i}.pdf", f"/out/{i}.pdf") for i in range(20)], 'live', 'dl', 1)
+    assert time.perf_counter() - start < 0.5
+    time.sleep(0.1)
+    assert main.METRICS.counters['hook_stuck_dropped'] >= 17
+    release.set()
+    pipeline.close()
+    print("   ✅ Moves never wait for a slow hook")
+
+    slow = main.PostMoveHook('sleepy', main.command_hook_action([sys.executable, '-c', 'import time; time.sleep(5)']),
+                             timeout=0.2, retries=0)
+    assert not slow._deliver([{'dest': 'x.pdf'}])
+    assert main.METRICS.counters['hook_sleepy_failed'] == 1
+    print("   ✅ Commands that run too long are killed")
+
+    hanging = main.PostMoveHook('hanging', main.python_hook_action('test_hooks:hang'), timeout=0.2, retries=0)
+    start = time.perf_counter()
+    assert not hanging._deliver([{'dest': 'x.pdf'}])
+    assert time.perf_counter() - start < 2
+    assert main.METRICS.counters['hook_hanging_failed'] == 1
+    print("   ✅ Python hooks that run too long are abandoned")
+
+if __name__ == "__main__":
+    test_http_hook_batches()
+    test_slow_hook_is_isolated()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the move journal recovers interrupted moves after a crash
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import main
+
+def write(path, size):
+    path.write_bytes(b'x' * size)
+    return path
+
+def test_recover_interrupted_moves():
+    """Each crash state is finished, rolled back or requeued"""
+    print("🧪 Testing journal recovery")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        src, dest = tmp / "Downloads", tmp / "Organized"
+        src.mkdir()
+        dest.mkdir()
+        records = []
+
+        def intent(name, size, src_size=None, dest_size=None):
+            if src_size is not None:
+                write(src / name, src_size)
+            if dest_size is not None:
+                write(dest / name, dest_size)
+            records.append({'op': 'intent', 'id': name, 'src': str(src / name),
+                            'dest': str(dest / name), 'size': size, 'root': 'Downloads'})
+
+        intent("copied.pdf", 10, src_size=10, dest_size=10)  # copy done, source not removed yet
+        intent("half.pdf", 10, src_size=10, dest_size=4)  # cross-device copy cut short
+        intent("moved.pdf", 10, dest_size=10)  # move finished, "done" never written
+        intent("waiting.pdf", 10, src_size=10)  # crashed before the move started
+        write(dest / f".waiting.pdf.abc123{main.PARTIAL_SUFFIX}", 4)  # cross-drive copy cut short
+        write(src / "queued.txt", 3)
+        records.append({'op': 'detected', 'id': 'queued', 'src': str(src / "queued.txt"), 'root': 'Downloads'})
+        write(src / "finished.png", 3)
+        records.append({'op': 'detected', 'id': 'finished', 'src': str(src / "finished.png"), 'root': 'Downloads'})
+        records.append({'op': 'dropped', 'id': 'finished', 'outcome': 'timeout'})
+
+        journal_file = tmp / "journal.jsonl"
+        journal_file.write_text(''.join(json.dumps(r) + '\n' for r in records) + '{"op": "int')
+
+        requeue = main.MoveJournal().recover(journal_file)
+        assert sorted(path.name for path, _ in requeue) == ["half.pdf", "queued.txt", "waiting.pdf"]
+        assert not (src / "copied.pdf").exists() and (dest / "copied.pdf").exists()
+        assert (src / "half.pdf").exists() and not (dest / "half.pdf").exists()
+        assert sorted(p.name for p in dest.iterdir()) == ["copied.pdf", "moved.pdf"]
+        assert journal_file.read_text() == ''
+        print("   ✅ Interrupted moves finished or rolled back, pending files requeued")
+
+def test_journal_round_trip():
+    """Finished moves are closed; files still in flight come back after a restart"""
+    print("🧪 Testing journal writes")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        journal_file = tmp / "journal.jsonl"
+        done, pending = write(tmp / "done.pdf", 5), write(tmp / "pending.pdf", 5)
+        journal = main.MoveJournal()
+        journal.open(journal_file)
+        for path in (done, pending):
+            journal.detected(path, 'Downloads')
+        journal.intent(done, tmp / "moved.pdf", 5, 'Downloads')
+        done.rename(tmp / "moved.pdf")
+        journal.finish(done, 'organized')
+        journal.close()
+
+        requeue = main.MoveJournal().recover(journal_file)
+        assert requeue == [(pending, 'Downloads')]
+        print("   ✅ Only the unfinished file is requeued")
+
+def test_stop_mid_download():
+    """Stopping while a download is still settling leaves it in place and journaled for the next start"""
+    print("🧪 Testing shutdown during a download")
+    saved = main.JOURNAL, main.STABILITY_POLL_INTERVAL
+    main.JOURNAL = main.MoveJournal()
+    main.STABILITY_POLL_INTERVAL = 5
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            source, out = tmp / "Downloads", tmp / "Organized"
+            source.mkdir()
+            root = main.WatchRoot("dl", source, out, {"pdf": out / "PDFs"})
+            main.JOURNAL.open(tmp / "journal.jsonl")
+            pool = main.WorkerPool(2)
+            handler = main.FileHandler([root], pool)
+            handler.enqueue(root, write(source / "partial.pdf", 100), main.NULL_TRACE)
+            time.sleep(0.3)
+            started = time.monotonic()
+            pool.shutdown(wait=True)
+            assert time.monotonic() - started < 2
+            main.JOURNAL.close()
+            assert (source / "partial.pdf").exists() and not out.exists()
+            assert main.MoveJournal().recover(tmp / "journal.jsonl") == [(source / "partial.pdf", "dl")]
+            print("   ✅ Stability wait cut short, file left in Downloads and requeued on restart")
+    finally:
+        main.JOURNAL, main.STABILITY_POLL_INTERVAL = saved
+
+if __name__ == "__main__":
+    test_recover_interrupted_moves()
+    test_journal_round_trip()
+    test_stop_mid_download()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the importable Organizer API
+"""
+
+import contextlib
+import io
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+import main
+from blamite import Organizer
+
+def make_organizer(tmp, **kwargs):
+    inbox, out = tmp / "inbox", tmp / "out"
+    inbox.mkdir()
+    return Organizer({"roots": [{"name": "inbox", "source": str(inbox), "destination": str(out),
+                                 "rules": {"pdf": "Scans", "txt": "Notes"}, "inherit_rules": False}]},
+                     **kwargs), inbox, out
+
+def test_organize_paths():
+    """Batch calls stream a result per path, including the ones left alone"""
+    print("🧪 Testing Organizer.organize_paths")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        organizer, inbox, out = make_organizer(tmp, catalog=tmp / "catalog.db")
+        with organizer:
+            for name in ["a.pdf", "b.txt", "c.exe", "d.pdf.part"]:
+                (inbox / name).write_text(name)
+            (out / "Scans").mkdir(parents=True)
+            (out / "Scans" / "a.pdf").write_text("older")
+            paths = [inbox / name for name in ["a.pdf", "b.txt", "c.exe", "d.pdf.part", "gone.pdf"]]
+            results = {r['path'].name: r for r in organizer.organize_paths(paths + [tmp / "elsewhere.pdf"])}
+            assert {name: r['status'] for name, r in results.items()} == {
+                "a.pdf": "organized", "b.txt": "organized", "c.exe": "unsupported",
+                "d.pdf.part": "unsupported", "gone.pdf": "missing", "elsewhere.pdf": "not_in_root"}
+            assert results["a.pdf"]['dest'] == out / "Scans" / "a_1.pdf"
+            assert results["b.txt"]['root'] == "inbox" and (out / "Notes" / "b.txt").exists()
+            assert organizer.catalog.find("a")[0]['kind'] == 'api'
+            print("   ✅ Results for organized, skipped, missing and foreign files")
+
+            (inbox / "later.txt").write_text("x")
+            assert sorted(r['status'] for r in organizer.scan("inbox")) == ["organized", "unsupported", "unsupported"]
+            print("   ✅ scan() organizes what is already in a root")
+        assert not organizer.catalog.enabled
+
+def test_isolation():
+    """Organizers in one process keep their own journal, catalog, hooks and link view"""
+    print("🧪 Testing Organizer isolation")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "a").mkdir()
+        (tmp / "b").mkdir()
+        delivered = []
+        hook = main.PostMoveHook("collect", lambda moves, timeout: delivered.extend(moves))
+        linker, inbox_a, out_a = make_organizer(tmp / "a", links=tmp / "links.jsonl", catalog=tmp / "a.db")
+        mover, inbox_b, out_b = make_organizer(tmp / "b", catalog=tmp / "b.db", transactions=tmp / "txns",
+                                               hooks=[hook])
+        assert not (main.LINKS.enabled or main.CATALOG.enabled or main.HOOKS.enabled)
+        assert main.TRANSACTIONS.folder is None
+        print("   ✅ The process-wide link view, catalog, hooks and transaction log are left alone")
+
+        (inbox_a / "a.pdf").write_text("a")
+        (inbox_b / "b.pdf").write_text("b")
+        assert [r['status'] for r in linker.organize_paths([inbox_a / "a.pdf"])] == ['organized']
+        assert [r['status'] for r in mover.organize_paths([inbox_b / "b.pdf"])] == ['organized']
+        assert (inbox_a / "a.pdf").exists() and (out_a / "Scans" / "a.pdf").exists()
+        assert not (inbox_b / "b.pdf").exists() and (out_b / "Scans" / "b.pdf").exists()
+        mover.close()
+        assert [move['name'] for move in delivered] == ["b.pdf"]
+        assert not mover.catalog.enabled and mover.transactions.folder is None
+        print("   ✅ Link mode and hooks apply to their own organizer only")
+
+        (inbox_a / "c.pdf").write_text("c")
+        assert [r['status'] for r in linker.organize_paths([inbox_a / "c.pdf"])] == ['organized']
+        assert sorted(row['name'] for row in linker.catalog.find("pdf")) == ["a.pdf", "c.pdf"]
+        linker.close()
+        print("   ✅ Closing one organizer leaves the other's catalog and link view open")
+
+        records, handler = [], logging.Handler()
+        handler.emit = records.append
+        logging.getLogger('blamite').addHandler(handler)
+        stdout = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(stdout):
+                Organizer({"roots": [{"name": "no source"}, {"source": str(inbox_a)}]}).close()
+        finally:
+            logging.getLogger('blamite').removeHandler(handler)
+        assert stdout.getvalue() == ""
+        assert [(r.levelname, "has no 'source'" in r.getMessage()) for r in records] == [('WARNING', True)]
+        print("   ✅ Messages go to the blamite logger, not stdout")
+
+def test_watcher():
+    """start() reports live results to the callback until stop()"""
+    print("🧪 Testing Organizer.start/stop")
+    saved = main.STABILITY_POLL_INTERVAL
+    main.STABILITY_POLL_INTERVAL = 0.05
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            organizer, inbox, out = make_organizer(tmp)
+            results, arrived = [], threading.Event()
+
+            def on_result(result):
+                results.append(result)
+                arrived.set()
+
+            with organizer:
+                organizer.start(on_result)
+                (inbox / "live.pdf").write_text("new download")
+                assert arrived.wait(10)
+            assert results[0]['status'] == 'organized' and results[0]['dest'] == out / "Scans" / "live.pdf"
+            assert organizer.observer is None
+            print("   ✅ Live files reported with their destination")
+    finally:
+        main.STABILITY_POLL_INTERVAL = saved
+
+if __name__ == "__main__":
+    test_organize_paths()
+    test_isolation()
+    test_watcher()
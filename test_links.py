@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the link view: files stay in Downloads, links in the folders, dangling symlinks pruned
+"""
+
+import errno
+import os
+import tempfile
+from pathlib import Path
+
+import main
+
+SETTINGS = dict(main.DEFAULT_SETTINGS, backtrack_all_files=True, organize_mode='link')
+
+def make_root(tmp):
+    source, out = tmp / "Downloads", tmp / "Organized"
+    source.mkdir()
+    return main.WatchRoot("dl", source, out, {"pdf": out / "PDFs", "png": out / "Images"})
+
+def test_backtrack_links():
+    """A backtrack hardlinks files into their folders and leaves them in Downloads"""
+    print("🧪 Testing backtrack in link mode")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        root = make_root(tmp)
+        main.LINKS.configure(SETTINGS, tmp / "links.jsonl")
+        try:
+            (root.source / "report.pdf").write_text("report")
+            (root.source / "logo.png").write_text("png")
+            main.organize_existing_files(root.source, SETTINGS, root)
+            link = root.destination / "PDFs" / "report.pdf"
+            assert (root.source / "report.pdf").exists() and link.exists()
+            assert os.stat(link).st_ino == os.stat(root.source / "report.pdf").st_ino
+            assert (root.destination / "Images" / "logo.png").exists()
+            print("   ✅ Hard links share the file's inode, nothing moved out of Downloads")
+
+            main.LINKS.configure(SETTINGS, tmp / "links.jsonl")
+            main.organize_existing_files(root.source, SETTINGS, root)
+            assert sorted(p.name for p in (root.destination / "PDFs").iterdir()) == ["report.pdf"]
+            print("   ✅ A second backtrack does not link the same files again")
+
+            (root.source / "scan.pdf").write_text("scan")
+            os.symlink(root.source / "scan.pdf", root.destination / "PDFs" / "scan.pdf")
+            main.LINKS.record([(root.source / "scan.pdf", root.destination / "PDFs" / "scan.pdf", 'symbolic')])
+            (root.source / "scan.pdf").rename(tmp / "scan.pdf")  # Kept elsewhere, so its inode is not reused
+            (root.source / "scan.pdf").write_text("new scan")
+            main.organize_existing_files(root.source, SETTINGS, root)
+            link = root.destination / "PDFs" / "scan.pdf"
+            assert not link.is_symlink() and link.read_text() == "new scan"
+            assert sorted(p.name for p in (root.destination / "PDFs").iterdir()) == ["report.pdf", "scan.pdf"]
+            print("   ✅ A backtrack relinks a file downloaded again, replacing its stale symbolic link")
+        finally:
+            main.LINKS.close()
+
+def test_symlink_fallback():
+    """Across volumes (EXDEV) a symbolic link is made instead"""
+    print("🧪 Testing symbolic link fallback")
+    saved = main.os.link
+
+    def link(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    main.os.link = link
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "a.pdf").write_text("a")
+            (tmp / "b.pdf").write_text("taken")
+            dest, kind = main.link_file(tmp / "a.pdf", tmp / "b.pdf")
+            assert kind == 'symbolic' and dest.name == "b_1.pdf"
+            assert dest.is_symlink() and dest.read_text() == "a"
+            print("   ✅ Symbolic link made under a unique name")
+    finally:
+        main.os.link = saved
+
+def test_prune():
+    """Dangling symbolic links are removed; hard links that outlived their download are kept"""
+    print("🧪 Testing link pruning")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        root = make_root(tmp)
+        main.LINKS.configure(SETTINGS, tmp / "links.jsonl")
+        try:
+            for name in ("keep.pdf", "gone.pdf", "replaced.pdf", "moved.png"):
+                (root.source / name).write_text(name)
+            main.organize_existing_files(root.source, SETTINGS, root)
+            os.symlink(root.source / "moved.png", root.destination / "Images" / "sym.png")
+            main.LINKS.record([(root.source / "moved.png", root.destination / "Images" / "sym.png", 'symbolic')])
+            (root.destination / "PDFs" / "mine.pdf").write_text("not a link")
+            (root.source / "gone.pdf").unlink()
+            (root.source / "replaced.pdf").unlink()
+            (root.source / "replaced.pdf").write_text("new download")
+            (root.source / "moved.png").unlink()
+
+            results = main.LINKS.prune(dry_run=True)
+            assert results['pruned'] == 1 and (root.destination / "Images" / "sym.png").is_symlink()
+            results = main.LINKS.prune()
+            assert results['pruned'] == 1 and results['orphaned'] == 3 and results['kept'] == 1
+            assert not os.path.lexists(root.destination / "Images" / "sym.png")
+            print("   ✅ Dangling symbolic link pruned")
+
+            assert (root.destination / "PDFs" / "gone.pdf").read_text() == "gone.pdf"
+            assert (root.destination / "PDFs" / "replaced.pdf").read_text() == "replaced.pdf"
+            assert (root.destination / "Images" / "moved.png").read_text() == "moved.png"
+            assert (root.destination / "PDFs" / "mine.pdf").exists()
+            results = main.LINKS.prune()
+            assert results['pruned'] == results['orphaned'] == 0 and results['kept'] == 1
+            print("   ✅ Hard links whose download is gone kept as the last copy and dropped from the manifest")
+        finally:
+            main.LINKS.close()
+
+def test_live_link():
+    """A live download is linked once its size settles"""
+    print("🧪 Testing live linking")
+    saved = main.STABILITY_POLL_INTERVAL
+    main.STABILITY_POLL_INTERVAL = 0.01
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            root = make_root(tmp)
+            main.LINKS.configure(SETTINGS, tmp / "links.jsonl")
+            (root.source / "paper.pdf").write_text("paper")
+            handler = main.FileHandler([root])
+            assert handler.handle(root, root.source / "paper.pdf", main.NULL_TRACE) == 'organized'
+            assert (root.source / "paper.pdf").exists() and (root.destination / "PDFs" / "paper.pdf").exists()
+            assert handler.handle(root, root.source / "paper.pdf", main.NULL_TRACE) == 'skipped_linked'
+            print("   ✅ Linked, and not linked twice when seen again")
+
+            (root.source / "paper.pdf").unlink()
+            (root.source / "paper.pdf").write_text("paper, second edition")
+            assert handler.handle(root, root.source / "paper.pdf", main.NULL_TRACE) == 'organized'
+            assert (root.destination / "PDFs" / "paper.pdf").read_text() == "paper, second edition"
+            assert (root.destination / "PDFs" / "paper_1.pdf").read_text() == "paper"
+            assert handler.handle(root, root.source / "paper.pdf", main.NULL_TRACE) == 'skipped_linked'
+            print("   ✅ A new download under the same name is linked, the earlier one kept beside it")
+    finally:
+        main.STABILITY_POLL_INTERVAL = saved
+        main.LINKS.close()
+
+if __name__ == "__main__":
+    test_backtrack_links()
+    test_symlink_fallback()
+    test_prune()
+    test_live_link()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batched moves never replace files in the organizer
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import main
+
+def test_rename_noreplace():
+    """A taken name raises instead of being overwritten, with or without renameat2"""
+    print("🧪 Testing no-replace renames")
+    saved = main._renameat2
+    try:
+        for renameat2 in (saved, False):
+            main._renameat2 = renameat2  # False: the hard link fallback
+            with tempfile.TemporaryDirectory() as tmp:
+                tmp = Path(tmp)
+                (tmp / "a.pdf").write_text("new")
+                (tmp / "b.pdf").write_text("old")
+                try:
+                    main.rename_noreplace(tmp / "a.pdf", tmp / "b.pdf")
+                    assert False, "b.pdf was replaced"
+                except FileExistsError:
+                    pass
+                assert (tmp / "b.pdf").read_text() == "old" and (tmp / "a.pdf").exists()
+                assert main.move_file(tmp / "a.pdf", tmp / "b.pdf") == tmp / "b_1.pdf"
+                assert (tmp / "b_1.pdf").read_text() == "new" and not (tmp / "a.pdf").exists()
+                if main.DIR_FDS:
+                    fd = os.open(tmp, os.O_RDONLY)
+                    try:
+                        main.rename_noreplace("b_1.pdf", "c.pdf", src_dir_fd=fd, dst_dir_fd=fd)
+                    finally:
+                        os.close(fd)
+                    assert (tmp / "c.pdf").read_text() == "new" and not (tmp / "b_1.pdf").exists()
+        print("   ✅ Conflicts get the next free name (renameat2 and hard link fallback)")
+    finally:
+        main._renameat2 = saved
+
+def test_batched_backtrack():
+    """Backtrack moves every file once, keeping names already in the organizer"""
+    print("🧪 Testing batched backtrack moves")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source, organizer = tmp / "Downloads", tmp / "Organized"
+        source.mkdir()
+        (organizer / "PDFs").mkdir(parents=True)
+        (organizer / "PDFs" / "report.pdf").write_text("already organized")
+        for name in ["report.pdf", "notes.txt", "photo.png", "skip.exe"]:
+            (source / name).write_text(name)
+        root = main.WatchRoot("dl", source, organizer, {"pdf": organizer / "PDFs", "txt": organizer / "Text",
+                                                        "png": organizer / "Images"})
+        settings = dict(main.DEFAULT_SETTINGS, backtrack_all_files=True)
+        main.BACKTRACK_BATCH, batch = 2, main.BACKTRACK_BATCH
+        try:
+            main.organize_existing_files(source, settings, root)
+        finally:
+            main.BACKTRACK_BATCH = batch
+        assert [p.name for p in source.iterdir()] == ["skip.exe"]
+        assert (organizer / "PDFs" / "report.pdf").read_text() == "already organized"
+        assert (organizer / "PDFs" / "report_1.pdf").read_text() == "report.pdf"
+        assert (organizer / "Text" / "notes.txt").exists() and (organizer / "Images" / "photo.png").exists()
+        print("   ✅ All files moved, existing names kept")
+
+if __name__ == "__main__":
+    test_rename_noreplace()
+    test_batched_backtrack()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script to verify several watch roots share one watcher, one worker pool and one metrics object
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import main
+
+def make_roots(tmp, count=2):
+    entries = [{"name": "alice", "source": str(tmp / "alice"), "destination": str(tmp / "out_alice"),
+                "rules": {"dwg": "CAD"}},
+               {"name": "scans", "source": str(tmp / "scans"), "destination": str(tmp / "out_scans"),
+                "rules": {"pdf": "Scans"}, "inherit_rules": False}]
+    entries += [{"name": f"user{i}", "source": str(tmp / f"user{i}")} for i in range(count - 2)]
+    for entry in entries:
+        Path(entry["source"]).mkdir()
+    return main.roots_from_config(entries)
+
+def test_files_go_to_their_root():
+    """Each file is organized with the rules and destination of the root it arrived in"""
+    print("🧪 Testing files from several roots")
+    saved = main.STABILITY_POLL_INTERVAL
+    main.STABILITY_POLL_INTERVAL = 0.01
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            alice, scans = make_roots(tmp)
+            pool = main.WorkerPool(2)
+            handler = main.FileHandler([alice, scans], pool)
+            results, done = [], threading.Semaphore(0)
+            handler.on_result = lambda result: (results.append(result), done.release())
+            before = {name: dict(main.METRICS.per_root[name]) for name in ("alice", "scans")}
+            try:
+                for path in (alice.source / "plan.dwg", alice.source / "paper.pdf", scans.source / "scan.pdf",
+                             scans.source / "notes.txt"):
+                    path.write_text(path.name)
+                    assert handler.root_for(path).source == path.parent
+                    handler.enqueue(handler.root_for(path), path, main.NULL_TRACE)
+                for _ in range(4):
+                    assert done.acquire(timeout=10)
+            finally:
+                pool.shutdown()
+            assert (tmp / "out_alice" / "CAD" / "plan.dwg").exists()
+            assert (tmp / "out_alice" / "PDFs" / "paper.pdf").exists()
+            assert (tmp / "out_scans" / "Scans" / "scan.pdf").exists()
+            assert (scans.source / "notes.txt").exists()  # No txt rule in the scans root
+            print("   ✅ Per-root rules and destinations, built-in rules only where inherited")
+
+            organized = {name: main.METRICS.per_root[name]['organized'] - before[name].get('organized', 0)
+                         for name in ("alice", "scans")}
+            assert organized == {"alice": 2, "scans": 1}
+            assert sorted(r['root'] for r in results) == ["alice", "alice", "scans", "scans"]
+            print("   ✅ One pool and one metrics object, counted per root")
+    finally:
+        main.STABILITY_POLL_INTERVAL = saved
+
+def test_duplicate_events_dropped():
+    """A second event for a file still in progress does not queue it twice"""
+    print("🧪 Testing duplicate events")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        alice, scans = make_roots(tmp)
+        pool = main.WorkerPool(1)
+        pool.pause()  # Keep the first event in the queue
+        handler = main.FileHandler([alice, scans], pool)
+        try:
+            path = alice.source / "plan.dwg"
+            path.write_text("x")
+            before = main.METRICS.per_root['alice']['duplicate_events']
+            assert pool.submit(handler, alice, path, main.NULL_TRACE)
+            assert not pool.submit(handler, alice, path, main.NULL_TRACE)
+            assert main.METRICS.per_root['alice']['duplicate_events'] == before + 1
+            print("   ✅ Duplicate dropped and counted")
+        finally:
+            pool.resume()
+            pool.shutdown()
+
+def test_shared_watcher():
+    """Many roots are watched by one inotify instance, one watch per root"""
+    if not sys.platform.startswith('linux'):
+        return
+    print("🧪 Testing the shared inotify watcher")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        roots = make_roots(tmp, 200)
+        arrived, seen = threading.Event(), []
+
+        class Handler(main.FileHandler):
+            def enqueue(self, root, file_path, trace, source='live'):
+                seen.append((root.name, file_path.name))
+                trace.finish('queued')
+                if len(seen) == 2:
+                    arrived.set()
+
+        watcher = main.start_observer(Handler(roots), roots)
+        try:
+            assert isinstance(watcher, main.SharedInotifyWatcher) and len(watcher.dirs) == 200
+            (roots[0].source / "a.pdf").write_text("a")
+            (roots[-1].source / "b.pdf").write_text("b")
+            assert arrived.wait(5)
+        finally:
+            watcher.stop()
+            watcher.join(5)
+        assert sorted(seen) == [("alice", "a.pdf"), ("user197", "b.pdf")]
+        print("   ✅ 200 roots, one instance, events mapped to their root")
+
+def test_moved_in_file_organized():
+    """A file renamed into a watched folder from elsewhere is organized like a new one"""
+    if not sys.platform.startswith('linux'):
+        return
+    print("🧪 Testing files moved into a watched folder")
+    saved = main.STABILITY_POLL_INTERVAL
+    main.STABILITY_POLL_INTERVAL = 0.01
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            roots = make_roots(tmp)
+            pool = main.WorkerPool(1)
+            handler = main.FileHandler(roots, pool)
+            done = threading.Event()
+            handler.on_result = lambda result: done.set()
+            watcher = main.start_observer(handler, roots)
+            try:
+                assert isinstance(watcher, main.SharedInotifyWatcher)
+                outside = tmp / "elsewhere"
+                outside.mkdir()
+                (outside / "moved.pdf").write_text("moved")
+                os.rename(outside / "moved.pdf", roots[0].source / "moved.pdf")
+                assert done.wait(10)
+            finally:
+                watcher.stop()
+                watcher.join(5)
+                pool.shutdown()
+            assert (tmp / "out_alice" / "PDFs" / "moved.pdf").exists()
+            print("   ✅ Renamed in from outside and organized")
+    finally:
+        main.STABILITY_POLL_INTERVAL = saved
+
+if __name__ == "__main__":
+    test_files_go_to_their_root()
+    test_duplicate_events_dropped()
+    test_shared_watcher()
+    test_moved_in_file_organized()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the non-interactive --once sweep and its JSON summary
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import main
+
+def test_organize_once():
+    """Folders are swept in parallel; the summary and exit code report failures"""
+    print("🧪 Testing --once")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        first, second, out = tmp / "first", tmp / "second", tmp / "out"
+        for folder in (first, second):
+            folder.mkdir()
+        (first / "new.pdf").write_text("12345")
+        (first / "old.pdf").write_text("old")
+        old = time.time() - 90 * 86400
+        os.utime(first / "old.pdf", (old, old))
+        (second / "song.mp3").write_text("la")
+        (second / "setup.exe").write_text("x")
+        settings = dict(main.DEFAULT_SETTINGS, backtrack_days=30, backtrack_all_files=False)
+        summary_file = tmp / "summary.json"
+
+        code = main.organize_once([first, second], settings, out, jobs=2, dry_run=True, summary_path=summary_file)
+        summary = json.loads(summary_file.read_text())
+        assert code == main.EXIT_OK and summary['matched'] == 2 and summary['organized'] == 0
+        assert (first / "new.pdf").exists()
+        print("   ✅ Dry run counts without moving")
+
+        code = main.organize_once([first, second, tmp / "missing"], settings, out, jobs=2,
+                                  summary_path=summary_file)
+        summary = json.loads(summary_file.read_text())
+        assert code == main.EXIT_FOLDER_ERRORS and summary['failed_folders'] == 1
+        assert (summary['organized'], summary['too_old'], summary['bytes'], summary['failed']) == (2, 1, 7, 0)
+        assert (out / "PDFs" / "new.pdf").exists() and (out / "Audio_Files" / "song.mp3").exists()
+        assert (first / "old.pdf").exists()
+        assert [d['organized'] for d in summary['directories']] == [1, 1, 0]
+        print("   ✅ Files organized, old files kept, unreadable folder reported")
+
+        (first / "again.pdf").write_text("x")
+        assert main.organize_once([first], dict(settings, backtrack_all_files=True), out) == main.EXIT_OK
+        assert (out / "PDFs" / "old.pdf").exists()
+        print("   ✅ All-files mode ignores the date window")
+
+if __name__ == "__main__":
+    test_organize_once()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script to verify destination pools: same-device preference, spill-over and cached free space
+"""
+
+import errno
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import main
+
+GB = 1024 ** 3
+
+def fake_volumes(space, folders):
+    """Pretend each folder is on its own volume: folders[i] gets (free bytes, st_dev)"""
+    now = time.monotonic()
+    for folder, (free, device) in zip(folders, space):
+        main.FREE_SPACE.readings[str(folder)] = [free, 100 * GB, device, now]
+
+def test_pool_config():
+    """A rule listing several folders becomes a pool; its first folder is the rule's folder"""
+    print("🧪 Testing pool configuration")
+    roots = main.roots_from_config([{"source": "/dl", "destination": "/out",
+                                     "rules": {"mp4": ["Videos", "/mnt/bulk/Videos"]}}],
+                                    dict(main.DEFAULT_SETTINGS, pool_reserve_mb=10))
+    root = roots[0]
+    assert root.subfolders['mp4'] == Path("/out/Videos") and 'pdf' not in root.pools
+    assert root.pools['mp4'].folders == [Path("/out/Videos"), Path("/mnt/bulk/Videos")]
+    assert root.pools['mp4'].reserve == 10 * 1024 * 1024
+    assert Path("/mnt/bulk/Videos") in root.folders()
+    print("   ✅ Pool built from a list of folders")
+
+def test_placement():
+    """Same-device folders win, full volumes are skipped, copies are counted against the cache"""
+    print("🧪 Testing placement")
+    saved = main.FREE_SPACE
+    main.FREE_SPACE = main.FreeSpace()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            video = tmp / "movie.mp4"
+            video.write_bytes(b"x")
+            here = os.stat(tmp).st_dev
+            first, second, third = tmp / "a", tmp / "b", tmp / "c"
+            pool = main.DestinationPool([first, second, third], reserve_mb=0, reserve_percent=5)
+
+            fake_volumes([(50 * GB, -1), (50 * GB, here), (50 * GB, -2)], pool.folders)
+            assert pool.pick(video, 40 * GB) == second
+            print("   ✅ A folder on the file's own volume is preferred (a rename, not a copy)")
+
+            fake_volumes([(50 * GB, -1), (4 * GB, here), (50 * GB, -2)], pool.folders)
+            assert pool.pick(video, GB) == first
+            assert pool.pick(video, 40 * GB) == first
+            assert pool.pick(video, 40 * GB) == third
+            assert main.FREE_SPACE.readings[str(first)][0] == 50 * GB - 41 * GB
+            print("   ✅ Spills to the next folder before the 5% reserve is used up")
+
+            fake_volumes([(GB, -1), (2 * GB, -3), (GB, -2)], pool.folders)
+            assert pool.pick(video, 10 * GB) == second
+            assert main.METRICS.counters['pool_exhausted'] >= 1
+            print("   ✅ With every volume full the emptiest is used")
+
+            main.FREE_SPACE.start(0.05)
+            time.sleep(0.2)
+            main.FREE_SPACE.stop()
+            assert main.FREE_SPACE.readings[str(first)][2] == here
+            print("   ✅ Readings refreshed by the timer")
+    finally:
+        main.FREE_SPACE = saved
+
+def test_live_spill_on_enospc():
+    """A live move that runs out of space marks the volume full and goes to the next folder"""
+    print("🧪 Testing ENOSPC spill-over")
+    saved = main.FREE_SPACE, main.move_file, main.STABILITY_POLL_INTERVAL
+    main.FREE_SPACE = main.FreeSpace()
+    main.STABILITY_POLL_INTERVAL = 0.01
+    real_move = main.move_file
+
+    def move_file(file_path, dest_path, root_name=None, bucket=None, journal=None):
+        if dest_path.parent.name == "Videos":
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return real_move(file_path, dest_path, root_name, bucket, journal)
+
+    main.move_file = move_file
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            source = tmp / "Downloads"
+            source.mkdir()
+            root = main.roots_from_config([{"source": str(source), "destination": str(tmp / "out"),
+                                            "rules": {"mp4": ["Videos", str(tmp / "bulk")]}}],
+                                           dict(main.DEFAULT_SETTINGS, pool_reserve_mb=0, pool_reserve_percent=0))[0]
+            fake_volumes([(50 * GB, -1), (50 * GB, -2)], root.pools['mp4'].folders)
+            (source / "clip.mp4").write_bytes(b"video")
+            assert main.FileHandler([root]).handle(root, source / "clip.mp4", main.NULL_TRACE) == 'organized'
+            assert (tmp / "bulk" / "clip.mp4").exists()
+            assert main.FREE_SPACE.reading(tmp / "out" / "Videos")[0] == 0
+            print("   ✅ Moved to the spill-over folder after the first one filled up")
+    finally:
+        main.FREE_SPACE, main.move_file, main.STABILITY_POLL_INTERVAL = saved
+
+if __name__ == "__main__":
+    test_pool_config()
+    test_placement()
+    test_live_spill_on_enospc()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script to verify steady-state profiling of the worker threads works with one profiler per process
+"""
+
+import cProfile
+import tempfile
+import threading
+from pathlib import Path
+
+import main
+
+class OneAtATime(cProfile.Profile):
+    """cProfile as of Python 3.12: enabling a second profiler raises ValueError"""
+    active = None
+
+    def enable(self, *args, **kwargs):
+        if OneAtATime.active not in (None, self):
+            raise ValueError("Another profiling tool is already active")
+        OneAtATime.active = self
+        super().enable(*args, **kwargs)
+
+    def disable(self):
+        super().disable()
+        if OneAtATime.active is self:
+            OneAtATime.active = None
+
+def test_process_wide_profile():
+    """Worker threads share one profile, and a startup phase next to them still runs"""
+    print("🧪 Testing the process-wide steady-state profile")
+    saved = cProfile.Profile, main.PROFILE_PER_THREAD
+    cProfile.Profile, main.PROFILE_PER_THREAD = OneAtATime, False
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = main.Profiler()
+            profiler.start(Path(tmp))
+            errors, inside = [], threading.Barrier(4)
+
+            def work():
+                try:
+                    with profiler.live():
+                        inside.wait(5)
+                        sum(range(10000))
+                        inside.wait(5)
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert not errors and len(profiler.live_profiles) == 1 and profiler.live_active == 0
+            print("   ✅ Four workers profiled at once by one profile")
+
+            with profiler.live():
+                with profiler.phase('backtrack_and_organize'):
+                    sum(range(10000))
+            assert (Path(tmp) / "01_backtrack_and_organize_memory.txt").exists()
+            profiler.stop()
+            assert (Path(tmp) / "steady_state.pstats").exists()
+            print("   ✅ A phase during live work keeps its memory diff, steady state dumped")
+    finally:
+        cProfile.Profile, main.PROFILE_PER_THREAD = saved
+
+if __name__ == "__main__":
+    test_process_wide_profile()
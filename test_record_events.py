@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Test script to verify anonymized event traces keep the folder structure
+"""
+
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+import main
+
+def test_anonymized_paths():
+    """Names are hashed one component at a time, extensions are kept"""
+    print("🧪 Testing anonymized event traces")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        recorder = main.EventRecorder(tmp / "trace.jsonl.gz", tmp / "Downloads", anonymize=True)
+        ids = [recorder._path_id(tmp / "Downloads" / name)
+               for name in ("Project X", "Project X/report.pdf", "Project X/old/report.pdf", "Other/report.pdf")]
+        recorder.close()
+        with gzip.open(tmp / "trace.jsonl.gz", 'rt', encoding='utf-8') as f:
+            paths = {item['p']: item['path'] for item in map(json.loads, f) if 'p' in item}
+        folder, report, nested, other = (paths[i] for i in ids)
+        assert "Project" not in "".join(paths.values()) and "report" not in "".join(paths.values())
+        assert report.startswith(folder + "/") and nested.startswith(folder + "/")
+        assert report.endswith(".pdf") and report.split("/")[-1] == nested.split("/")[-1] == other.split("/")[-1]
+        assert other.split("/")[0] != folder
+        print("   ✅ Files stay inside their hashed folder, same names hash the same")
+
+if __name__ == "__main__":
+    test_anonymized_paths()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script to verify settled files are moved by priority without starving any
+"""
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import main
+
+MB = 1024 ** 2
+
+def test_priority_order():
+    """Live and small files go first, heavy folders wait longer, ranked by the size they settle at"""
+    print("🧪 Testing the priority scheduler")
+    saved = main.move_file, main.STABILITY_POLL_INTERVAL
+    order, release, done = [], threading.Event(), threading.Semaphore(0)
+
+    def move_file(file_path, dest_path, *args):
+        order.append(file_path.name)
+        if file_path.name == "blocker.pdf":
+            release.wait(5)
+        return saved[0](file_path, dest_path, *args)
+
+    main.move_file = move_file
+    main.STABILITY_POLL_INTERVAL = 0.02
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            source, out = tmp / "Downloads", tmp / "Organized"
+            source.mkdir()
+            root = main.WatchRoot("dl", source, out, {"pdf": out / "PDFs", "mp4": out / "Video_Files"})
+            scheduler = main.PriorityScheduler(main.parse_priority_weights("video_files:0.5, bad"))
+            assert scheduler.weights == {"video_files": 0.5}
+            pool = main.WorkerPool(1, scheduler)
+            handler = main.FileHandler([root], pool)
+            handler.on_result = lambda result: done.release()
+            try:
+                (source / "blocker.pdf").write_text("x")
+                handler.enqueue(root, source / "blocker.pdf", main.NULL_TRACE)
+                while order != ["blocker.pdf"]:
+                    time.sleep(0.01)
+                # Every download starts empty and only then grows to its final size
+                for name, source_kind, size in [("old.pdf", 'rescan', MB), ("movie.mp4", 'live', 3000 * MB),
+                                                ("big.pdf", 'live', 500 * MB), ("new.pdf", 'live', MB)]:
+                    (source / name).touch()
+                    handler.enqueue(root, source / name, main.NULL_TRACE, source_kind)
+                    os.truncate(source / name, size)
+                deadline = time.monotonic() + 10
+                while len(pool.heap) < 4 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                release.set()
+                for _ in range(5):
+                    assert done.acquire(timeout=10)
+            finally:
+                release.set()
+                pool.shutdown()
+            assert order == ["blocker.pdf", "new.pdf", "old.pdf", "big.pdf", "movie.mp4"]
+            print("   ✅ Small live files first, large videos last, by their size once downloaded")
+
+        assert scheduler.delay(root, Path("/dl/movie.mp4"), 'backtrack', 3000 * MB) == 120
+        assert main.PriorityScheduler(enabled=False).delay(root, Path("/dl/movie.mp4"), 'backtrack', 1) == 0
+        print("   ✅ Every file has a bounded delay, so nothing starves")
+    finally:
+        main.move_file, main.STABILITY_POLL_INTERVAL = saved
+
+def test_download_does_not_hold_workers():
+    """A download that keeps growing leaves the only worker free for finished files"""
+    print("🧪 Testing settle threads")
+    saved = main.STABILITY_POLL_INTERVAL
+    main.STABILITY_POLL_INTERVAL = 0.02
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            source, out = tmp / "Downloads", tmp / "Organized"
+            source.mkdir()
+            root = main.WatchRoot("dl", source, out, {"pdf": out / "PDFs", "mp4": out / "Video_Files"})
+            pool = main.WorkerPool(1)
+            handler = main.FileHandler([root], pool)
+            organized = threading.Event()
+            handler.on_result = lambda result: organized.set()
+            try:
+                growing = source / "movie.mp4"
+                growing.write_bytes(b"v")
+                handler.enqueue(root, growing, main.NULL_TRACE)
+                (source / "paper.pdf").write_text("paper")
+                handler.enqueue(root, source / "paper.pdf", main.NULL_TRACE)
+                deadline = time.monotonic() + 5
+                while not organized.is_set() and time.monotonic() < deadline:
+                    with open(growing, 'ab') as f:
+                        f.write(b"v")
+                    time.sleep(0.01)
+                assert (out / "PDFs" / "paper.pdf").exists() and growing.exists()
+                print("   ✅ Finished file moved while the other is still downloading")
+            finally:
+                pool.shutdown()
+    finally:
+        main.STABILITY_POLL_INTERVAL = saved
+
+if __name__ == "__main__":
+    test_priority_order()
+    test_download_does_not_hold_workers()
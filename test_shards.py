@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify sharded mode: stable routing, results relayed back and crashed shards restarted
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import main
+
+def test_shard_routing():
+    """A path always maps to the same shard"""
+    print("🧪 Testing shard routing")
+    paths = [Path(f"/dl/file{i}.pdf") for i in range(200)]
+    first = [main.shard_for(path, 4) for path in paths]
+    assert first == [main.shard_for(path, 4) for path in paths]
+    assert set(first) == {0, 1, 2, 3}
+    print("   ✅ Stable and spread over every shard")
+
+def test_sharded_pool():
+    """Shards organize files, report results and metrics, and a killed shard is replaced"""
+    print("🧪 Testing the shard pool")
+    saved = main.STABILITY_POLL_INTERVAL
+    main.STABILITY_POLL_INTERVAL = 0.1
+    results, lock = [], threading.Lock()
+
+    def on_result(result):
+        with lock:
+            results.append(result)
+
+    def wait_for(count, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with lock:
+                if len(results) >= count:
+                    return True
+            time.sleep(0.05)
+        return False
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            source, out = tmp / "Downloads", tmp / "Organized"
+            source.mkdir()
+            root = main.WatchRoot("dl", source, out, {"pdf": out / "PDFs"})
+            settings = dict(main.DEFAULT_SETTINGS, journal_enabled=False, worker_threads=2)
+            pool = main.ShardPool(2, [root], settings)
+            handler = main.FileHandler([root], pool)
+            handler.on_result = on_result
+            try:
+                for i in range(6):
+                    (source / f"doc{i}.pdf").write_text("x" * i)
+                    handler.enqueue(root, source / f"doc{i}.pdf", main.NULL_TRACE)
+                assert wait_for(6)
+                assert sorted(p.name for p in (out / "PDFs").iterdir()) == [f"doc{i}.pdf" for i in range(6)]
+                assert {r['status'] for r in results} == {'organized'}
+                assert results[0]['dest'].parent == out / "PDFs"
+                time.sleep(main.ShardRelay.FLUSH_INTERVAL * 4)
+                assert main.METRICS.per_root['dl']['organized'] >= 6
+                print("   ✅ Files organized in the shards, results and metrics relayed")
+
+                victim = source / "victim.pdf"
+                victim.write_text("slow")
+                index = main.shard_for(victim, 2)
+                handler.enqueue(root, victim, main.NULL_TRACE)
+                time.sleep(0.1)
+                pool.processes[index].kill()
+                assert wait_for(7)
+                assert results[-1]['status'] == 'organized' and (out / "PDFs" / "victim.pdf").exists()
+                assert main.METRICS.counters['shard_restarts'] >= 1
+                assert pool.processes[index].is_alive()
+                print("   ✅ Killed shard restarted and its file organized")
+            finally:
+                pool.shutdown()
+            assert not any(process.is_alive() for process in pool.processes)
+    finally:
+        main.STABILITY_POLL_INTERVAL = saved
+
+if __name__ == "__main__":
+    test_shard_routing()
+    test_sharded_pool()
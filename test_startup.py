@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the fast-start path: cheap imports and a backtrack that leaves new files to the watcher
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import main
+
+def test_lazy_imports():
+    """Modules only some commands need are not loaded by importing main"""
+    print("🧪 Testing lazy imports")
+    code = ("import sys, main; print(' '.join(m for m in ('requests', 'sqlite3', 'cProfile', 'pstats', "
+            "'tracemalloc', 'gzip', 'subprocess', 'ctypes', 'uuid', 'watchdog.observers') if m in sys.modules))")
+    proc = subprocess.run([sys.executable, '-c', code], cwd=Path(main.__file__).parent,
+                          capture_output=True, text=True, check=True)
+    assert proc.stdout.strip() == "", proc.stdout
+    print("   ✅ Nothing loaded before it is needed")
+
+def test_backtrack_until():
+    """A backtrack running next to the watcher skips files changed after it started"""
+    print("🧪 Testing the background backtrack cutoff")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source, out = tmp / "Downloads", tmp / "Organized"
+        source.mkdir()
+        (source / "old.pdf").write_text("old")
+        (source / "new.pdf").write_text("new")
+        started = time.time() - 60
+        os.utime(source / "old.pdf", (started - 60, started - 60))
+        root = main.WatchRoot("dl", source, out, {"pdf": out / "PDFs"})
+        settings = dict(main.DEFAULT_SETTINGS, backtrack_days=30, backtrack_all_files=True)
+        main.organize_existing_files(source, settings, root, until=started)
+        assert (out / "PDFs" / "old.pdf").exists()
+        assert (source / "new.pdf").exists()
+        print("   ✅ Only files from before the start are moved")
+
+def test_backtrack_stop():
+    """Setting stop ends a background backtrack after the batch in progress"""
+    print("🧪 Testing a background backtrack stopped at shutdown")
+    saved = main.move_files, main.BACKTRACK_BATCH
+    stop = threading.Event()
+
+    def move_files(*args, **kwargs):
+        results = saved[0](*args, **kwargs)
+        stop.set()  # Quit while the first batch is being moved
+        return results
+
+    main.move_files, main.BACKTRACK_BATCH = move_files, 2
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            source, out = tmp / "Downloads", tmp / "Organized"
+            source.mkdir()
+            for i in range(10):
+                (source / f"file{i}.pdf").write_text("x")
+            root = main.WatchRoot("dl", source, out, {"pdf": out / "PDFs"})
+            settings = dict(main.DEFAULT_SETTINGS, backtrack_all_files=True)
+            thread = threading.Thread(target=main.backtrack_and_organize, args=(settings, [root], None, stop))
+            thread.start()
+            thread.join(10)
+            assert not thread.is_alive()
+            assert len(list((out / "PDFs").iterdir())) == 2 and len(list(source.iterdir())) == 8
+            print("   ✅ Stopped after the current batch, the rest left for the next start")
+    finally:
+        main.move_files, main.BACKTRACK_BATCH = saved
+
+if __name__ == "__main__":
+    test_lazy_imports()
+    test_backtrack_until()
+    test_backtrack_stop()
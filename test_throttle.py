@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the I/O throttle limits copy speed and can be changed live
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import main
+
+MB = 1024 * 1024
+
+def test_token_bucket():
+    """Takes beyond the rate wait; a new rate applies straight away"""
+    print("🧪 Testing the token bucket")
+    bucket = main.TokenBucket('test', 20 * MB)
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.take(MB)
+    assert 0.15 < time.monotonic() - start < 1
+    bucket.configure(0)
+    assert bucket.take(100 * MB) == 0
+    print("   ✅ Rate enforced, 0 means unlimited")
+
+def test_throttled_copy():
+    """Cross-drive copies keep the data and metadata and never replace a file"""
+    print("🧪 Testing throttled copies")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        src = tmp / "video.mp4"
+        src.write_bytes(b'v' * (3 * MB))
+        bucket = main.TokenBucket('test', 10 * MB)
+        start = time.monotonic()
+        main.copy_across(src, tmp / "copy.mp4", bucket)
+        assert time.monotonic() - start > 0.2
+        assert not src.exists() and (tmp / "copy.mp4").stat().st_size == 3 * MB
+        print("   ✅ Copied at the limit, source removed")
+
+        src.write_bytes(b'new')
+        try:
+            main.copy_across(src, tmp / "copy.mp4", bucket)
+            assert False, "copy.mp4 was replaced"
+        except FileExistsError:
+            pass
+        assert src.exists() and (tmp / "copy.mp4").stat().st_size == 3 * MB
+        print("   ✅ Existing files are left alone")
+
+        unlimited = main.TokenBucket('test', 0)
+        dest = main.copy_across(src, tmp / "copy.mp4", unlimited,
+                                lambda taken: taken.with_name("copy_1.mp4"))
+        assert dest == tmp / "copy_1.mp4" and dest.read_bytes() == b'new' and not src.exists()
+        assert (tmp / "copy.mp4").stat().st_size == 3 * MB
+        print("   ✅ A taken name gets the one on_conflict picks, without copying again")
+
+        src.write_bytes(b'v' * MB)
+        saved = main.shutil.copystat
+        main.shutil.copystat = lambda *args: (_ for _ in ()).throw(OSError(28, "No space left on device"))
+        try:
+            main.copy_across(src, tmp / "full.mp4", unlimited)
+            assert False, "the copy did not fail"
+        except OSError:
+            pass
+        finally:
+            main.shutil.copystat = saved
+        assert src.exists() and sorted(p.name for p in tmp.iterdir()) == ["copy.mp4", "copy_1.mp4", "video.mp4"]
+        print("   ✅ A failed copy leaves no half file behind")
+
+    settings = dict(main.DEFAULT_SETTINGS)
+    defaults = main.IOThrottle()
+    defaults.configure(settings)
+    assert defaults.live.rate == 0 and defaults.background.rate == 0
+    main.set_throttle(['5', '1'], settings)
+    assert main.THROTTLE.live.rate == 5 * MB and main.THROTTLE.background.rate == MB
+    main.set_throttle(['off'], settings)
+    assert main.THROTTLE.live.rate == 0 and main.THROTTLE.background.rate == 0
+    print("   ✅ Unlimited by default, 'throttle' changes the limits at runtime")
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_throttled_copy()
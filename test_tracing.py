@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script to verify per-file tracing and the trace analyzer
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import main
+import analyze_trace
+
+def test_backtrack_trace():
+    """Organize a few files with tracing on and summarize the run"""
+    print("🧪 Testing per-file tracing")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        downloads = tmp / "Downloads"
+        organizer = tmp / "BLAMITE_Organizer"
+        downloads.mkdir()
+        for name in ['report.pdf', 'notes.txt', 'photo.png', 'unknown.xyz']:
+            (downloads / name).write_text("data")
+
+        old_subfolders = dict(main.SUBFOLDERS)
+        try:
+            for ext, folder in old_subfolders.items():
+                main.SUBFOLDERS[ext] = organizer / folder.name
+                main.SUBFOLDERS[ext].mkdir(parents=True, exist_ok=True)
+
+            trace_file = tmp / "trace.jsonl"
+            main.TRACER.configure(True, 100, trace_file)
+            settings = dict(main.DEFAULT_SETTINGS, backtrack_all_files=True)
+            main.organize_existing_files(downloads, settings)
+        finally:
+            main.SUBFOLDERS.update(old_subfolders)
+            main.TRACER.configure(False)
+
+        records = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        roots = [r for r in records if r['span'] == 'file']
+        assert len(roots) == 3, "one root span per supported file"
+        assert all(r['outcome'] == 'organized' for r in roots)
+        assert {'event_received', 'name_resolution', 'move'} <= {r['span'] for r in records}
+        print(f"   ✅ {len(records)} spans written for {len(roots)} files")
+
+        runs = analyze_trace.list_runs(records)
+        summary = analyze_trace.summarize(records, runs[-1][0])
+        assert summary['outcomes']['organized'] == 3
+        assert len(summary['phases']['move']) == 3
+        assert analyze_trace.main([str(trace_file)]) == 0
+        print("   ✅ Analyzer summarized the run")
+
+def test_sampling_off():
+    """Tracing disabled must hand out the shared no-op trace"""
+    main.TRACER.configure(False)
+    assert main.TRACER.start(Path("a.pdf"), 'live') is main.NULL_TRACE
+    print("   ✅ Disabled tracer returns NULL_TRACE")
+
+if __name__ == "__main__":
+    test_backtrack_trace()
+    test_sampling_off()
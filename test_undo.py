@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script to verify transactions can be undone, including name conflicts
+"""
+
+import tempfile
+from pathlib import Path
+
+import main
+
+def test_undo_transaction():
+    """Files go back to their folder; names taken since then get a suffix"""
+    print("🧪 Testing bulk undo")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        downloads, pdfs = tmp / "Downloads", tmp / "Organized" / "PDFs"
+        downloads.mkdir()
+        pdfs.mkdir(parents=True)
+        log = main.TransactionLog()
+        log.open(tmp / "transactions")
+        txn = log.begin('backtrack')
+        for name, dest_name in [("a.pdf", "a.pdf"), ("b.pdf", "b_1.pdf"), ("gone.pdf", "gone.pdf")]:
+            (downloads / name).write_text(name)
+            (downloads / name).rename(pdfs / dest_name)
+            log.record('backtrack', downloads / name, pdfs / dest_name)
+        log.end(txn)
+        (pdfs / "gone.pdf").unlink()
+        (downloads / "a.pdf").write_text("new download")
+
+        results = main.undo_transaction('last', jobs=2, folder=tmp / "transactions")
+        assert results['restored'] == 2 and results['missing'] == 1
+        assert results['renamed_on_conflict'] == 1
+        assert (downloads / "a.pdf").read_text() == "new download"
+        assert (downloads / "a_1.pdf").read_text() == "a.pdf"
+        assert (downloads / "b.pdf").read_text() == "b.pdf"
+        assert list(pdfs.iterdir()) == []
+        print("   ✅ Files restored without overwriting anything")
+
+        assert not main.undo_transaction(txn.id, folder=tmp / "transactions")
+        print("   ✅ A transaction is only undone once")
+
+def test_undo_race():
+    """A file that takes the name between planning and the rename is never overwritten"""
+    print("🧪 Testing undo against a name taken mid-run")
+    saved = main.move_file
+
+    def move_file(file_path, dest_path, *args):
+        if not dest_path.exists():
+            dest_path.write_text("arrived meanwhile")
+        return saved(file_path, dest_path, *args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        downloads, pdfs = tmp / "Downloads", tmp / "PDFs"
+        downloads.mkdir()
+        pdfs.mkdir()
+        log = main.TransactionLog()
+        log.open(tmp / "transactions")
+        txn = log.begin('backtrack')
+        (pdfs / "a.pdf").write_text("organized")
+        log.record('backtrack', downloads / "a.pdf", pdfs / "a.pdf")
+        log.end(txn)
+        main.move_file = move_file
+        try:
+            results = main.undo_transaction('last', jobs=1, folder=tmp / "transactions")
+        finally:
+            main.move_file = saved
+        assert results['restored'] == 1 and results['renamed_on_conflict'] == 1
+        assert (downloads / "a.pdf").read_text() == "arrived meanwhile"
+        assert (downloads / "a_1.pdf").read_text() == "organized"
+        print("   ✅ Both files kept")
+
+def test_record_survives_kill():
+    """Each move reaches the file as it is recorded, so a killed session can still be undone"""
+    print("🧪 Testing transaction durability")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        log = main.TransactionLog()
+        log.open(tmp / "transactions")
+        txn = log.begin('live')
+        log.record('live', tmp / "Downloads" / "a.pdf", tmp / "PDFs" / "a.pdf")
+        lines = txn.path.read_text().splitlines()
+        assert len(lines) == 4 and lines[-1] == '[0,1,"a.pdf"]'
+        log.end(txn)
+        print("   ✅ Move on disk before the session ends")
+
+if __name__ == "__main__":
+    test_undo_transaction()
+    test_undo_race()
+    test_record_survives_kill()
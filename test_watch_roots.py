@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script to verify watch-root configuration and recursive folder rules
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from watchdog.events import FileSystemEventHandler
+
+import main
+
+def test_load_roots():
+    """Per-root rules extend or replace the built-in ones"""
+    print("🧪 Testing blamite_roots.json loading")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        roots_file = tmp / "roots.json"
+        roots_file.write_text(json.dumps({"roots": [
+            {"name": "alice", "source": str(tmp / "a"), "destination": str(tmp / "out_a"),
+             "rules": {"dwg": "CAD", "txt": None}},
+            {"name": "scans", "source": str(tmp / "s"), "destination": str(tmp / "out_s"),
+             "rules": {"PDF": "Scans"}, "inherit_rules": False, "recursive": True, "max_depth": 1},
+            {"name": "dupe", "source": str(tmp / "a")},
+            {"name": "broken"}
+        ]}))
+
+        roots = main.load_roots(roots_file)
+        assert [root.name for root in roots] == ["alice", "scans"]
+        alice, scans = roots
+        assert alice.subfolders["dwg"] == tmp / "out_a" / "CAD"
+        assert alice.subfolders["pdf"] == tmp / "out_a" / "PDFs"
+        assert "txt" not in alice.subfolders
+        assert scans.subfolders == {"pdf": tmp / "out_s" / "Scans"}
+        assert scans.recursive and scans.max_depth == 1
+        print("   ✅ Rules, duplicates and invalid entries handled")
+
+        assert main.load_roots(tmp / "missing.json")[0].name == "Downloads"
+        print("   ✅ Falls back to Downloads without a roots file")
+
+def test_recursive_rules():
+    """Depth limits, exclusions and the destination folder are respected"""
+    print("🧪 Testing recursive folder rules")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp)
+        settings = dict(main.DEFAULT_SETTINGS, recursive_watch=True, recursive_max_depth=2)
+        root = main.WatchRoot("dl", source, source / "Organized", {"pdf": source / "Organized" / "PDFs"},
+                              **main.recursive_options(settings))
+
+        for folder in ["a/b/c", "node_modules/pkg", "Organized/PDFs"]:
+            (source / folder).mkdir(parents=True)
+        for name in ["top.pdf", "a/one.pdf", "a/b/two.pdf", "a/b/c/three.pdf",
+                     "node_modules/pkg/nm.pdf", "Organized/PDFs/done.pdf"]:
+            (source / name).write_text("x")
+
+        assert root.watches_dir(source / "a" / "b")
+        assert not root.watches_dir(source / "a" / "b" / "c")
+        assert not root.watches_dir(source / "Node_Modules")
+        assert not root.watches_dir(source / "Organized" / "PDFs")
+        found = sorted(p.relative_to(source).as_posix() for p in root.iter_files())
+        assert found == ["a/b/two.pdf", "a/one.pdf", "top.pdf"]
+        print("   ✅ Only allowed subfolders are scanned")
+
+        handler = main.FileHandler([root])
+        assert handler.root_for(source / "a" / "one.pdf") is root
+        assert handler.root_for(source / "node_modules" / "pkg" / "nm.pdf") is None
+        print("   ✅ FileHandler ignores files outside the allowed subfolders")
+
+class EventLog(FileSystemEventHandler):
+    def __init__(self):
+        self.events = []
+
+    def on_any_event(self, event):
+        self.events.append((event.event_type, Path(event.src_path).name,
+                            Path(getattr(event, 'dest_path', '') or '.').name))
+
+def test_polling_watcher():
+    """Snapshot diffs become created/moved/deleted events, folder moves included"""
+    print("🧪 Testing the polling watcher")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp)
+        (source / "old.txt").write_text("x")
+        (source / "sub").mkdir()
+        root = main.WatchRoot("share", source, source / "Organized", {}, recursive=True, max_depth=2,
+                              backend='polling')
+        log = EventLog()
+        watcher = main.PollingWatcher(log, [root])
+        watcher.poll(baseline=True)
+        assert log.events == [] and len(watcher.dirs) == 2
+
+        (source / "new.pdf").write_text("a")
+        (source / "old.txt").rename(source / "sub" / "moved.txt")
+        (source / "sub" / "deep").mkdir()
+        (source / "sub" / "deep" / "d.png").write_text("d")
+        assert watcher.poll() == 4
+        assert sorted(log.events) == [("created", "d.png", ""), ("created", "deep", ""),
+                                      ("created", "new.pdf", ""), ("moved", "old.txt", "moved.txt")]
+        print("   ✅ Creates, moves and new subfolders reported")
+
+        log.events.clear()
+        (source / "new.pdf").unlink()
+        watcher.poll()
+        assert log.events == [("deleted", "new.pdf", "")]
+        assert watcher.poll() == 0
+        print("   ✅ Deletes reported once, idle polls are quiet")
+
+def test_overflow_rescan():
+    """After dropped events only folders and files changed since then are queued again"""
+    print("🧪 Testing the overflow rescan")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp)
+        (source / "quiet").mkdir()
+        (source / "busy").mkdir()
+        (source / "quiet" / "old.pdf").write_text("x")
+        (source / "busy" / "old.pdf").write_text("x")
+        old = time.time() - 3600
+        os.utime(source / "quiet", (old, old))
+        time.sleep(0.05)
+        since = time.time()
+        time.sleep(0.05)
+        (source / "busy" / "missed.pdf").write_text("x")
+        (source / "busy" / "missed.exe").write_text("x")
+
+        root = main.WatchRoot("dl", source, source / "Organized", {"pdf": source / "Organized" / "PDFs"},
+                              recursive=True, max_depth=1)
+        queued = []
+
+        class Handler(main.FileHandler):
+            def enqueue(self, root, file_path, trace, source='live'):
+                queued.append(file_path.name)
+                trace.finish('queued')
+
+        handler = Handler([root])
+        handler.recovery.SETTLE_DELAY = 60  # rescan by hand below
+        handler.on_overflow([(source / "quiet", root), (source / "busy", root)], since)
+        handler.on_overflow([(source / "busy", root)], since + 5)
+        handler.recovery.timer.cancel()
+        assert handler.recovery.rescan() == 1
+        assert queued == ["missed.pdf"]
+        print("   ✅ One pass over the changed folder only")
+
+def test_network_detection():
+    """The longest matching mount point decides whether a folder is polled"""
+    mounts = [("/mnt/share/local", "ext4"), ("/mnt/share", "cifs"), ("/", "ext4")]
+    if sys.platform == "win32":
+        return
+    assert main.is_network_path("/mnt/share/Downloads", mounts)
+    assert not main.is_network_path("/mnt/share/local/Downloads", mounts)
+    assert not main.is_network_path("/mnt/shared", mounts)
+    assert main.uses_polling(main.WatchRoot("x", "/tmp", "/tmp/o", {}, backend='polling'), mounts)
+    assert not main.uses_polling(main.WatchRoot("x", "/mnt/share", "/tmp/o", {}, backend='native'), mounts)
+
+if __name__ == "__main__":
+    test_load_roots()
+    test_recursive_rules()
+    test_polling_watcher()
+    test_overflow_rescan()
+    test_network_detection()